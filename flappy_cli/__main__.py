@@ -1,38 +1,195 @@
 from __future__ import annotations
 
+import argparse
 import random
+import time
 
-from .config import GameConfig, GameMode, make_spawner
+from contextlib import ExitStack
+
+from typing import Any, Callable, Optional, Sequence
+
+from .autopilot import Autopilot
+from .codec import dump_world, restore_game
+from .config import GameConfig, GameMode, make_bird, make_spawner
 from .game.core import Game
-from .io.input import WindowsKeyReader
-from .io.render import AsciiRenderer
-from .model import Bird, World
+from .game.telemetry import FrameProfiler
+from .io.backends import input_names, make_input, make_renderer, renderer_names
+from .model import World
+from .replay import Replay, ReplayPlayer, ReplayRecorder
+from .results import ResultsWriter
+
+
+def play_replay(path: str) -> None:
+    with open(path, "rb") as f:
+        replay = Replay.load(f)
+
+    player = ReplayPlayer(replay, renderer=make_renderer("terminal", clear_once=True, diff=True))
+    frame_time = 1.0 / replay.config.sim_hz
+
+    while player.frame < replay.frames:
+        player.step()
+        time.sleep(frame_time)
+
+    player.verify()
+
+
+def export_replay(path: str, out_path: str) -> None:
+    from .io.record import AsciicastRenderer, DeltaRecorder
+
+    with open(path, "rb") as f:
+        replay = Replay.load(f)
+
+    frame_time = 1.0 / replay.config.sim_hz
+
+    if out_path.endswith(".cast"):
+        out = open(out_path, "w", encoding="utf-8")
+        renderer = AsciicastRenderer(out, frame_time=frame_time, title=path)
+    else:
+        out = open(out_path, "wb")
+        renderer = DeltaRecorder(out, frame_time=frame_time)
+
+    with out:
+        player = ReplayPlayer(replay, renderer=renderer)
+        renderer.ticks = lambda: player.game.steps
+        player.play_to_end()
+        renderer.close()
+
+
+def open_renderer(
+    name: str,
+    config: GameConfig,
+    export: Optional[str],
+    stack: ExitStack,
+    *,
+    show_path: bool = False,
+    ticks: Optional[Callable[[], int]] = None,
+) -> Any:
+    if name == "terminal":
+        trajectory = None
+        if show_path:
+            from .trajectory import table_for
+
+            trajectory = table_for(config)
+        return make_renderer(name, clear_once=True, diff=True, trajectory=trajectory)
+
+    if name in ("asciicast", "delta"):
+        if not export:
+            raise SystemExit(f"--renderer {name} needs --export PATH")
 
+        if name == "asciicast":
+            out = stack.enter_context(open(export, "w", encoding="utf-8"))
+        else:
+            out = stack.enter_context(open(export, "wb"))
+        renderer = make_renderer(
+            name,
+            out=out,
+            frame_time=1.0 / config.sim_hz,
+            ticks=ticks,
+        )
+        stack.callback(renderer.close)
+        return renderer
+
+    return make_renderer(name)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="flappy_cli")
+    parser.add_argument("--record", metavar="PATH", help="record the session to a replay file")
+    parser.add_argument("--replay", metavar="PATH", help="play back a recorded replay file")
+    parser.add_argument("--export", metavar="PATH", help="with --replay: render it headless to .cast (asciicast v2) or a delta recording; "
+                        "with --renderer asciicast/delta: the recording path")
+    parser.add_argument("--profile", metavar="PATH", help="write frame telemetry as JSON lines and show it in the HUD")
+    parser.add_argument("--autopilot", action="store_true", help="let the built-in search player fly the bird")
+    parser.add_argument("--spectate", metavar="PORT", type=int, help="stream the game to spectators connecting on this TCP port")
+    parser.add_argument("--save", metavar="PATH", help="save the game to this file when quitting")
+    parser.add_argument("--resume", metavar="PATH", help="resume a game saved with --save")
+    parser.add_argument("--results", metavar="PATH", help="append each finished game to a results store")
+    parser.add_argument("--render-thread", action="store_true", help="format and write frames on a background thread")
+    parser.add_argument("--show-path", action="store_true", help="draw where the bird will fly if it stops flapping")
+    parser.add_argument("--input", choices=input_names(), help="key input backend (default: this platform's terminal)")
+    parser.add_argument("--renderer", choices=renderer_names(), help="render backend (default: terminal)")
+    args = parser.parse_args(argv)
+
+    if args.replay and args.export:
+        export_replay(args.replay, args.export)
+        return
+
+    if args.replay:
+        play_replay(args.replay)
+        return
 
-def main() -> None:
     config = GameConfig()
     rng = random.Random(config.seed)
 
     world = World(
         width=config.width,
         height=config.height,
-        bird=Bird(x=config.bird_x, y=config.height // 2),
+        bird=make_bird(config),
     )
 
     mode = GameMode.EASY
     spawner = make_spawner(mode)
 
-    game = Game(
-        world=world,
-        spawner=spawner,
-        mode=mode,
-        config=config,
-        renderer=AsciiRenderer(clear_once=True),
-        keys=WindowsKeyReader(),
-        rng=rng,
-    )
+    with ExitStack() as stack:
+        renderer = open_renderer(
+            args.renderer or config.render_backend or "terminal",
+            config,
+            args.export,
+            stack,
+            show_path=args.show_path,
+            ticks=lambda: game.steps,
+        )
+        if args.spectate is not None:
+            from .io.broadcast import BroadcastRenderer, serve_spectators
+
+            renderer = BroadcastRenderer(local=renderer)
+            server, _ = serve_spectators(renderer, "127.0.0.1", args.spectate)
+            stack.callback(renderer.close)
+            stack.callback(server.close)
+
+        if args.render_thread:
+            from .io.threaded import ThreadedRenderer
+
+            renderer = ThreadedRenderer(inner=renderer)
+            stack.callback(renderer.close)
+
+        keys = make_input(args.input or config.input_backend)
+        if hasattr(keys, "close"):
+            stack.callback(keys.close)
+
+        game = Game(
+            world=world,
+            spawner=spawner,
+            mode=mode,
+            config=config,
+            renderer=renderer,
+            keys=keys,
+            rng=rng,
+            autopilot=Autopilot(config=config) if args.autopilot else None,
+        )
+
+        if args.resume:
+            with open(args.resume, "rb") as f:
+                restore_game(game, f.read())
+
+        if args.profile:
+            export = stack.enter_context(open(args.profile, "w", encoding="utf-8"))
+            FrameProfiler(export=export).attach(game, hud=True)
+
+        if args.results:
+            game.results = ResultsWriter(args.results)
+            stack.callback(game.results.close)
+
+        if args.record:
+            out = stack.enter_context(open(args.record, "wb"))
+            recorder = ReplayRecorder(game, out)
+            stack.callback(recorder.close)
+
+        game.run()
 
-    game.run()
+        if args.save:
+            with open(args.save, "wb") as f:
+                f.write(dump_world(game.world, game=game))
 
 
 if __name__ == "__main__":
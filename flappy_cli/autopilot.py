@@ -0,0 +1,185 @@
+from __future__ import annotations
+
+import time
+
+from collections import OrderedDict
+from dataclasses import dataclass, field
+
+from typing import Callable, List, Optional, Tuple
+
+from .config import GameConfig
+from .model import World, to_fixed
+
+
+class _OutOfBudget(Exception):
+    pass
+
+
+@dataclass(slots=True)
+class Autopilot:
+    config: GameConfig = field(default_factory=GameConfig)
+    max_depth: int = 20
+    budget: float = 0.005
+    max_nodes: Optional[int] = None
+    table_size: int = 1 << 16
+    check_every: int = 256
+    clock: Callable[[], float] = field(default=time.perf_counter, repr=False)
+
+    table: OrderedDict = field(default_factory=OrderedDict, repr=False)
+    depth: int = 0
+    nodes: int = 0
+    hits: int = 0
+
+    _origin: int = field(default=-1, repr=False)
+    _phase: Optional[Tuple[int, int]] = field(default=None, repr=False)
+    _danger: List[int] = field(default_factory=list, repr=False)
+    _target: List[float] = field(default_factory=list, repr=False)
+    _height: int = field(default=0, repr=False)
+    _unit: int = field(default=1, repr=False)
+    _gravity: float = field(default=0.0, repr=False)
+    _flap: float = field(default=0.0, repr=False)
+    _deadline: float = field(default=0.0, repr=False)
+    _budget_nodes: int = field(default=0, repr=False)
+
+    def reset(self) -> None:
+        self.table.clear()
+        self._origin = -1
+        self._phase = None
+
+    def __call__(self, world: World) -> bool:
+        return self.decide(world)
+
+    def decide(self, world: World) -> bool:
+        origin = world.pipes.offset
+        if origin < self._origin:
+            self.table.clear()
+        self._origin = origin
+
+        self._scan(world)
+
+        bird = world.bird
+        config = self.config
+        scale = config.fixed_point_scale
+        if scale:
+            y, vy = bird.qy, bird.qvy
+            self._unit = scale
+            self._gravity = to_fixed(config.gravity, scale)
+            self._flap = to_fixed(config.flap_velocity, scale)
+        else:
+            y, vy = bird.y, bird.vy
+            self._unit = 1
+            self._gravity = config.gravity
+            self._flap = config.flap_velocity
+
+        # a node budget replaces the wall clock, so decisions do not depend on
+        # machine load
+        max_nodes = self.max_nodes
+        if max_nodes is None:
+            self._deadline = self.clock() + self.budget
+            self._budget_nodes = self.check_every
+        else:
+            self._budget_nodes = max_nodes
+
+        flap = False
+        self.depth = 0
+        for depth in range(1, self.max_depth + 1):
+            try:
+                _, action = self._search(0, y, vy, depth)
+            except _OutOfBudget:
+                break
+
+            flap = action
+            self.depth = depth
+            if max_nodes is None and self.clock() >= self._deadline:
+                break
+
+        return flap
+
+    def _scan(self, world: World) -> None:
+        depth = self.max_depth
+        bird_x = world.bird.x
+        height = world.height
+        self._height = height
+
+        danger = [0] * (depth + 2)
+        target = [height / 2] * (depth + 2)
+        ahead = []
+        newest = None
+
+        for p in world.pipes:
+            newest = p
+            s = p.x - bird_x
+            if 1 <= s <= depth + 1:
+                danger[s] |= p.blocked
+            if s >= 0:
+                ahead.append((s, p.gap_y + p.gap_h / 2))
+
+        i = 0
+        for k in range(depth + 2):
+            while i < len(ahead) and ahead[i][0] < k:
+                i += 1
+            if i == len(ahead):
+                break
+            target[k] = ahead[i][1]
+
+        self._danger = danger
+        self._target = target
+        self._phase = None if newest is None else (newest.x + world.pipes.offset, newest.blocked)
+
+    def _search(self, k: int, y: float, vy: float, remaining: int) -> Tuple[float, bool]:
+        if remaining == 0:
+            return 1.0 - min(1.0, abs(y / self._unit - self._target[k]) / self._height), False
+
+        table = self.table
+        key = (self._origin + k, y, vy, self._phase)
+        entry = table.get(key)
+        if entry is not None:
+            table.move_to_end(key)
+            searched, value, action = entry
+            if searched == remaining:
+                self.hits += 1
+                return value, action
+            if searched > remaining and value >= searched:
+                self.hits += 1
+                return remaining + value - searched, action
+            first = action
+        else:
+            first = vy > 0 and y / self._unit > self._target[k]
+
+        self.nodes += 1
+        self._budget_nodes -= 1
+        if self._budget_nodes <= 0:
+            if self.max_nodes is not None:
+                raise _OutOfBudget
+            self._budget_nodes = self.check_every
+            if self.clock() >= self._deadline:
+                raise _OutOfBudget
+
+        danger = self._danger[k + 1]
+        height = self._height
+        unit = self._unit
+        gravity = self._gravity
+
+        best = -1.0
+        best_action = first
+        for flap in (first, not first):
+            nvy = (self._flap if flap else vy) + gravity
+            ny = y + nvy
+            cy = int(ny / unit)
+
+            if cy < 0 or cy >= height or (danger >> cy) & 1:
+                value = 0.0
+            else:
+                value = 1.0 + self._search(k + 1, ny, nvy, remaining - 1)[0]
+
+            if value > best:
+                best = value
+                best_action = flap
+            if best >= remaining:
+                break
+
+        table[key] = (remaining, best, best_action)
+        if len(table) > self.table_size:
+            table.popitem(last=False)
+
+        return best, best_action
@@ -0,0 +1,250 @@
+from __future__ import annotations
+
+import random
+
+from dataclasses import dataclass
+
+from typing import List, Optional, Sequence
+
+import numpy as np
+
+from .config import GameConfig
+from .model import Bird, FixedBird, Pipe, World, to_fixed
+from .strategy import FixedIntervalSpawner, ScalingIntervalSpawner, SpawnerStrategy
+
+
+def spawner_params(spawner: SpawnerStrategy) -> tuple[int, int, int, int]:
+    if isinstance(spawner, FixedIntervalSpawner):
+        return spawner.interval_ticks, spawner.interval_ticks, 1, spawner.gap_h
+
+    if isinstance(spawner, ScalingIntervalSpawner):
+        return (
+            spawner.start_interval,
+            spawner.min_interval,
+            spawner.every_points,
+            spawner.gap_h,
+        )
+
+    raise TypeError(f"unsupported spawner for batch simulation: {type(spawner).__name__}")
+
+
+@dataclass(slots=True)
+class BatchWorld:
+    width: int
+    height: int
+    bird_x: int
+    gravity: float
+    flap_velocity: float
+
+    y: np.ndarray
+    vy: np.ndarray
+    score: np.ndarray
+    tick: np.ndarray
+    alive: np.ndarray
+
+    next_spawn: np.ndarray
+    start_interval: np.ndarray
+    min_interval: np.ndarray
+    every_points: np.ndarray
+    gap_h: np.ndarray
+
+    pipe_x: np.ndarray
+    pipe_gap_y: np.ndarray
+    pipe_gap_h: np.ndarray
+    pipe_passed: np.ndarray
+    pipe_live: np.ndarray
+
+    rngs: List[random.Random]
+
+    scale: int = 0
+
+    @classmethod
+    def create(
+        cls,
+        *,
+        config: GameConfig,
+        spawners: Sequence[SpawnerStrategy],
+        seeds: Sequence[Optional[int]],
+    ) -> "BatchWorld":
+        if len(spawners) != len(seeds):
+            raise ValueError("spawners and seeds must have the same length")
+
+        n = len(seeds)
+        params = np.array([spawner_params(s) for s in spawners], dtype=np.int64).reshape(n, 4)
+
+        min_interval = int(params[:, 1].min()) if n else 1
+        capacity = config.width // max(1, min_interval) + 2
+
+        # fixed-point worlds keep qy/qvy as int64, the same integers FixedBird holds
+        scale = config.fixed_point_scale
+        if scale:
+            gravity = to_fixed(config.gravity, scale)
+            flap_velocity = to_fixed(config.flap_velocity, scale)
+            y = np.full(n, (config.height // 2) * scale, dtype=np.int64)
+            vy = np.zeros(n, dtype=np.int64)
+        else:
+            gravity = config.gravity
+            flap_velocity = config.flap_velocity
+            y = np.full(n, float(config.height // 2))
+            vy = np.zeros(n)
+
+        return cls(
+            width=config.width,
+            height=config.height,
+            bird_x=config.bird_x,
+            gravity=gravity,
+            flap_velocity=flap_velocity,
+            y=y,
+            vy=vy,
+            score=np.zeros(n, dtype=np.int64),
+            tick=np.zeros(n, dtype=np.int64),
+            alive=np.ones(n, dtype=bool),
+            next_spawn=np.ones(n, dtype=np.int64),
+            start_interval=params[:, 0].copy(),
+            min_interval=params[:, 1].copy(),
+            every_points=params[:, 2].copy(),
+            gap_h=params[:, 3].copy(),
+            pipe_x=np.zeros((n, capacity), dtype=np.int64),
+            pipe_gap_y=np.zeros((n, capacity), dtype=np.int64),
+            pipe_gap_h=np.zeros((n, capacity), dtype=np.int64),
+            pipe_passed=np.zeros((n, capacity), dtype=bool),
+            pipe_live=np.zeros((n, capacity), dtype=bool),
+            rngs=[random.Random(seed) for seed in seeds],
+            scale=scale,
+        )
+
+    @property
+    def size(self) -> int:
+        return int(self.y.shape[0])
+
+    @property
+    def cell_y(self) -> np.ndarray:
+        if self.scale:
+            return np.sign(self.y) * (np.abs(self.y) // self.scale)
+
+        # astype truncates toward zero, exactly like int() in Bird.cell_y
+        return self.y.astype(np.int64)
+
+    def _grow_pipes(self) -> None:
+        extra = self.pipe_x.shape[1]
+
+        def widen(a: np.ndarray) -> np.ndarray:
+            return np.concatenate([a, np.zeros((a.shape[0], extra), dtype=a.dtype)], axis=1)
+
+        self.pipe_x = widen(self.pipe_x)
+        self.pipe_gap_y = widen(self.pipe_gap_y)
+        self.pipe_gap_h = widen(self.pipe_gap_h)
+        self.pipe_passed = widen(self.pipe_passed)
+        self.pipe_live = widen(self.pipe_live)
+
+    def _spawn(self, active: np.ndarray) -> None:
+        due = active & (self.tick >= self.next_spawn)
+        if not due.any():
+            return
+
+        idx = np.flatnonzero(due)
+
+        dec = self.score[idx] // self.every_points[idx]
+        interval = np.maximum(self.min_interval[idx], self.start_interval[idx] - dec)
+        self.next_spawn[idx] = self.tick[idx] + interval
+
+        free = ~self.pipe_live[idx]
+        if not free.any(axis=1).all():
+            self._grow_pipes()
+            free = ~self.pipe_live[idx]
+        slots = free.argmax(axis=1)
+
+        gap_h = self.gap_h[idx]
+        max_top = np.maximum(0, self.height - gap_h)
+        gap_y = [
+            self.rngs[i].randint(0, top)
+            for i, top in zip(idx.tolist(), max_top.tolist())
+        ]
+
+        self.pipe_x[idx, slots] = self.width - 1
+        self.pipe_gap_y[idx, slots] = gap_y
+        self.pipe_gap_h[idx, slots] = gap_h
+        self.pipe_passed[idx, slots] = False
+        self.pipe_live[idx, slots] = True
+
+    def collides_pipe(self) -> np.ndarray:
+        by = self.cell_y[:, None]
+        at_column = self.pipe_live & (self.pipe_x == self.bird_x)
+        in_gap = (self.pipe_gap_y <= by) & (by < self.pipe_gap_y + self.pipe_gap_h)
+
+        return (at_column & ~in_gap).any(axis=1)
+
+    def collides_bounds(self) -> np.ndarray:
+        by = self.cell_y
+
+        return (by < 0) | (by >= self.height)
+
+    def step(self, flap: np.ndarray) -> np.ndarray:
+        active = self.alive.copy()
+
+        flap = np.asarray(flap, dtype=bool) & active
+        self.vy[flap] = self.flap_velocity
+
+        self._spawn(active)
+
+        y0 = self.y.copy()
+        vy0 = self.vy.copy()
+        score0 = self.score.copy()
+        passed0 = self.pipe_passed.copy()
+        live0 = self.pipe_live.copy()
+
+        np.add(self.vy, self.gravity, out=self.vy, where=active)
+        np.add(self.y, self.vy, out=self.y, where=active)
+
+        moving = self.pipe_live & active[:, None]
+        np.subtract(self.pipe_x, 1, out=self.pipe_x, where=moving)
+
+        passing = moving & ~self.pipe_passed & (self.pipe_x < self.bird_x)
+        self.pipe_passed |= passing
+        self.score += passing.sum(axis=1)
+
+        self.pipe_live &= ~(moving & (self.pipe_x < 0))
+
+        hit_pipe = active & self.collides_pipe()
+        died = active & (hit_pipe | self.collides_bounds())
+
+        if hit_pipe.any():
+            rows = np.flatnonzero(hit_pipe)
+            self.y[rows] = y0[rows]
+            self.vy[rows] = vy0[rows]
+            self.score[rows] = score0[rows]
+            self.pipe_x[rows] += live0[rows]
+            self.pipe_passed[rows] = passed0[rows]
+            self.pipe_live[rows] = live0[rows]
+
+        self.tick[active & ~died] += 1
+        self.alive &= ~died
+
+        return died
+
+    def world(self, i: int) -> World:
+        live = np.flatnonzero(self.pipe_live[i])
+        order = live[np.argsort(self.pipe_x[i, live], kind="stable")]
+
+        pipes = [
+            Pipe(
+                x=int(self.pipe_x[i, j]),
+                gap_y=int(self.pipe_gap_y[i, j]),
+                gap_h=int(self.pipe_gap_h[i, j]),
+                passed=bool(self.pipe_passed[i, j]),
+            )
+            for j in order
+        ]
+
+        if self.scale:
+            bird = FixedBird(x=self.bird_x, qy=int(self.y[i]), qvy=int(self.vy[i]), scale=self.scale)
+        else:
+            bird = Bird(x=self.bird_x, y=float(self.y[i]), vy=float(self.vy[i]))
+
+        return World(
+            width=self.width,
+            height=self.height,
+            bird=bird,
+            pipes=pipes,
+            score=int(self.score[i]),
+        )
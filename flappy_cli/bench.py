@@ -0,0 +1,357 @@
+from __future__ import annotations
+
+import argparse
+import io
+import json
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+from dataclasses import dataclass, field
+
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from .config import GameConfig, GameMode, make_bird, make_spawner
+from .game.core import Game
+from .game.states import GameOverState, PlayingState, StartState
+from .io.base import NullKeyReader, NullRenderer
+from .io.render import AsciiRenderer
+from .model import Bird, Pipe, World, advance_world, collides
+from .strategy import FixedIntervalSpawner, ScalingIntervalSpawner
+
+
+Op = Callable[[], None]
+
+
+@dataclass(slots=True)
+class BenchResult:
+    name: str
+    ops: int
+    runs_ns: List[float]
+    extra: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def median_ns(self) -> float:
+        return statistics.median(self.runs_ns)
+
+    def to_json(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "ops": self.ops,
+            "median_ns": self.median_ns,
+            "mean_ns": statistics.fmean(self.runs_ns),
+            "min_ns": min(self.runs_ns),
+            "stdev_ns": statistics.stdev(self.runs_ns) if len(self.runs_ns) > 1 else 0.0,
+            "runs_ns": self.runs_ns,
+            **self.extra,
+        }
+
+
+@dataclass(slots=True)
+class Benchmark:
+    name: str
+    ops: int
+    setup: Callable[[], Op]
+    extra: Optional[Callable[[int], Dict[str, Any]]] = None
+
+
+def _time_op(op: Op, ops: int) -> float:
+    start = time.perf_counter_ns()
+    for _ in range(ops):
+        op()
+
+    return (time.perf_counter_ns() - start) / ops
+
+
+def _physics(width: int, spacing: int) -> Callable[[], Op]:
+    def setup() -> Op:
+        world = World(width=width, height=20, bird=Bird(x=6, y=10.0))
+        for x in range(width - 1, 0, -spacing):
+            world.pipes.append(Pipe(x=x, gap_y=0, gap_h=20))
+        ticks = [0]
+
+        def op() -> None:
+            ticks[0] += 1
+            if ticks[0] % spacing == 0:
+                world.pipes.append(Pipe(x=width - 1, gap_y=0, gap_h=20))
+            advance_world(world, gravity=0.0)
+            collides(world)
+
+        return op
+
+    return setup
+
+
+def _spawner(make: Callable[[], Any]) -> Callable[[], Op]:
+    def setup() -> Op:
+        spawner = make()
+        world = World(width=45, height=20, bird=Bird(x=6, y=10.0))
+        ticks = [0]
+
+        def op() -> None:
+            ticks[0] += 1
+            spawner.should_spawn(tick=ticks[0], world=world)
+
+        return op
+
+    return setup
+
+
+def _make_game(renderer: Any) -> Game:
+    config = GameConfig()
+    return Game(
+        world=World(width=config.width, height=config.height, bird=make_bird(config)),
+        spawner=make_spawner(GameMode.MEDIUM),
+        mode=GameMode.MEDIUM,
+        config=config,
+        renderer=renderer,
+        keys=NullKeyReader(),
+        rng=random.Random(1),
+    )
+
+
+def _scripted_keys(game: Game) -> Iterator[Optional[str]]:
+    while True:
+        if isinstance(game.state, StartState):
+            yield " "
+        elif isinstance(game.state, GameOverState):
+            yield "r"
+        else:
+            pipe = game.world.pipes.ahead()
+            target = pipe.gap_y + pipe.gap_h // 2 if pipe is not None else game.world.height // 2
+            bird = game.world.bird
+            yield " " if bird.y > target and bird.vy >= 0 else None
+
+
+def _state_machine() -> Op:
+    game = _make_game(NullRenderer())
+    keys = _scripted_keys(game)
+
+    def op() -> None:
+        game.step_once(next(keys))
+
+    return op
+
+
+# a fixed board keeps bytes_per_frame independent of the bench terminal
+RENDER_SIZE = (80, 30)
+
+
+def _render_setup(diff: bool, sink: List[io.StringIO]) -> Callable[[], Op]:
+    def setup() -> Op:
+        out = io.StringIO()
+        sink[:] = [out]
+
+        renderer = AsciiRenderer(clear_once=False, diff=diff, stream=out, console=False, size=RENDER_SIZE)
+        game = _make_game(NullRenderer())
+        game.set_state(PlayingState())
+        keys = _scripted_keys(game)
+
+        def op() -> None:
+            game.step_once(next(keys))
+            if isinstance(game.state, GameOverState):
+                game.reset_world()
+                game.set_state(PlayingState())
+            renderer.render(game.world, message="PLAYING")
+
+        return op
+
+    return setup
+
+
+def _render(diff: bool) -> Benchmark:
+    sink: List[io.StringIO] = []
+    name = "render.diff" if diff else "render.full"
+    bench = Benchmark(name=name, ops=2_000, setup=_render_setup(diff, sink))
+
+    def extra(ops: int) -> Dict[str, Any]:
+        data = sink[0].getvalue()
+        return {"bytes_per_frame": len(data.encode("utf-8")) / ops}
+
+    bench.extra = extra
+    return bench
+
+
+HEADLESS_IMPORT = "import flappy_cli.game, flappy_cli.evaluate, flappy_cli.env"
+
+
+def _flock(size: int) -> Callable[[], Op]:
+    def setup() -> Op:
+        import numpy as np
+
+        from .flock import FlockWorld
+
+        flock = FlockWorld(
+            size=size,
+            config=GameConfig(gravity=0.0),
+            spawner=FixedIntervalSpawner(interval_ticks=6, gap_h=20),
+            seed=1,
+        )
+        flap = np.zeros(size, dtype=bool)
+
+        def op() -> None:
+            flock.step(flap)
+
+        return op
+
+    return setup
+
+
+def _trajectory() -> Op:
+    from .trajectory import table_for
+
+    config = GameConfig()
+    table = table_for(config)
+    height = config.height
+
+    def op() -> None:
+        table.exit_tick(10.0, table.velocities[3], 0, height)
+
+    return op
+
+
+def _startup() -> Op:
+    cmd = [sys.executable, "-c", HEADLESS_IMPORT]
+
+    def op() -> None:
+        subprocess.run(cmd, check=True)
+
+    return op
+
+
+def default_benchmarks() -> List[Benchmark]:
+    benches = []
+
+    for width in (45, 400, 3000):
+        for spacing in (24, 6):
+            benches.append(Benchmark(
+                name=f"physics.w{width}.s{spacing}",
+                ops=20_000,
+                setup=_physics(width, spacing),
+            ))
+
+    benches.append(Benchmark(
+        name="spawner.fixed",
+        ops=200_000,
+        setup=_spawner(lambda: FixedIntervalSpawner(interval_ticks=24, gap_h=8)),
+    ))
+    benches.append(Benchmark(
+        name="spawner.scaling",
+        ops=200_000,
+        setup=_spawner(lambda: ScalingIntervalSpawner(start_interval=22, min_interval=12, every_points=3, gap_h=6)),
+    ))
+    benches.append(Benchmark(name="game.step_once", ops=20_000, setup=_state_machine))
+    benches.append(_render(diff=False))
+    benches.append(_render(diff=True))
+    for size in (1, 1000, 10_000):
+        benches.append(Benchmark(name=f"flock.step.n{size}", ops=2_000, setup=_flock(size)))
+    benches.append(Benchmark(name="trajectory.exit_tick", ops=20_000, setup=_trajectory))
+    benches.append(Benchmark(name="startup.headless", ops=5, setup=_startup))
+
+    return benches
+
+
+def run_benchmarks(
+    benches: Sequence[Benchmark],
+    *,
+    repeat: int = 5,
+    scale: float = 1.0,
+    name_filter: str = "",
+) -> List[BenchResult]:
+    results = []
+
+    for bench in benches:
+        if name_filter and name_filter not in bench.name:
+            continue
+
+        ops = max(1, int(bench.ops * scale))
+        runs = []
+        extra: Dict[str, Any] = {}
+        for _ in range(repeat):
+            runs.append(_time_op(bench.setup(), ops))
+            if bench.extra is not None:
+                extra = bench.extra(ops)
+
+        results.append(BenchResult(name=bench.name, ops=ops, runs_ns=runs, extra=extra))
+
+    return results
+
+
+def compare(
+    current: Sequence[Dict[str, Any]],
+    baseline: Sequence[Dict[str, Any]],
+    *,
+    threshold: float = 0.10,
+) -> List[Dict[str, Any]]:
+    base = {b["name"]: b for b in baseline}
+    rows = []
+
+    for entry in current:
+        old = base.get(entry["name"])
+        if old is None:
+            continue
+
+        ratio = entry["median_ns"] / old["median_ns"] if old["median_ns"] else float("inf")
+        rows.append({
+            "name": entry["name"],
+            "baseline_ns": old["median_ns"],
+            "current_ns": entry["median_ns"],
+            "ratio": ratio,
+            "regression": ratio > 1.0 + threshold,
+        })
+
+    return rows
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="flappy_cli.bench")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="multiply the per-run op counts")
+    parser.add_argument("--filter", default="", help="only run benchmarks whose name contains this")
+    parser.add_argument("--out", metavar="PATH", help="write JSON results here instead of stdout")
+    parser.add_argument("--compare", metavar="PATH", help="baseline JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=0.10, help="allowed slowdown before flagging")
+    args = parser.parse_args(argv)
+
+    results = run_benchmarks(
+        default_benchmarks(),
+        repeat=args.repeat,
+        scale=args.scale,
+        name_filter=args.filter,
+    )
+
+    report: Dict[str, Any] = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "benchmarks": [r.to_json() for r in results],
+    }
+
+    status = 0
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            baseline = json.load(f)["benchmarks"]
+
+        rows = compare(report["benchmarks"], baseline, threshold=args.threshold)
+        report["comparison"] = rows
+        for row in rows:
+            flag = "REGRESSION" if row["regression"] else "ok"
+            print(f"{row['name']:<24} {row['ratio']:6.2f}x  {flag}", file=sys.stderr)
+            if row["regression"]:
+                status = 1
+
+    text = json.dumps(report, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    else:
+        print(text)
+
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
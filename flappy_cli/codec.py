@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import struct
+
+from typing import Optional, Tuple
+
+from .config import GameMode, make_spawner
+from .game.core import Game
+from .game.states import make_state, state_code
+from .levels import PackSpawner
+from .model import Bird, FixedBird, World
+
+
+MAGIC = b"FLWD"
+VERSION = 1
+
+MODES = list(GameMode)
+
+FLAG_FIXED = 1
+FLAG_GAME = 2
+
+HEADER = struct.Struct("<4sBBHHhHiqH")
+BIRD_FLOAT = struct.Struct("<dd")
+BIRD_FIXED = struct.Struct("<qq")
+PIPE = struct.Struct("<hHH?")
+GAME = struct.Struct("<IBBiI")
+RNG = struct.Struct("<625I?d")
+
+
+def encoded_size(world: World, *, game: Optional[Game] = None) -> int:
+    size = HEADER.size + BIRD_FLOAT.size + PIPE.size * len(world.pipes)
+    if game is not None:
+        size += GAME.size + RNG.size
+
+    return size
+
+
+def _spawner_position(game: Game) -> int:
+    spawner = game.spawner
+    if isinstance(spawner, PackSpawner):
+        return spawner.cursor
+
+    return getattr(spawner, "next_spawn_tick", 0)
+
+
+def encode_world(world: World, buf: memoryview | bytearray, offset: int = 0, *, game: Optional[Game] = None) -> int:
+    bird = world.bird
+    pipes = world.pipes
+    fixed = isinstance(bird, FixedBird)
+
+    flags = (FLAG_FIXED if fixed else 0) | (FLAG_GAME if game is not None else 0)
+    HEADER.pack_into(
+        buf, offset,
+        MAGIC,
+        VERSION,
+        flags,
+        world.width,
+        world.height,
+        bird.x,
+        bird.scale if fixed else 0,
+        world.score,
+        pipes.offset,
+        len(pipes),
+    )
+    offset += HEADER.size
+
+    if fixed:
+        BIRD_FIXED.pack_into(buf, offset, bird.qy, bird.qvy)
+    else:
+        BIRD_FLOAT.pack_into(buf, offset, bird.y, bird.vy)
+    offset += BIRD_FLOAT.size
+
+    for p in pipes:
+        PIPE.pack_into(buf, offset, p.x, p.gap_y, p.gap_h, p.passed)
+        offset += PIPE.size
+
+    if game is None:
+        return offset
+
+    code, final_score = state_code(game.state)
+    GAME.pack_into(buf, offset, game.tick, MODES.index(game.mode), code, final_score, _spawner_position(game))
+    offset += GAME.size
+
+    _, internal, gauss = game.rng.getstate()
+    RNG.pack_into(buf, offset, *internal, gauss is not None, gauss or 0.0)
+
+    return offset + RNG.size
+
+
+def dump_world(world: World, *, game: Optional[Game] = None) -> bytearray:
+    buf = bytearray(encoded_size(world, game=game))
+    encode_world(world, buf, game=game)
+
+    return buf
+
+
+def _read_header(buf: memoryview | bytes, offset: int) -> tuple:
+    fields = HEADER.unpack_from(buf, offset)
+    if fields[0] != MAGIC:
+        raise ValueError("not an encoded world")
+    if fields[1] != VERSION:
+        raise ValueError(f"unsupported world encoding version {fields[1]}")
+
+    return fields[2:]
+
+
+def decode_world(buf: memoryview | bytes, offset: int = 0, *, world: Optional[World] = None) -> Tuple[World, int]:
+    flags, width, height, bird_x, scale, score, scroll, n_pipes = _read_header(buf, offset)
+    offset += HEADER.size
+
+    if flags & FLAG_FIXED:
+        qy, qvy = BIRD_FIXED.unpack_from(buf, offset)
+        if world is not None and isinstance(world.bird, FixedBird) and world.bird.scale == scale:
+            bird = world.bird
+            bird.x, bird.qy, bird.qvy = bird_x, qy, qvy
+        else:
+            bird = FixedBird(x=bird_x, qy=qy, qvy=qvy, scale=scale)
+    else:
+        y, vy = BIRD_FLOAT.unpack_from(buf, offset)
+        if world is not None and isinstance(world.bird, Bird):
+            bird = world.bird
+            bird.x, bird.y, bird.vy = bird_x, y, vy
+        else:
+            bird = Bird(x=bird_x, y=y, vy=vy)
+    offset += BIRD_FLOAT.size
+
+    if world is None:
+        world = World(width=width, height=height, bird=bird)
+    else:
+        world.width = width
+        world.height = height
+        world.bird = bird
+
+    world.score = score
+
+    end = offset + PIPE.size * n_pipes
+    world.pipes.load(PIPE.iter_unpack(memoryview(buf)[offset:end]), offset=scroll, bird_x=bird_x)
+    offset = end
+
+    if flags & FLAG_GAME:
+        offset += GAME.size + RNG.size
+
+    return world, offset
+
+
+def restore_game(game: Game, buf: memoryview | bytes, offset: int = 0) -> int:
+    flags = _read_header(buf, offset)[0]
+    if not flags & FLAG_GAME:
+        raise ValueError("encoded world carries no game state")
+
+    _, end = decode_world(buf, offset, world=game.world)
+    offset = end - GAME.size - RNG.size
+
+    tick, mode, code, final_score, spawner_pos = GAME.unpack_from(buf, offset)
+    offset += GAME.size
+
+    *internal, has_gauss, gauss = RNG.unpack_from(buf, offset)
+    game.rng.setstate((3, tuple(internal), gauss if has_gauss else None))
+
+    game.mode = MODES[mode]
+    if game.spawner is None:
+        game.spawner = make_spawner(game.mode)
+    if isinstance(game.spawner, PackSpawner):
+        game.spawner.cursor = spawner_pos
+    elif hasattr(game.spawner, "next_spawn_tick"):
+        game.spawner.next_spawn_tick = spawner_pos
+
+    game.tick = tick
+    game.history.clear()
+    game.set_state(make_state(code, final_score))
+    game.is_running = True
+
+    return end
@@ -4,6 +4,9 @@ from dataclasses import dataclass
 
 from enum import Enum
 
+from typing import Optional, Union
+
+from .model import Bird, FixedBird, to_fixed
 from .strategy import FixedIntervalSpawner, ScalingIntervalSpawner, SpawnerStrategy
 
 
@@ -23,9 +26,39 @@ class GameConfig:
     flap_velocity: float = -1.6
 
     fps: int = 20
+    sim_rate: int | None = None
+    render_rate: int | None = None
+    max_catch_up: int = 5
 
     seed: int | None = None
 
+    fixed_point_scale: int = 0
+
+    input_backend: str | None = None
+    render_backend: str | None = None
+
+    @property
+    def sim_hz(self) -> int:
+        return self.sim_rate or self.fps
+
+    @property
+    def render_hz(self) -> int:
+        return self.render_rate or self.fps
+
+
+def make_bird(config: GameConfig, *, y: Optional[float] = None) -> Union[Bird, FixedBird]:
+    if y is None:
+        y = config.height // 2
+
+    scale = config.fixed_point_scale
+    if not scale:
+        return Bird(x=config.bird_x, y=y)
+
+    to_fixed(config.gravity, scale)
+    to_fixed(config.flap_velocity, scale)
+
+    return FixedBird.from_float(x=config.bird_x, y=y, scale=scale)
+
 
 def make_spawner(mode: GameMode) -> SpawnerStrategy:
     if mode == GameMode.EASY:
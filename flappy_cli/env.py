@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+import random
+
+from array import array
+from dataclasses import dataclass, field
+
+from typing import Any, Dict, Optional
+
+from .config import GameConfig, GameMode, make_bird, make_spawner
+from .model import World, advance_world, collides_bounds, collides_pipe
+from .strategy import SpawnerStrategy
+
+
+OBS_BIRD_Y = 0
+OBS_BIRD_VY = 1
+OBS_PIPE1 = 2
+OBS_PIPE2 = 5
+OBS_SIZE = 8
+
+EMPTY = 0
+PIPE = 1
+BIRD = 2
+
+
+@dataclass(slots=True)
+class FlappyEnv:
+    config: GameConfig = field(default_factory=GameConfig)
+    mode: GameMode = GameMode.EASY
+    grid: bool = False
+    max_steps: int = 0
+    death_reward: float = -1.0
+
+    world: World = field(init=False)
+    spawner: SpawnerStrategy = field(init=False)
+    rng: random.Random = field(init=False)
+    tick: int = 0
+    steps: int = 0
+    done: bool = True
+
+    obs: array = field(init=False)
+    grid_obs: bytearray = field(init=False)
+    info: Dict[str, Any] = field(init=False)
+
+    _blank: bytes = field(init=False, repr=False)
+    _columns: Dict[tuple[int, int], bytes] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        config = self.config
+        self.world = World(
+            width=config.width,
+            height=config.height,
+            bird=make_bird(config),
+        )
+        self.spawner = make_spawner(self.mode)
+        self.rng = random.Random(config.seed)
+
+        self.obs = array("d", bytes(8 * OBS_SIZE))
+        cells = config.width * config.height if self.grid else 0
+        self.grid_obs = bytearray(cells)
+        self._blank = bytes(cells)
+        self.info = {"score": 0, "tick": 0, "truncated": False}
+
+    def reset(self, seed: Optional[int] = None) -> array:
+        world = self.world
+        world.bird.y = world.height // 2
+        world.bird.vy = 0.0
+        world.pipes.clear()
+        world.score = 0
+
+        if seed is not None:
+            self.rng.seed(seed)
+        self.spawner.reset()
+        self.tick = 0
+        self.steps = 0
+        self.done = False
+
+        self.info["score"] = 0
+        self.info["tick"] = 0
+        self.info["truncated"] = False
+
+        self._observe()
+        return self.obs
+
+    def step(self, action: int) -> tuple[array, float, bool, Dict[str, Any]]:
+        if self.done:
+            raise RuntimeError("step() called on a finished episode; call reset() first")
+
+        world = self.world
+        config = self.config
+
+        if action:
+            world.bird.flap(config.flap_velocity)
+
+        if self.spawner.should_spawn(tick=self.tick, world=world):
+            world.pipes.append(self.spawner.make_pipe(world=world, rng=self.rng))
+
+        score = world.score
+
+        advance_world(world, gravity=config.gravity)
+
+        reward = float(world.score - score)
+        hit_pipe = collides_pipe(world)
+        if hit_pipe or collides_bounds(world):
+            if hit_pipe:
+                world.score = score
+            reward = self.death_reward
+            self.done = True
+        else:
+            self.tick += 1
+
+        self.steps += 1
+        if self.max_steps and self.steps >= self.max_steps and not self.done:
+            self.done = True
+            self.info["truncated"] = True
+
+        self.info["score"] = world.score
+        self.info["tick"] = self.tick
+
+        self._observe()
+        return self.obs, reward, self.done, self.info
+
+    def _observe(self) -> None:
+        world = self.world
+        bird = world.bird
+        obs = self.obs
+        pipes = world.pipes
+
+        obs[OBS_BIRD_Y] = bird.y
+        obs[OBS_BIRD_VY] = bird.vy
+
+        for slot, k in ((OBS_PIPE1, 0), (OBS_PIPE2, 1)):
+            p = pipes.ahead(k)
+            if p is not None:
+                obs[slot] = p.x - bird.x
+                obs[slot + 1] = p.gap_y
+                obs[slot + 2] = p.gap_y + p.gap_h
+            else:
+                obs[slot] = world.width
+                obs[slot + 1] = 0.0
+                obs[slot + 2] = world.height
+
+        if self.grid:
+            self._observe_grid()
+
+    def _column(self, gap_y: int, gap_h: int) -> bytes:
+        key = (gap_y, gap_h)
+        column = self._columns.get(key)
+        if column is None:
+            column = bytes(
+                EMPTY if gap_y <= y < gap_y + gap_h else PIPE
+                for y in range(self.world.height)
+            )
+            self._columns[key] = column
+
+        return column
+
+    def _observe_grid(self) -> None:
+        world = self.world
+        width = world.width
+        buf = self.grid_obs
+        buf[:] = self._blank
+
+        for p in world.pipes:
+            if 0 <= p.x < width:
+                buf[p.x::width] = self._column(p.gap_y, p.gap_h)
+
+        by = world.bird.cell_y
+        if 0 <= by < world.height and 0 <= world.bird.x < width:
+            buf[by * width + world.bird.x] = BIRD
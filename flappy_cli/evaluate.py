@@ -0,0 +1,299 @@
+from __future__ import annotations
+
+import os
+import random
+import time
+
+from collections import Counter
+from dataclasses import dataclass, field
+
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence
+
+from .autopilot import Autopilot
+from .config import GameConfig, GameMode, make_bird, make_spawner
+from .game.core import Game
+from .game.states import GameOverState
+from .io.base import NullKeyReader, NullRenderer
+from .levels import LevelPack
+from .model import World
+from .results import GameRecord, ResultsWriter
+from .strategy import SpawnerStrategy
+
+
+Policy = Callable[[World], bool]
+
+# per-decision search budget for --policy autopilot; far above what the
+# transposition table usually needs, and independent of CPU load
+EVAL_NODES = 4096
+
+
+def gap_policy(world: World) -> bool:
+    bird = world.bird
+    pipe = world.pipes.ahead()
+    if pipe is None:
+        return bird.y > world.height // 2 and bird.vy >= 0
+
+    target = pipe.gap_y + pipe.gap_h // 2
+
+    return bird.y > target and bird.vy >= 0
+
+
+def never_flap(world: World) -> bool:
+    return False
+
+
+@dataclass(slots=True, frozen=True)
+class GameResult:
+    seed: int
+    score: int
+    ticks: int
+
+
+@dataclass(slots=True)
+class EvalSummary:
+    games: int = 0
+    total_score: int = 0
+    total_ticks: int = 0
+    max_score: int = 0
+    max_ticks: int = 0
+    scores: Counter = field(default_factory=Counter)
+    elapsed: float = 0.0
+
+    def add(self, result: GameResult) -> None:
+        self.games += 1
+        self.total_score += result.score
+        self.total_ticks += result.ticks
+        self.max_score = max(self.max_score, result.score)
+        self.max_ticks = max(self.max_ticks, result.ticks)
+        self.scores[result.score] += 1
+
+    def merge(self, other: "EvalSummary") -> None:
+        self.games += other.games
+        self.total_score += other.total_score
+        self.total_ticks += other.total_ticks
+        self.max_score = max(self.max_score, other.max_score)
+        self.max_ticks = max(self.max_ticks, other.max_ticks)
+        self.scores.update(other.scores)
+
+    @property
+    def mean_score(self) -> float:
+        return self.total_score / self.games if self.games else 0.0
+
+    @property
+    def mean_ticks(self) -> float:
+        return self.total_ticks / self.games if self.games else 0.0
+
+    @property
+    def games_per_sec(self) -> float:
+        return self.games / self.elapsed if self.elapsed > 0 else 0.0
+
+    def percentile(self, q: float) -> int:
+        if not self.games:
+            return 0
+
+        rank = q / 100.0 * (self.games - 1)
+        seen = 0
+        for score in sorted(self.scores):
+            seen += self.scores[score]
+            if seen > rank:
+                return score
+
+        return self.max_score
+
+
+def play_headless(
+    policy: Policy,
+    *,
+    seed: int,
+    mode: GameMode = GameMode.EASY,
+    spawner: Optional[SpawnerStrategy] = None,
+    config: Optional[GameConfig] = None,
+    max_ticks: int = 10_000,
+    results: Optional[ResultsWriter] = None,
+    pack: Optional[LevelPack] = None,
+) -> GameResult:
+    config = config or GameConfig()
+    started = time.perf_counter()
+
+    # stateful policies (the autopilot's transposition table) start every game
+    # fresh, so a result does not depend on which games shared a worker
+    reset = getattr(policy, "reset", None)
+    if reset is not None:
+        reset()
+
+    if pack is not None:
+        pack.check(config)
+        if max_ticks > pack.horizon:
+            raise ValueError(f"level pack courses end at tick {pack.horizon}")
+        mode = pack.mode
+        spawner = pack.spawner(seed)
+
+    world = World(
+        width=config.width,
+        height=config.height,
+        bird=make_bird(config),
+    )
+    game = Game(
+        world=world,
+        spawner=spawner if spawner is not None else make_spawner(mode),
+        mode=mode,
+        config=config,
+        renderer=NullRenderer(),
+        keys=NullKeyReader(),
+        rng=random.Random(seed),
+    )
+
+    game.start_playing()
+    game.step_once(None)
+
+    while game.tick < max_ticks and not isinstance(game.state, GameOverState):
+        game.step_once(" " if policy(game.world) else None)
+
+    if results is not None:
+        results.append(GameRecord(
+            seed=seed,
+            mode=mode,
+            score=game.world.score,
+            ticks=game.tick,
+            duration=time.perf_counter() - started,
+            timestamp=time.time(),
+        ))
+
+    return GameResult(seed=seed, score=game.world.score, ticks=game.tick)
+
+
+def _run_chunk(
+    policy: Policy,
+    seeds: Sequence[int],
+    mode: GameMode,
+    spawner: Optional[SpawnerStrategy],
+    config: Optional[GameConfig],
+    max_ticks: int,
+    results_path: Optional[str] = None,
+    pack: Optional[LevelPack] = None,
+) -> EvalSummary:
+    summary = EvalSummary()
+    results = ResultsWriter(results_path) if results_path else None
+    try:
+        for seed in seeds:
+            summary.add(play_headless(
+                policy,
+                seed=seed,
+                mode=mode,
+                spawner=spawner,
+                config=config,
+                max_ticks=max_ticks,
+                results=results,
+                pack=pack,
+            ))
+    finally:
+        if results is not None:
+            results.close()
+
+    return summary
+
+
+def _chunks(seeds: List[int], size: int) -> Iterator[List[int]]:
+    for i in range(0, len(seeds), size):
+        yield seeds[i:i + size]
+
+
+def iter_evaluate(
+    policy: Policy,
+    seeds: Iterable[int],
+    *,
+    mode: GameMode = GameMode.EASY,
+    spawner: Optional[SpawnerStrategy] = None,
+    config: Optional[GameConfig] = None,
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    max_ticks: int = 10_000,
+    results_path: Optional[str] = None,
+    pack: Optional[LevelPack] = None,
+) -> Iterator[EvalSummary]:
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    if chunk_size is None:
+        chunk_size = max(16, len(seeds) // (workers * 8) or 1)
+
+    started = time.perf_counter()
+    total = EvalSummary()
+    args = (mode, spawner, config, max_ticks, results_path, pack)
+
+    if workers == 1:
+        for chunk in _chunks(seeds, chunk_size):
+            total.merge(_run_chunk(policy, chunk, *args))
+            total.elapsed = time.perf_counter() - started
+            yield total
+        return
+
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = [pool.submit(_run_chunk, policy, chunk, *args) for chunk in _chunks(seeds, chunk_size)]
+        for future in as_completed(futures):
+            total.merge(future.result())
+            total.elapsed = time.perf_counter() - started
+            yield total
+
+
+def evaluate(policy: Policy, seeds: Iterable[int], **kwargs) -> EvalSummary:
+    summary = EvalSummary()
+    for summary in iter_evaluate(policy, seeds, **kwargs):
+        pass
+
+    return summary
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(prog="flappy_cli.evaluate")
+    parser.add_argument("--mode", choices=[m.value for m in GameMode], default=GameMode.EASY.value)
+    parser.add_argument("--seeds", type=int, default=1000, help="number of seeds to play")
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-ticks", type=int, default=10_000)
+    parser.add_argument("--policy", choices=["gap", "autopilot"], default="gap")
+    parser.add_argument("--results", metavar="PATH", help="append every game to a results store")
+    parser.add_argument("--pack", metavar="PATH", help="play the precompiled courses of a level pack (sets --mode and the seed range)")
+    args = parser.parse_args(argv)
+
+    policy: Policy = gap_policy
+    if args.policy == "autopilot":
+        policy = Autopilot(max_nodes=EVAL_NODES)
+
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    mode = GameMode(args.mode)
+    pack = None
+    if args.pack:
+        pack = LevelPack(args.pack)
+        mode = pack.mode
+        seeds = range(pack.first_seed, pack.first_seed + min(args.seeds, len(pack)))
+
+    summary = evaluate(
+        policy,
+        seeds,
+        mode=mode,
+        pack=pack,
+        workers=args.workers,
+        max_ticks=args.max_ticks,
+        results_path=args.results,
+    )
+
+    print(json.dumps({
+        "games": summary.games,
+        "mean_score": summary.mean_score,
+        "max_score": summary.max_score,
+        "p50_score": summary.percentile(50),
+        "p90_score": summary.percentile(90),
+        "mean_ticks": summary.mean_ticks,
+        "max_ticks": summary.max_ticks,
+        "games_per_sec": summary.games_per_sec,
+        "scores": {str(k): v for k, v in sorted(summary.scores.items())},
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,234 @@
+from __future__ import annotations
+
+import random
+
+from dataclasses import dataclass, field
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from .config import GameConfig, GameMode, make_spawner
+from .model import Bird, World, move_pipes_left, remove_offscreen_pipes, to_fixed, update_score
+from .strategy import SpawnerStrategy
+
+
+@dataclass(slots=True)
+class FlockWorld:
+    size: int
+    config: GameConfig = field(default_factory=GameConfig)
+    mode: GameMode = GameMode.EASY
+    spawner: Optional[SpawnerStrategy] = None
+    seed: Optional[int] = None
+
+    course: World = field(init=False)
+    rng: random.Random = field(init=False)
+    tick: int = 0
+
+    ids: np.ndarray = field(init=False, repr=False)
+    y: np.ndarray = field(init=False, repr=False)
+    vy: np.ndarray = field(init=False, repr=False)
+    alive: np.ndarray = field(init=False, repr=False)
+    final_score: np.ndarray = field(init=False, repr=False)
+    final_tick: np.ndarray = field(init=False, repr=False)
+
+    unit: int = field(default=1, init=False)
+    _gravity: float = field(default=0.0, repr=False)
+    _flap: float = field(default=0.0, repr=False)
+    _tables: Dict[int, np.ndarray] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self) -> None:
+        config = self.config
+        self.course = World(width=config.width, height=config.height, bird=Bird(x=config.bird_x, y=config.height // 2))
+        if self.spawner is None:
+            self.spawner = make_spawner(self.mode)
+        self.rng = random.Random(self.seed if self.seed is not None else config.seed)
+
+        scale = config.fixed_point_scale
+        if scale:
+            self.unit = scale
+            self._gravity = to_fixed(config.gravity, scale)
+            self._flap = to_fixed(config.flap_velocity, scale)
+        else:
+            self._gravity = config.gravity
+            self._flap = config.flap_velocity
+
+        self.reset()
+
+    def reset(self, seed: Optional[int] = None) -> None:
+        config = self.config
+        n = self.size
+
+        if seed is not None:
+            self.rng.seed(seed)
+        self.spawner.reset()
+        self.course.pipes.clear()
+        self.course.score = 0
+        self.tick = 0
+
+        dtype = np.int64 if config.fixed_point_scale else np.float64
+        self.ids = np.arange(n)
+        self.y = np.full(n, (config.height // 2) * self.unit, dtype=dtype)
+        self.vy = np.zeros(n, dtype=dtype)
+        self.alive = np.ones(n, dtype=bool)
+        self.final_score = np.zeros(n, dtype=np.int64)
+        self.final_tick = np.zeros(n, dtype=np.int64)
+
+    @property
+    def living(self) -> int:
+        return len(self.ids)
+
+    @property
+    def done(self) -> bool:
+        return not len(self.ids)
+
+    @property
+    def scores(self) -> np.ndarray:
+        return np.where(self.alive, self.course.score, self.final_score)
+
+    @property
+    def ticks(self) -> np.ndarray:
+        return np.where(self.alive, self.tick, self.final_tick)
+
+    @property
+    def cell_y(self) -> np.ndarray:
+        y = self.y
+        if not self.config.fixed_point_scale:
+            # astype truncates toward zero, exactly like int() in Bird.cell_y
+            return y.astype(np.int64)
+
+        return np.sign(y) * (np.abs(y) // self.unit)
+
+    def _collision_table(self) -> Optional[np.ndarray]:
+        course = self.course
+        pipes = course.pipes.at_column(course.bird.x)
+        if not pipes:
+            return None
+
+        mask = 0
+        for p in pipes:
+            mask |= p.blocked
+
+        table = self._tables.get(mask)
+        if table is None:
+            rows = [True] + [(mask >> r) & 1 == 1 for r in range(course.height + 1)]
+            table = self._tables[mask] = np.array(rows, dtype=bool)
+
+        return table
+
+    def step(self, flap: Sequence[bool] | np.ndarray) -> np.ndarray:
+        if not len(self.ids):
+            return self.ids
+
+        course = self.course
+        flap = np.asarray(flap, dtype=bool)
+        self.vy[flap] = self._flap
+
+        if self.spawner.should_spawn(tick=self.tick, world=course):
+            course.pipes.append(self.spawner.make_pipe(world=course, rng=self.rng))
+
+        self.vy += self._gravity
+        self.y += self.vy
+
+        score = course.score
+        move_pipes_left(course, dx=1)
+        update_score(course)
+        remove_offscreen_pipes(course)
+
+        cells = self.cell_y
+        height = course.height
+        dead = (cells < 0) | (cells >= height)
+
+        table = self._collision_table()
+        hit_pipe = None
+        if table is not None:
+            hit_pipe = table[np.clip(cells, -1, height) + 1]
+            dead |= hit_pipe
+
+        if not dead.any():
+            self.tick += 1
+            return self.ids[:0]
+
+        gone = self.ids[dead]
+        self.alive[gone] = False
+        self.final_tick[gone] = self.tick
+        self.final_score[gone] = course.score
+        if hit_pipe is not None:
+            self.final_score[self.ids[hit_pipe]] = score
+
+        keep = ~dead
+        self.ids = self.ids[keep]
+        self.y = self.y[keep]
+        self.vy = self.vy[keep]
+        self.tick += 1
+
+        return gone
+
+    def row_counts(self) -> np.ndarray:
+        cells = self.cell_y
+        height = self.course.height
+        cells = cells[(cells >= 0) & (cells < height)]
+
+        return np.bincount(cells, minlength=height)
+
+    def hud(self) -> List[str]:
+        return [f"Flock: {self.living}/{self.size} alive | tick {self.tick}"]
+
+
+def gap_flock_policy(flock: FlockWorld, noise: float = 0.0, rng: Optional[np.random.Generator] = None) -> np.ndarray:
+    course = flock.course
+    pipe = course.pipes.ahead()
+    target = course.height // 2 if pipe is None else pipe.gap_y + pipe.gap_h // 2
+
+    y = flock.y / flock.unit
+    if noise and rng is not None:
+        y = y + rng.normal(0.0, noise, size=len(y))
+
+    return (y > target) & (flock.vy >= 0)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(prog="flappy_cli.flock")
+    parser.add_argument("--birds", type=int, default=500)
+    parser.add_argument("--mode", choices=[m.value for m in GameMode], default=GameMode.EASY.value)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--noise", type=float, default=1.0, help="std-dev of the per-bird error in the gap policy, in cells")
+    parser.add_argument("--max-ticks", type=int, default=10_000)
+    parser.add_argument("--watch", action="store_true", help="draw the flock in the terminal")
+    args = parser.parse_args(argv)
+
+    flock = FlockWorld(size=args.birds, mode=GameMode(args.mode), seed=args.seed)
+    noise = np.random.default_rng(args.seed)
+
+    renderer = None
+    if args.watch:
+        from .io.render import AsciiRenderer
+
+        renderer = AsciiRenderer(diff=True, hud_source=flock.hud, flock_source=flock.row_counts)
+
+    started = time.perf_counter()
+    flock.step(np.ones(flock.living, dtype=bool))
+    while not flock.done and flock.tick < args.max_ticks:
+        flock.step(gap_flock_policy(flock, args.noise, noise))
+        if renderer is not None:
+            renderer.render(flock.course, message="FLOCK")
+            time.sleep(1.0 / flock.config.fps)
+    elapsed = time.perf_counter() - started
+
+    scores = flock.scores
+    print(json.dumps({
+        "birds": flock.size,
+        "ticks": flock.tick,
+        "alive": flock.living,
+        "max_score": int(scores.max()) if flock.size else 0,
+        "mean_score": float(scores.mean()) if flock.size else 0.0,
+        "bird_ticks_per_sec": float(flock.ticks.sum() / elapsed) if elapsed > 0 else 0.0,
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,14 +5,15 @@ import time
 
 from dataclasses import dataclass, field
 
-from typing import Optional
+from typing import Callable, Optional
 
 from ..config import GameConfig, GameMode
-from ..model import World
+from ..model import World, WorldHistory
+from ..results import GameRecord, ResultsWriter
 from ..strategy import SpawnerStrategy
-from ..io.input import KeyReader
-from ..io.render import Renderer
-from .states import GameState, StartState
+from ..io.base import KeyReader, Renderer
+from .states import GameState, PlayingState, StartState
+from .telemetry import PHASE_INPUT, PHASE_RENDER, PHASE_UPDATE, FrameProfiler
 
 
 @dataclass(slots=True)
@@ -27,8 +28,21 @@ class Game:
     rng: random.Random
 
     state: GameState = field(default_factory=StartState)
+    history: WorldHistory = field(default_factory=WorldHistory)
     is_running: bool = True
     tick: int = 0
+    # simulation steps since the game was created; unlike tick it never
+    # resets, so it can timestamp a whole session
+    steps: int = 0
+
+    clock: Callable[[], float] = field(default=time.monotonic, repr=False)
+    sleep: Callable[[float], None] = field(default=time.sleep, repr=False)
+    frames_rendered: int = 0
+    frames_skipped: int = 0
+    profiler: Optional[FrameProfiler] = None
+    autopilot: Optional[Callable[[World], bool]] = None
+    results: Optional[ResultsWriter] = None
+    started_at: float = 0.0
 
     def set_state(self, state: GameState) -> None:
         self.state = state
@@ -39,29 +53,123 @@ class Game:
         self.world.pipes.clear()
         self.world.score = 0
         self.tick = 0
+        self.history.clear()
         self.spawner.reset()
         self.keys.flush()
+        self.started_at = self.clock()
+
+    def start_playing(self) -> None:
+        self.reset_world()
+        self.set_state(PlayingState())
+        self.world.bird.flap(self.config.flap_velocity)
+
+    def record_result(self) -> None:
+        if self.results is None:
+            return
+
+        self.results.append(GameRecord(
+            seed=self.config.seed,
+            mode=self.mode,
+            score=self.world.score,
+            ticks=self.tick,
+            duration=self.clock() - self.started_at,
+            timestamp=time.time(),
+        ))
 
     def step_once(self, key: Optional[str]) -> None:
+        self.steps += 1
+        prof = self.profiler
+        if prof is None:
+            self.state.handle_input(self, key)
+            self.state.update(self)
+            self.state.render(self)
+            return
+
+        t0 = prof.clock()
         self.state.handle_input(self, key)
         self.state.update(self)
-        self.state.render(self)
-
-    def run(self) -> None:
-        frame_time = 1.0 / self.config.fps
-        next_t = time.monotonic()
+        prof.add(PHASE_UPDATE, prof.clock() - t0)
+        self.render_frame()
 
-        while self.is_running:
+    def sim_step(self) -> None:
+        self.steps += 1
+        prof = self.profiler
+        if prof is None:
             key = self.keys.read_key()
             self.state.handle_input(self, key)
             self.state.update(self)
+            return
+
+        t0 = prof.clock()
+        key = self.keys.read_key()
+        t1 = prof.clock()
+        self.state.handle_input(self, key)
+        self.state.update(self)
+        prof.add(PHASE_INPUT, t1 - t0)
+        prof.add(PHASE_UPDATE, prof.clock() - t1)
+
+    def render_frame(self) -> None:
+        prof = self.profiler
+        if prof is None:
             self.state.render(self)
+            return
+
+        t0 = prof.clock()
+        self.state.render(self)
+        prof.add(PHASE_RENDER, prof.clock() - t0)
+        prof.frame_presented()
+
+    def _sleep(self, delay: float) -> None:
+        prof = self.profiler
+        if prof is None:
+            self.sleep(delay)
+            return
+
+        t0 = prof.clock()
+        self.sleep(delay)
+        prof.slept(delay, prof.clock() - t0)
+
+    def run(self) -> None:
+        sim_dt = 1.0 / self.config.sim_hz
+        render_dt = 1.0 / self.config.render_hz
+        max_steps = max(1, self.config.max_catch_up)
+
+        next_sim = self.clock()
+        next_render = next_sim
+        skipped = 0
+
+        while self.is_running:
+            now = self.clock()
+
+            steps = 0
+            while self.is_running and next_sim <= now and steps < max_steps:
+                self.sim_step()
+                next_sim += sim_dt
+                steps += 1
+
+            if steps > 1 and self.profiler is not None:
+                self.profiler.missed()
+
+            if next_sim <= now:
+                next_sim = now + sim_dt
+
+            if not self.is_running:
+                break
+
+            if next_render <= now:
+                behind = self.clock() >= next_sim
+                if behind and skipped < max_steps:
+                    skipped += 1
+                    self.frames_skipped += 1
+                else:
+                    self.render_frame()
+                    skipped = 0
+                    self.frames_rendered += 1
 
-            next_t += frame_time
-            now = time.monotonic()
-            delay = next_t - now
+                next_render += render_dt
+                if next_render <= now:
+                    next_render = now + render_dt
 
+            delay = min(next_sim, next_render) - self.clock()
             if delay > 0:
-                time.sleep(delay)
-            else:
-                next_t = now
+                self._sleep(delay)
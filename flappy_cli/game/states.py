@@ -1,7 +1,5 @@
 from __future__ import annotations
 
-import copy
-
 from dataclasses import dataclass
 
 from typing import Optional, Protocol
@@ -10,6 +8,11 @@ from ..config import GameMode, make_spawner
 from ..model import advance_world, collides, collides_pipe
 
 
+STATE_START = 0
+STATE_PLAYING = 1
+STATE_GAME_OVER = 2
+
+
 class GameState(Protocol):
     def handle_input(self, game: "Game", key: Optional[str]) -> None: ...
     def update(self, game: "Game") -> None: ...
@@ -35,9 +38,7 @@ class StartState:
 
         if key == " ":
             game.spawner = make_spawner(game.mode)
-            game.reset_world()
-            game.set_state(PlayingState())
-            game.world.bird.flap(game.config.flap_velocity)
+            game.start_playing()
 
     def update(self, game: "Game") -> None:
         return
@@ -56,7 +57,13 @@ class PlayingState:
     def handle_input(self, game: "Game", key: Optional[str]) -> None:
         if key == "q":
             game.is_running = False
-        elif key == " ":
+            return
+
+        flap = key == " "
+        if game.autopilot is not None:
+            flap = game.autopilot(game.world)
+
+        if flap:
             game.world.bird.flap(game.config.flap_velocity)
 
     def update(self, game: "Game") -> None:
@@ -64,14 +71,15 @@ class PlayingState:
             pipe = game.spawner.make_pipe(world=game.world, rng=game.rng)
             game.world.pipes.append(pipe)
 
-        safe_world = copy.deepcopy(game.world)
+        game.history.push(game.world)
 
         advance_world(game.world, gravity=game.config.gravity)
 
         if collides(game.world):
             if collides_pipe(game.world):
-                game.world = safe_world
+                game.history.rewind(game.world)
             game.set_state(GameOverState(final_score=game.world.score))
+            game.record_result()
             return
 
         game.tick += 1
@@ -95,6 +103,8 @@ class GameOverState:
         elif key == "r":
             game.reset_world()
             game.set_state(StartState())
+        elif key == "b":
+            game.history.rewind(game.world)
 
     def update(self, game: "Game") -> None:
         return
@@ -103,6 +113,28 @@ class GameOverState:
         message = (
             "GAME OVER\n"
             f"Final score: {self.final_score}\n"
-            "R to restart | Q to quit"
+            "R to restart | B to rewind | Q to quit"
         )
         game.renderer.render(game.world, message=message)
+
+
+def state_code(state: GameState) -> tuple[int, int]:
+    if isinstance(state, StartState):
+        return STATE_START, 0
+    if isinstance(state, PlayingState):
+        return STATE_PLAYING, 0
+    if isinstance(state, GameOverState):
+        return STATE_GAME_OVER, state.final_score
+
+    raise ValueError(f"cannot record state {type(state).__name__}")
+
+
+def make_state(code: int, final_score: int) -> GameState:
+    if code == STATE_START:
+        return StartState()
+    if code == STATE_PLAYING:
+        return PlayingState()
+    if code == STATE_GAME_OVER:
+        return GameOverState(final_score=final_score)
+
+    raise ValueError(f"unknown state code {code}")
@@ -0,0 +1,150 @@
+from __future__ import annotations
+
+import sys
+import time
+
+from dataclasses import dataclass, field
+
+from typing import Any, Callable, Dict, List, Optional, TextIO
+
+
+PHASE_INPUT = "input"
+PHASE_UPDATE = "update"
+PHASE_RENDER = "render"
+PHASE_SLEEP = "sleep"
+
+PHASES = (PHASE_INPUT, PHASE_UPDATE, PHASE_RENDER, PHASE_SLEEP)
+
+FRAME_BUCKETS_MS = (1, 2, 4, 8, 16, 33, 50, 100, 250)
+
+
+@dataclass(slots=True)
+class PhaseStats:
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def add(self, dt: float) -> None:
+        self.count += 1
+        self.total += dt
+        if dt > self.max:
+            self.max = dt
+
+    @property
+    def mean(self) -> float:
+        return self.total / self.count if self.count else 0.0
+
+
+@dataclass(slots=True)
+class CountingWriter:
+    inner: TextIO
+    profiler: "FrameProfiler"
+
+    def write(self, data: str) -> int:
+        self.profiler.bytes_written += len(data.encode("utf-8"))
+        return self.inner.write(data)
+
+    def flush(self) -> None:
+        self.inner.flush()
+
+
+@dataclass(slots=True)
+class FrameProfiler:
+    clock: Callable[[], float] = time.perf_counter
+    export: Optional[TextIO] = None
+    export_every: float = 1.0
+    oversleep_tolerance: float = 0.002
+
+    phases: Dict[str, PhaseStats] = field(default_factory=lambda: {name: PhaseStats() for name in PHASES})
+    histogram: List[int] = field(default_factory=lambda: [0] * (len(FRAME_BUCKETS_MS) + 1))
+    frames: int = 0
+    missed_deadlines: int = 0
+    oversleeps: int = 0
+    oversleep_time: float = 0.0
+    bytes_written: int = 0
+
+    _last_frame: Optional[float] = field(default=None, repr=False)
+    _last_export: Optional[float] = field(default=None, repr=False)
+
+    def attach(self, game: Any, *, hud: bool = False) -> None:
+        game.profiler = self
+        renderer = game.renderer
+
+        # the bytes are written by the innermost renderer, below any broadcast
+        # or render-thread wrappers
+        writer = renderer
+        while writer is not None and not hasattr(writer, "stream"):
+            inner = getattr(writer, "inner", None)
+            writer = inner if inner is not None else getattr(writer, "local", None)
+
+        if writer is not None:
+            stream = writer.stream if writer.stream is not None else sys.stdout
+            writer.stream = CountingWriter(stream, self)
+
+        if hud and hasattr(renderer, "hud_source"):
+            renderer.hud_source = self.hud_lines
+
+    def add(self, phase: str, dt: float) -> None:
+        self.phases[phase].add(dt)
+
+    def missed(self) -> None:
+        self.missed_deadlines += 1
+
+    def slept(self, requested: float, actual: float) -> None:
+        self.phases[PHASE_SLEEP].add(actual)
+
+        over = actual - requested
+        if over > self.oversleep_tolerance:
+            self.oversleeps += 1
+            self.oversleep_time += over
+
+    def frame_presented(self) -> None:
+        now = self.clock()
+        self.frames += 1
+
+        if self._last_frame is not None:
+            ms = (now - self._last_frame) * 1000.0
+            bucket = 0
+            while bucket < len(FRAME_BUCKETS_MS) and ms > FRAME_BUCKETS_MS[bucket]:
+                bucket += 1
+            self.histogram[bucket] += 1
+        self._last_frame = now
+
+        if self.export is not None:
+            if self._last_export is None:
+                self._last_export = now
+            elif now - self._last_export >= self.export_every:
+                self.export_line()
+                self._last_export = now
+
+    def snapshot(self) -> Dict[str, Any]:
+        labels = [f"<={ms}ms" for ms in FRAME_BUCKETS_MS] + [f">{FRAME_BUCKETS_MS[-1]}ms"]
+
+        return {
+            "frames": self.frames,
+            "phases": {
+                name: {"count": s.count, "mean_ms": s.mean * 1000.0, "max_ms": s.max * 1000.0}
+                for name, s in self.phases.items()
+            },
+            "frame_interval": dict(zip(labels, self.histogram)),
+            "missed_deadlines": self.missed_deadlines,
+            "oversleeps": self.oversleeps,
+            "oversleep_ms": self.oversleep_time * 1000.0,
+            "bytes_written": self.bytes_written,
+        }
+
+    def export_line(self) -> None:
+        import json
+
+        self.export.write(json.dumps(self.snapshot()) + "\n")
+        self.export.flush()
+
+    def hud_lines(self) -> List[str]:
+        p = self.phases
+        kb = self.bytes_written / max(1, self.frames) / 1024.0
+
+        return [
+            f"in {p[PHASE_INPUT].mean * 1e3:.2f} up {p[PHASE_UPDATE].mean * 1e3:.2f} "
+            f"draw {p[PHASE_RENDER].mean * 1e3:.2f} ms",
+            f"late {self.missed_deadlines} oversleep {self.oversleeps} {kb:.1f}KB/f",
+        ]
@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+import importlib
+import os
+
+from typing import Any, Callable, Dict, List, Optional, Union
+
+
+ENTRY_POINT_INPUTS = "flappy_cli.inputs"
+ENTRY_POINT_RENDERERS = "flappy_cli.renderers"
+
+Factory = Callable[..., Any]
+Target = Union[str, Factory]
+
+INPUTS: Dict[str, Target] = {
+    "windows": "flappy_cli.io.input:WindowsKeyReader",
+    "posix": "flappy_cli.io.input:PosixKeyReader",
+    "null": "flappy_cli.io.base:NullKeyReader",
+}
+
+RENDERERS: Dict[str, Target] = {
+    "terminal": "flappy_cli.io.render:AsciiRenderer",
+    "null": "flappy_cli.io.base:NullRenderer",
+    "asciicast": "flappy_cli.io.record:AsciicastRenderer",
+    "delta": "flappy_cli.io.record:DeltaRecorder",
+    "broadcast": "flappy_cli.io.broadcast:BroadcastRenderer",
+}
+
+
+def register_input(name: str, target: Target) -> None:
+    INPUTS[name] = target
+
+
+def register_renderer(name: str, target: Target) -> None:
+    RENDERERS[name] = target
+
+
+def default_input() -> str:
+    return "windows" if os.name == "nt" else "posix"
+
+
+def _entry_point(group: str, name: str) -> Optional[Factory]:
+    from importlib.metadata import entry_points
+
+    for ep in entry_points(group=group):
+        if ep.name == name:
+            return ep.load()
+
+    return None
+
+
+def _resolve(registry: Dict[str, Target], group: str, name: str) -> Factory:
+    target = registry.get(name)
+    if target is None:
+        target = _entry_point(group, name)
+        if target is None:
+            raise ValueError(f"unknown backend {name!r}; choose from {', '.join(sorted(registry))}")
+        registry[name] = target
+
+    if isinstance(target, str):
+        module, _, attr = target.partition(":")
+        target = getattr(importlib.import_module(module), attr)
+        registry[name] = target
+
+    return target
+
+
+def input_names() -> List[str]:
+    return sorted(INPUTS)
+
+
+def renderer_names() -> List[str]:
+    return sorted(RENDERERS)
+
+
+def make_input(name: Optional[str] = None, **kwargs: Any) -> Any:
+    return _resolve(INPUTS, ENTRY_POINT_INPUTS, name or default_input())(**kwargs)
+
+
+def make_renderer(name: Optional[str] = None, **kwargs: Any) -> Any:
+    return _resolve(RENDERERS, ENTRY_POINT_RENDERERS, name or "terminal")(**kwargs)
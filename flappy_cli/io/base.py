@@ -0,0 +1,31 @@
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+from typing import Optional, Protocol
+
+from ..model import World
+
+
+class KeyReader(Protocol):
+    def read_key(self) -> Optional[str]: ...
+    def flush(self) -> None: ...
+
+
+class Renderer(Protocol):
+    def render(self, world: World, *, message: str = "") -> None: ...
+
+
+@dataclass(slots=True)
+class NullKeyReader:
+    def read_key(self) -> Optional[str]:
+        return None
+
+    def flush(self) -> None:
+        return
+
+
+@dataclass(slots=True)
+class NullRenderer:
+    def render(self, world: World, *, message: str = "") -> None:
+        return
@@ -0,0 +1,227 @@
+from __future__ import annotations
+
+import os
+import socket
+import threading
+
+from collections import deque
+from dataclasses import dataclass, field
+
+from typing import Callable, Deque, List, Optional, Protocol
+
+from ..model import World
+from .base import Renderer
+from .render import AsciiRenderer, encode_frame
+
+
+HIDE_CURSOR = "\x1b[?25l"
+
+
+class Subscriber(Protocol):
+    closed: bool
+
+    def offer(self, data: bytes) -> bool: ...
+    def close(self) -> None: ...
+
+
+@dataclass(slots=True)
+class QueueSubscriber:
+    maxsize: int = 8
+    closed: bool = False
+    frames: Deque[bytes] = field(default_factory=deque)
+
+    def offer(self, data: bytes) -> bool:
+        if len(self.frames) >= self.maxsize:
+            return False
+
+        self.frames.append(data)
+        return True
+
+    def get(self) -> Optional[bytes]:
+        try:
+            return self.frames.popleft()
+        except IndexError:
+            return None
+
+    def close(self) -> None:
+        self.closed = True
+
+
+@dataclass(slots=True)
+class SendSubscriber:
+    send: Callable[[bytes], int]
+    on_close: Optional[Callable[[], None]] = None
+    closed: bool = False
+    pending: bytes = b""
+
+    @classmethod
+    def for_socket(cls, sock: socket.socket) -> SendSubscriber:
+        sock.setblocking(False)
+        return cls(send=sock.send, on_close=sock.close)
+
+    @classmethod
+    def for_fd(cls, fd: int) -> SendSubscriber:
+        os.set_blocking(fd, False)
+        return cls(send=lambda data: os.write(fd, data), on_close=lambda: os.close(fd))
+
+    def _write(self, data: bytes) -> bytes:
+        try:
+            sent = self.send(data)
+        except BlockingIOError:
+            sent = 0
+        except OSError:
+            self.close()
+            return b""
+
+        return data[sent:]
+
+    def offer(self, data: bytes) -> bool:
+        if self.pending:
+            self.pending = self._write(self.pending)
+            if self.pending or self.closed:
+                return False
+
+        self.pending = self._write(data)
+        return not self.closed
+
+    def close(self) -> None:
+        if self.closed:
+            return
+
+        self.closed = True
+        self.pending = b""
+        if self.on_close is not None:
+            self.on_close()
+
+
+@dataclass(slots=True)
+class _Channel:
+    subscriber: Subscriber
+    synced: bool = False
+
+
+@dataclass(slots=True)
+class BroadcastRenderer:
+    size: tuple[int, int] = (80, 30)
+    use_colors: bool = True
+    local: Optional[Renderer] = None
+
+    frames: int = 0
+    keyframes: int = 0
+    dropped: int = 0
+
+    channels: List[_Channel] = field(default_factory=list, repr=False)
+    _joining: Deque[Subscriber] = field(default_factory=deque, repr=False)
+    _cells: AsciiRenderer = field(init=False, repr=False)
+    _prev: Optional[list[list[str]]] = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        self._cells = AsciiRenderer(use_colors=self.use_colors, size=self.size, console=False)
+
+    @property
+    def hud_source(self) -> Optional[Callable[[], List[str]]]:
+        return self._cells.hud_source
+
+    @hud_source.setter
+    def hud_source(self, source: Optional[Callable[[], List[str]]]) -> None:
+        self._cells.hud_source = source
+        if self.local is not None:
+            self.local.hud_source = source
+
+    def subscribe(self, subscriber: Subscriber) -> None:
+        self._joining.append(subscriber)
+
+    def unsubscribe(self, subscriber: Subscriber) -> None:
+        self.channels = [ch for ch in self.channels if ch.subscriber is not subscriber]
+
+    def __len__(self) -> int:
+        return len(self.channels) + len(self._joining)
+
+    def _frame_cells(self, world: World, message: str) -> list[list[str]]:
+        local = self.local
+        if local is None:
+            return self._cells.frame_cells(world, message=message)
+
+        local.render(world, message=message)
+        cells = getattr(local, "last_cells", None)
+        if cells is not None:
+            return cells
+
+        return self._cells.frame_cells(world, message=message)
+
+    def render(self, world: World, *, message: str = "") -> None:
+        cells = self._frame_cells(world, message)
+
+        joining = self._joining
+        while joining:
+            self.channels.append(_Channel(joining.popleft()))
+
+        if not self.channels:
+            self._prev = None
+            return
+
+        origin = self._cells.frame_origin(cells, world_width=world.width)
+        prev = self._prev
+        if prev is not None and len(prev) != len(cells):
+            prev = None
+        self._prev = cells
+        self.frames += 1
+
+        delta = encode_frame(cells, prev, origin).encode("utf-8") if prev is not None else None
+        keyframe: Optional[bytes] = None
+
+        live = []
+        for ch in self.channels:
+            sub = ch.subscriber
+            if sub.closed:
+                continue
+
+            if ch.synced and delta is not None:
+                data = delta
+            else:
+                if keyframe is None:
+                    keyframe = (HIDE_CURSOR + encode_frame(cells, None, origin)).encode("utf-8")
+                    self.keyframes += 1
+                data = keyframe
+
+            if data:
+                ch.synced = sub.offer(data)
+                if not ch.synced:
+                    self.dropped += 1
+            else:
+                ch.synced = True
+
+            if not sub.closed:
+                live.append(ch)
+
+        self.channels = live
+
+    def close(self) -> None:
+        for ch in self.channels:
+            ch.subscriber.close()
+        self.channels.clear()
+        while self._joining:
+            self._joining.popleft().close()
+
+
+def serve_spectators(
+    broadcast: BroadcastRenderer,
+    host: str = "127.0.0.1",
+    port: int = 0,
+) -> tuple[socket.socket, threading.Thread]:
+    server = socket.create_server((host, port))
+
+    def accept() -> None:
+        while True:
+            try:
+                conn, _ = server.accept()
+            except OSError:
+                return
+            conn.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            broadcast.subscribe(SendSubscriber.for_socket(conn))
+
+    thread = threading.Thread(target=accept, name="spectators", daemon=True)
+    thread.start()
+
+    return server, thread
+
@@ -1,36 +1,191 @@
 from __future__ import annotations
 
-import msvcrt
+import atexit
+import os
+import selectors
+import sys
+import threading
+import time
 
-from dataclasses import dataclass
+from collections import deque
+from dataclasses import dataclass, field
 
-from typing import Optional, Protocol
+from typing import Any, Deque, Iterator, List, Optional
 
+from .base import KeyReader, NullKeyReader
 
-class KeyReader(Protocol):
-    def read_key(self) -> Optional[str]: ...
-    def flush(self) -> None: ...
+
+ESC = "\x1b"
+
+_TEXT = 0
+_ESCAPE = 1
+_CSI = 2
+_SS3 = 3
+
+
+@dataclass(slots=True)
+class EscapeFilter:
+    # drops CSI (ESC [ ... final) and SS3 (ESC O x) sequences such as arrow
+    # keys, so their tails never reach the game as letters; a sequence split
+    # across reads is carried over, and an ESC that nothing follows within
+    # lone_timeout is taken as a lone ESC press
+    lone_timeout: float = 0.05
+    state: int = _TEXT
+    escaped_at: float = 0.0
+
+    def feed(self, text: str, now: Optional[float] = None) -> Iterator[str]:
+        if self.state == _ESCAPE and now is not None and now - self.escaped_at > self.lone_timeout:
+            self.state = _TEXT
+
+        for ch in text:
+            state = self.state
+            if state == _TEXT:
+                if ch == ESC:
+                    self.state = _ESCAPE
+                    self.escaped_at = now or 0.0
+                else:
+                    yield ch
+            elif state == _ESCAPE:
+                if ch == "[":
+                    self.state = _CSI
+                elif ch == "O":
+                    self.state = _SS3
+                elif ch == ESC:
+                    self.escaped_at = now or 0.0
+                else:
+                    # alt+key: ESC then the key itself
+                    self.state = _TEXT
+                    yield ch
+            elif state == _CSI:
+                if "@" <= ch <= "~":
+                    self.state = _TEXT
+            else:
+                self.state = _TEXT
+
+
+@dataclass(slots=True, frozen=True)
+class KeyEvent:
+    key: str
+    t: float
 
 
 @dataclass(slots=True)
 class WindowsKeyReader:
     def read_key(self) -> Optional[str]:
+        import msvcrt
+
         if not msvcrt.kbhit():
             return None
 
         ch = msvcrt.getwch()
+        if ch in ("\x00", "\xe0"):
+            # arrows and function keys arrive as a prefix plus a scan code
+            msvcrt.getwch()
+            return None
 
         return ch.lower()
 
     def flush(self) -> None:
+        import msvcrt
+
         while msvcrt.kbhit():
             msvcrt.getwch()
 
 
 @dataclass(slots=True)
-class NullKeyReader:
+class PosixKeyReader:
+    fd: Optional[int] = None
+    max_pending: int = 256
+
+    events: Deque[KeyEvent] = field(init=False, repr=False)
+    _escapes: EscapeFilter = field(default_factory=EscapeFilter, init=False, repr=False)
+    _saved_attrs: Optional[List[Any]] = field(default=None, init=False, repr=False)
+    _wake_r: int = field(default=-1, init=False, repr=False)
+    _wake_w: int = field(default=-1, init=False, repr=False)
+    _thread: Optional[threading.Thread] = field(default=None, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if self.fd is None:
+            self.fd = sys.stdin.fileno()
+
+        self.events = deque(maxlen=self.max_pending)
+        self._enter_raw_mode()
+
+        self._wake_r, self._wake_w = os.pipe()
+        self._thread = threading.Thread(target=self._reader, name="key-reader", daemon=True)
+        self._thread.start()
+
+    def _enter_raw_mode(self) -> None:
+        if not os.isatty(self.fd):
+            return
+
+        import termios
+
+        attrs = termios.tcgetattr(self.fd)
+        self._saved_attrs = [list(a) if isinstance(a, list) else a for a in attrs]
+
+        attrs[3] &= ~(termios.ICANON | termios.ECHO)
+        attrs[6][termios.VMIN] = 1
+        attrs[6][termios.VTIME] = 0
+        termios.tcsetattr(self.fd, termios.TCSANOW, attrs)
+        atexit.register(self._leave_raw_mode)
+
+    def _leave_raw_mode(self) -> None:
+        if self._saved_attrs is None:
+            return
+
+        import termios
+
+        termios.tcsetattr(self.fd, termios.TCSANOW, self._saved_attrs)
+        self._saved_attrs = None
+
+    def _reader(self) -> None:
+        events = self.events
+
+        with selectors.DefaultSelector() as sel:
+            sel.register(self.fd, selectors.EVENT_READ)
+            sel.register(self._wake_r, selectors.EVENT_READ)
+
+            while True:
+                for key, _ in sel.select():
+                    if key.fd == self._wake_r:
+                        return
+
+                    data = os.read(self.fd, 64)
+                    if not data:
+                        return
+
+                    now = time.monotonic()
+                    for ch in self._escapes.feed(data.decode("utf-8", errors="ignore"), now):
+                        events.append(KeyEvent(ch.lower(), now))
+
     def read_key(self) -> Optional[str]:
-        return None
+        try:
+            return self.events.popleft().key
+        except IndexError:
+            return None
+
+    def drain(self) -> List[KeyEvent]:
+        drained = []
+        events = self.events
+        while True:
+            try:
+                drained.append(events.popleft())
+            except IndexError:
+                return drained
 
     def flush(self) -> None:
-        return
+        self.events.clear()
+
+    def close(self) -> None:
+        if self._thread is None:
+            return
+
+        os.write(self._wake_w, b"x")
+        self._thread.join(timeout=1.0)
+        self._thread = None
+
+        os.close(self._wake_r)
+        os.close(self._wake_w)
+        self._leave_raw_mode()
+
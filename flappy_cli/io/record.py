@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import json
+import struct
+import zlib
+
+from dataclasses import dataclass, field
+
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, TextIO
+
+from ..model import World
+from .render import AsciiRenderer, encode_frame
+
+
+HIDE_CURSOR = "\x1b[?25l"
+
+MAGIC = b"FLCR"
+VERSION = 1
+
+HEADER = struct.Struct("<4sBHHd")
+FRAME = struct.Struct("<II?I")
+
+READ_CHUNK = 64 * 1024
+
+
+@dataclass(slots=True)
+class FrameStream:
+    # with no size the screen is fitted to the first frame, HUD included
+    size: Optional[tuple[int, int]] = None
+    use_colors: bool = True
+    frames: int = 0
+
+    _cells: AsciiRenderer = field(init=False, repr=False)
+    _prev: Optional[list[list[str]]] = field(default=None, repr=False)
+
+    def __post_init__(self) -> None:
+        self._cells = AsciiRenderer(use_colors=self.use_colors, size=self.size, console=False)
+
+    def next(
+        self,
+        world: World,
+        message: str,
+        *,
+        keyframe: bool = False,
+        hud_source: Optional[Callable[[], List[str]]] = None,
+    ) -> str:
+        self._cells.hud_source = hud_source
+        cells = self._cells.frame_cells(world, message=message)
+        if self.size is None:
+            self.size = self._cells.size = (world.width + 2, len(cells))
+        origin = self._cells.frame_origin(cells, world_width=world.width)
+
+        prev = self._prev
+        if keyframe or prev is None or len(prev) != len(cells):
+            prev = None
+        self._prev = cells
+        self.frames += 1
+
+        frame = encode_frame(cells, prev, origin)
+        if prev is None:
+            frame = HIDE_CURSOR + frame
+
+        return frame
+
+
+@dataclass(slots=True)
+class AsciicastRenderer:
+    out: TextIO
+    size: Optional[tuple[int, int]] = None
+    frame_time: float = 1.0 / 20
+    ticks: Optional[Callable[[], int]] = None
+    use_colors: bool = True
+    title: Optional[str] = None
+    hud_source: Optional[Callable[[], List[str]]] = None
+
+    encoder: FrameStream = field(init=False, repr=False)
+    _started: bool = field(default=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.encoder = FrameStream(size=self.size, use_colors=self.use_colors)
+
+    def _header(self) -> None:
+        width, height = self.encoder.size or (0, 0)
+        header: Dict[str, object] = {"version": 2, "width": width, "height": height}
+        if self.title:
+            header["title"] = self.title
+        self.out.write(json.dumps(header) + "\n")
+        self._started = True
+
+    def render(self, world: World, *, message: str = "") -> None:
+        # timestamps follow the simulation clock, so frames the game loop
+        # skipped leave a gap instead of slowing the recording down
+        tick = self.ticks() if self.ticks is not None else self.encoder.frames
+        frame = self.encoder.next(world, message, hud_source=self.hud_source)
+        if not self._started:
+            self._header()
+
+        t = tick * self.frame_time
+        if frame:
+            self.out.write(json.dumps([round(t, 6), "o", frame], ensure_ascii=False) + "\n")
+
+    def close(self) -> None:
+        if not self._started:
+            self._header()
+        self.out.flush()
+
+
+@dataclass(slots=True)
+class DeltaRecorder:
+    out: BinaryIO
+    size: Optional[tuple[int, int]] = None
+    frame_time: float = 1.0 / 20
+    ticks: Optional[Callable[[], int]] = None
+    keyframe_every: int = 600
+    sync_every: int = 64
+    level: int = 6
+    use_colors: bool = True
+    hud_source: Optional[Callable[[], List[str]]] = None
+
+    encoder: FrameStream = field(init=False, repr=False)
+    _compress: Any = field(init=False, repr=False)
+    _since_sync: int = field(default=0, repr=False)
+    _started: bool = field(default=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.encoder = FrameStream(size=self.size, use_colors=self.use_colors)
+        self._compress = zlib.compressobj(self.level)
+
+    def _header(self) -> None:
+        width, height = self.encoder.size or (0, 0)
+        self.out.write(HEADER.pack(MAGIC, VERSION, width, height, self.frame_time))
+        self._started = True
+
+    def render(self, world: World, *, message: str = "") -> None:
+        index = self.encoder.frames
+        tick = self.ticks() if self.ticks is not None else index
+        keyframe = self.keyframe_every > 0 and index % self.keyframe_every == 0
+        payload = self.encoder.next(world, message, keyframe=keyframe, hud_source=self.hud_source).encode("utf-8")
+        if not self._started:
+            self._header()
+
+        data = self._compress.compress(FRAME.pack(index, tick, keyframe, len(payload)) + payload)
+
+        self._since_sync += 1
+        if self._since_sync >= self.sync_every:
+            data += self._compress.flush(zlib.Z_SYNC_FLUSH)
+            self._since_sync = 0
+
+        if data:
+            self.out.write(data)
+
+    def close(self) -> None:
+        if not self._started:
+            self._header()
+        self.out.write(self._compress.flush())
+        self.out.flush()
+
+
+@dataclass(slots=True, frozen=True)
+class RecordedFrame:
+    index: int
+    t: float
+    keyframe: bool
+    data: str
+
+
+def read_header(source: BinaryIO) -> tuple[tuple[int, int], float]:
+    magic, version, cols, rows, frame_time = HEADER.unpack(source.read(HEADER.size))
+    if magic != MAGIC:
+        raise ValueError("not a delta recording")
+    if version != VERSION:
+        raise ValueError(f"unsupported recording version {version}")
+
+    return (cols, rows), frame_time
+
+
+def iter_recording(source: BinaryIO) -> Iterator[RecordedFrame]:
+    _, frame_time = read_header(source)
+    decompress = zlib.decompressobj()
+    buf = b""
+
+    while True:
+        chunk = source.read(READ_CHUNK)
+        buf += decompress.decompress(chunk) if chunk else decompress.flush()
+
+        pos = 0
+        while len(buf) - pos >= FRAME.size:
+            index, tick, keyframe, length = FRAME.unpack_from(buf, pos)
+            end = pos + FRAME.size + length
+            if end > len(buf):
+                break
+
+            data = buf[pos + FRAME.size:end].decode("utf-8")
+            yield RecordedFrame(index=index, t=tick * frame_time, keyframe=keyframe, data=data)
+            pos = end
+        buf = buf[pos:]
+
+        if not chunk:
+            return
@@ -1,16 +1,19 @@
 from __future__ import annotations
 
 import atexit
-import ctypes
 import os
 import shutil
+import signal
 import sys
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
 
-from typing import Protocol
+from typing import Callable, Iterator, List, Optional, Sequence, TextIO
 
 from ..model import World
+from ..trajectory import ArcTable, bird_state
+from .base import NullRenderer, Renderer
 
 
 RESET = "\x1b[0m"
@@ -22,6 +25,8 @@ def _enable_windows_vt() -> None:
     if os.name != "nt":
         return
 
+    import ctypes
+
     kernel32 = ctypes.windll.kernel32
     handle = kernel32.GetStdHandle(-11)
     mode = ctypes.c_uint()
@@ -29,14 +34,35 @@ def _enable_windows_vt() -> None:
         kernel32.SetConsoleMode(handle, mode.value | 0x0004)
 
 
-def _hide_cursor() -> None:
-    sys.stdout.write("\x1b[?25l")
-    sys.stdout.flush()
+def _hide_cursor(out: TextIO) -> None:
+    out.write("\x1b[?25l")
+    out.flush()
+
+
+def _show_cursor(out: TextIO) -> None:
+    out.write("\x1b[?25h")
+    out.flush()
+
+
+_resize_generation = 0
 
 
-def _show_cursor() -> None:
-    sys.stdout.write("\x1b[?25h")
-    sys.stdout.flush()
+def _on_resize(signum: int, frame: object) -> None:
+    global _resize_generation
+    _resize_generation += 1
+
+
+def _watch_resize() -> bool:
+    sig = getattr(signal, "SIGWINCH", None)
+    if sig is None:
+        return False
+
+    try:
+        signal.signal(sig, _on_resize)
+    except ValueError:
+        return False
+
+    return True
 
 
 def _center_line(text: str, width: int) -> str:
@@ -44,8 +70,72 @@ def _center_line(text: str, width: int) -> str:
     centered = inner.center(width)
     return centered.ljust(width + 2)
 
-class Renderer(Protocol):
-    def render(self, world: World, *, message: str = "") -> None: ...
+
+@lru_cache(maxsize=None)
+def _split_glyph(glyph: str) -> tuple[str, str]:
+    if glyph.startswith("\x1b["):
+        end = glyph.index("m") + 1
+        return glyph[:end], glyph[end:].replace(RESET, "")
+
+    return "", glyph
+
+
+def _encode_cells(cells: list[str], parts: list[str], sgr: str) -> str:
+    for glyph in cells:
+        color, ch = _split_glyph(glyph)
+        if color != sgr and ch != " ":
+            parts.append(color or RESET)
+            sgr = color
+        parts.append(ch)
+
+    return sgr
+
+
+def _diff_runs(old: list[str], new: list[str], max_gap: int = 4) -> Iterator[tuple[int, int]]:
+    n = len(new)
+    j = 0
+
+    while j < n:
+        if old[j] == new[j]:
+            j += 1
+            continue
+
+        start = j
+        end = j + 1
+        k = end
+        while k < n and k - end < max_gap:
+            if old[k] != new[k]:
+                end = k + 1
+            k += 1
+
+        yield start, end
+        j = end
+
+
+def encode_frame(cells: list[list[str]], prev: Optional[list[list[str]]], origin: tuple[int, int, int]) -> str:
+    top, left, _ = origin
+    parts: list[str] = []
+    sgr = ""
+
+    if prev is None:
+        parts.append("\x1b[2J")
+        for i, row in enumerate(cells):
+            parts.append(f"\x1b[{top + i + 1};{left + 1}H")
+            sgr = _encode_cells(row, parts, sgr)
+    else:
+        for i, row in enumerate(cells):
+            old = prev[i]
+            if row == old:
+                continue
+
+            for start, end in _diff_runs(old, row):
+                parts.append(f"\x1b[{top + i + 1};{left + start + 1}H")
+                sgr = _encode_cells(row[start:end], parts, sgr)
+
+    if sgr:
+        parts.append(RESET)
+
+    return "".join(parts)
 
 
 @dataclass(slots=True)
@@ -61,29 +151,90 @@ class _Theme:
     sky: str
     pipe: str
     bird: str
+    flock: str
+    path: str
 
 
 @dataclass(slots=True)
 class AsciiRenderer:
     clear_once: bool = True
     use_colors: bool = True
+    diff: bool = False
+    stream: Optional[TextIO] = None
+    size_poll_frames: int = 30
+    size: Optional[tuple[int, int]] = None
+    console: bool = True
+    hud_source: Optional[Callable[[], List[str]]] = None
+    flock_source: Optional[Callable[[], Sequence[int]]] = None
+    trajectory: Optional[ArcTable] = None
     _initialized: bool = False
 
+    _theme_cache: Optional[_Theme] = field(default=None, repr=False)
+    _theme_colors: bool = field(default=True, repr=False)
+
+    _watching_resize: bool = field(default=False, repr=False)
+    _term: Optional[tuple[int, int]] = field(default=None, repr=False)
+    _term_generation: int = field(default=-1, repr=False)
+    _term_frames: int = field(default=0, repr=False)
+
+    _prev_cells: Optional[list[list[str]]] = field(default=None, repr=False)
+    _prev_origin: tuple[int, int, int] = field(default=(0, 0, 0), repr=False)
+
+    def _out(self) -> TextIO:
+        return self.stream if self.stream is not None else sys.stdout
+
+    @property
+    def last_cells(self) -> Optional[list[list[str]]]:
+        # the last frame drawn in diff mode, for wrappers that re-encode it
+        return self._prev_cells if self.diff else None
+
     def _init_console(self) -> None:
         if self._initialized:
             return
 
-        _enable_windows_vt()
-        _hide_cursor()
-        atexit.register(_show_cursor)
+        out = self._out()
+
+        if self.console:
+            _enable_windows_vt()
+            atexit.register(_show_cursor, out)
+            self._watching_resize = _watch_resize()
+        _hide_cursor(out)
 
         if self.clear_once:
-            sys.stdout.write("\x1b[2J\x1b[H")
-            sys.stdout.flush()
+            out.write("\x1b[2J\x1b[H")
+            out.flush()
 
         self._initialized = True
 
+    def invalidate(self) -> None:
+        self._prev_cells = None
+
+    def _term_size(self) -> tuple[int, int]:
+        if self.size is not None:
+            return self.size
+
+        if self._watching_resize:
+            stale = self._term_generation != _resize_generation
+        else:
+            self._term_frames += 1
+            stale = self._term_frames >= self.size_poll_frames
+
+        if self._term is None or stale:
+            cols, rows = shutil.get_terminal_size(fallback=(120, 30))
+            self._term = (cols, rows)
+            self._term_generation = _resize_generation
+            self._term_frames = 0
+
+        return self._term
+
     def _theme(self) -> _Theme:
+        if self._theme_cache is None or self._theme_colors != self.use_colors:
+            self._theme_cache = self._build_theme()
+            self._theme_colors = self.use_colors
+
+        return self._theme_cache
+
+    def _build_theme(self) -> _Theme:
         tl = "▄"
         tr = "▄"
         bl = "▀"
@@ -96,46 +247,116 @@ class AsciiRenderer:
 
         if self.use_colors:
             bird = YELLOW + "●" + RESET
+            flock = YELLOW + "◉" + RESET
+            path = YELLOW + "·" + RESET
             pipe = GREEN + "█" + RESET
         else:
             bird = "●"
+            flock = "◉"
+            path = "·"
             pipe = "█"
 
         return _Theme(
             tl=tl, tr=tr, bl=bl, br=br,
             h_top=h_top, h_bottom=h_bottom, v=v,
-            sky=sky, pipe=pipe, bird=bird,
+            sky=sky, pipe=pipe, bird=bird, flock=flock, path=path,
         )
 
     def _build_grid(self, world: World, theme: _Theme) -> list[list[str]]:
-        grid = [[theme.sky for _ in range(world.width)] for _ in range(world.height)]
-        self._draw_pipes(world, grid, theme)
+        width = world.width
+        height = world.height
+        sky_row = [theme.sky] * width
+
+        row_masks = self._pipe_row_masks(world)
+        templates: dict[int, list[str]] = {0: sky_row}
+        grid = []
+        for mask in row_masks:
+            row = templates.get(mask)
+            if row is None:
+                row = sky_row.copy()
+                m = mask
+                while m:
+                    low = m & -m
+                    row[low.bit_length() - 1] = theme.pipe
+                    m ^= low
+                templates[mask] = row
+            grid.append(row)
+
+        if self.trajectory is not None:
+            self._draw_path(world, grid, theme)
         self._draw_bird(world, grid, theme)
         return grid
 
-    def _draw_pipes(self, world: World, grid: list[list[str]], theme: _Theme) -> None:
+    def _pipe_row_masks(self, world: World) -> list[int]:
+        width = world.width
+        height = world.height
+        full = (1 << height) - 1
+
+        columns = 0
+        gaps: list[tuple[int, int]] = []
         for pipe in world.pipes:
             x = pipe.x
-            if not (0 <= x < world.width):
+            if not (0 <= x < width):
                 continue
 
-            gap_start = pipe.gap_y
-            gap_end = pipe.gap_y + pipe.gap_h
-            for y in range(world.height):
-                if gap_start <= y < gap_end:
-                    continue
-                grid[y][x] = theme.pipe
+            bit = 1 << x
+            columns |= bit
+            open_rows = ~pipe.blocked & full
+            if open_rows:
+                gaps.append((bit, open_rows))
+
+        masks = [columns] * height
+        for bit, open_rows in gaps:
+            clear = ~bit
+            while open_rows:
+                low = open_rows & -open_rows
+                y = low.bit_length() - 1
+                masks[y] &= clear
+                open_rows ^= low
+
+        return masks
 
     def _draw_bird(self, world: World, grid: list[list[str]], theme: _Theme) -> None:
-        y = world.bird.cell_y
         x = world.bird.x
+        if self.flock_source is not None:
+            self._draw_flock(x, world, grid, theme)
+            return
+
+        y = world.bird.cell_y
         if 0 <= x < world.width and 0 <= y < world.height:
-            grid[y][x] = theme.bird
+            row = grid[y].copy()
+            row[x] = theme.bird
+            grid[y] = row
+
+    def _draw_path(self, world: World, grid: list[list[str]], theme: _Theme) -> None:
+        # pipes scroll one column per tick, so column x + k is where the bird
+        # meets the course k ticks from now if it stops flapping
+        x = world.bird.x
+        y, vy = bird_state(world.bird)
+        for k, row in enumerate(self.trajectory.path(y, vy, world.width - 1 - x), start=1):
+            if not 0 <= row < world.height:
+                break
+            if grid[row][x + k] == theme.sky:
+                cells = grid[row].copy()
+                cells[x + k] = theme.path
+                grid[row] = cells
+
+    def _draw_flock(self, x: int, world: World, grid: list[list[str]], theme: _Theme) -> None:
+        if not 0 <= x < world.width:
+            return
+
+        for y, count in enumerate(self.flock_source()[:world.height]):
+            if count:
+                row = grid[y].copy()
+                row[x] = theme.bird if count == 1 else theme.flock
+                grid[y] = row
 
     def _build_hud_lines(self, world: World, message: str) -> list[str]:
         hud = [f"Score: {world.score}"]
         if message:
             hud.extend(message.splitlines())
+        if self.hud_source is not None:
+            hud.extend(self.hud_source())
         return hud
 
     def _build_frame_lines(self, world: World, grid: list[list[str]], hud: list[str], theme: _Theme) -> list[str]:
@@ -155,8 +376,41 @@ class AsciiRenderer:
 
         return lines
 
+    def _build_frame_cells(self, world: World, grid: list[list[str]], hud: list[str], theme: _Theme) -> list[list[str]]:
+        cells: list[list[str]] = []
+
+        for h in hud:
+            cells.append(list(_center_line(h, world.width)))
+
+        cells.append([theme.tl] + [theme.h_top] * world.width + [theme.tr])
+        for row in grid:
+            cells.append([theme.v] + row + [theme.v])
+        cells.append([theme.bl] + [theme.h_bottom] * world.width + [theme.br])
+
+        return cells
+
+    def frame_origin(self, cells: list[list[str]], *, world_width: int) -> tuple[int, int, int]:
+        term_cols, term_rows = self._term_size()
+
+        left = max(0, (term_cols - (world_width + 2)) // 2)
+        top = max(0, (term_rows - len(cells)) // 2)
+
+        return top, left, world_width
+
+    def _diff_frame(self, cells: list[list[str]], *, world_width: int) -> str:
+        origin = self.frame_origin(cells, world_width=world_width)
+
+        prev = self._prev_cells
+        if origin != self._prev_origin or (prev is not None and len(prev) != len(cells)):
+            prev = None
+
+        self._prev_cells = cells
+        self._prev_origin = origin
+
+        return encode_frame(cells, prev, origin)
+
     def _pad_frame(self, lines: list[str], *, world_width: int) -> str:
-        term_cols, term_rows = shutil.get_terminal_size(fallback=(120, 30))
+        term_cols, term_rows = self._term_size()
 
         frame_width = world_width + 2
 
@@ -170,20 +424,28 @@ class AsciiRenderer:
         padded = [pad_spaces + "\x1b[2K" + line for line in lines]
         return pad_newlines + "\n".join(padded) + "\n"
 
-    def render(self, world: World, *, message: str = "") -> None:
-        self._init_console()
-
+    def frame_cells(self, world: World, *, message: str = "") -> list[list[str]]:
         theme = self._theme()
         grid = self._build_grid(world, theme)
         hud = self._build_hud_lines(world, message)
-        lines = self._build_frame_lines(world, grid, hud, theme)
-
-        frame = self._pad_frame(lines, world_width=world.width)
-        sys.stdout.write("\x1b[H" + frame)
-        sys.stdout.flush()
 
+        return self._build_frame_cells(world, grid, hud, theme)
 
-@dataclass(slots=True)
-class NullRenderer:
     def render(self, world: World, *, message: str = "") -> None:
-        return
+        self._init_console()
+
+        if self.diff:
+            cells = self.frame_cells(world, message=message)
+            frame = self._diff_frame(cells, world_width=world.width)
+        else:
+            theme = self._theme()
+            grid = self._build_grid(world, theme)
+            hud = self._build_hud_lines(world, message)
+            lines = self._build_frame_lines(world, grid, hud, theme)
+            frame = "\x1b[H" + self._pad_frame(lines, world_width=world.width)
+
+        out = self._out()
+        if frame:
+            out.write(frame)
+        out.flush()
+
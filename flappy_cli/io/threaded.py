@@ -0,0 +1,116 @@
+from __future__ import annotations
+
+import threading
+
+from dataclasses import dataclass, field
+
+from typing import Callable, List, Optional, Tuple
+
+from ..codec import decode_world, dump_world
+from ..model import World
+from .base import Renderer
+
+
+@dataclass(slots=True, frozen=True)
+class Frame:
+    index: int
+    world: bytes
+    message: str
+    hud: Tuple[str, ...] = ()
+
+
+@dataclass(slots=True)
+class ThreadedRenderer:
+    inner: Renderer
+    name: str = "render"
+
+    published: int = 0
+    rendered: int = 0
+    dropped: int = 0
+
+    _hud_source: Optional[Callable[[], List[str]]] = field(default=None, repr=False)
+    _pending: Optional[Frame] = field(default=None, repr=False)
+    _current: Optional[Frame] = field(default=None, repr=False)
+    _world: Optional[World] = field(default=None, repr=False)
+    _busy: bool = field(default=False, repr=False)
+    _closed: bool = field(default=False, repr=False)
+    _error: Optional[BaseException] = field(default=None, repr=False)
+    _cond: threading.Condition = field(default_factory=threading.Condition, repr=False)
+    _thread: threading.Thread = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if hasattr(self.inner, "hud_source"):
+            self.inner.hud_source = self._frame_hud
+
+        self._thread = threading.Thread(target=self._run, name=self.name, daemon=True)
+        self._thread.start()
+
+    @property
+    def hud_source(self) -> Optional[Callable[[], List[str]]]:
+        return self._hud_source
+
+    @hud_source.setter
+    def hud_source(self, source: Optional[Callable[[], List[str]]]) -> None:
+        self._hud_source = source
+
+    def _frame_hud(self) -> List[str]:
+        return list(self._current.hud) if self._current is not None else []
+
+    def _raise_error(self) -> None:
+        error = self._error
+        if error is not None:
+            self._error = None
+            raise error
+
+    def render(self, world: World, *, message: str = "") -> None:
+        self._raise_error()
+
+        hud = tuple(self._hud_source()) if self._hud_source is not None else ()
+        frame = Frame(index=self.published, world=bytes(dump_world(world)), message=message, hud=hud)
+
+        with self._cond:
+            if self._closed:
+                return
+            if self._pending is not None:
+                self.dropped += 1
+            self._pending = frame
+            self.published += 1
+            self._cond.notify()
+
+    def _run(self) -> None:
+        cond = self._cond
+        while True:
+            with cond:
+                while self._pending is None and not self._closed:
+                    cond.wait()
+                frame = self._pending
+                if frame is None:
+                    return
+                self._pending = None
+                self._busy = True
+
+            try:
+                self._current = frame
+                self._world, _ = decode_world(frame.world, world=self._world)
+                self.inner.render(self._world, message=frame.message)
+            except BaseException as exc:
+                self._error = exc
+            finally:
+                with cond:
+                    self.rendered += 1
+                    self._busy = False
+                    cond.notify_all()
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        with self._cond:
+            done = self._cond.wait_for(lambda: self._pending is None and not self._busy, timeout)
+        self._raise_error()
+
+        return done
+
+    def close(self, timeout: Optional[float] = 5.0) -> None:
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+        self._raise_error()
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import copy
+import mmap
+import random
+import struct
+import sys
+
+from array import array
+from dataclasses import dataclass, field
+
+from typing import Any, BinaryIO, List, Optional, Sequence
+
+from .config import GameConfig, GameMode, make_bird, make_spawner
+from .model import Pipe, World
+from .strategy import SpawnerStrategy
+
+
+MAGIC = b"FLLP"
+VERSION = 1
+
+MODES = list(GameMode)
+
+HEADER = struct.Struct("<4sBBHHHIqI4x")
+
+
+@dataclass(slots=True, frozen=True)
+class PipeEntry:
+    tick: int
+    gap_y: int
+    gap_h: int
+
+
+def compile_course(
+    seed: int,
+    *,
+    mode: GameMode,
+    config: Optional[GameConfig] = None,
+    horizon: int = 10_000,
+    spawner: Optional[SpawnerStrategy] = None,
+) -> List[PipeEntry]:
+    config = config or GameConfig()
+    spawner = copy.copy(spawner) if spawner is not None else make_spawner(mode)
+    spawner.reset()
+    rng = random.Random(seed)
+    world = World(width=config.width, height=config.height, bird=make_bird(config))
+
+    # a pipe spawned on tick s scores on tick s + delay for any surviving bird,
+    # so the score the spawner sees needs no pipe simulation
+    delay = config.width - 1 - config.bird_x
+
+    course: List[PipeEntry] = []
+    passed = 0
+    tick = 0
+    while tick < horizon:
+        while passed < len(course) and course[passed].tick + delay < tick:
+            passed += 1
+        world.score = passed
+
+        if spawner.should_spawn(tick=tick, world=world):
+            pipe = spawner.make_pipe(world=world, rng=rng)
+            course.append(PipeEntry(tick=tick, gap_y=pipe.gap_y, gap_h=pipe.gap_h))
+
+        tick = max(tick + 1, getattr(spawner, "next_spawn_tick", 0))
+
+    return course
+
+
+def write_pack(
+    out: BinaryIO,
+    seeds: range,
+    *,
+    mode: GameMode,
+    config: Optional[GameConfig] = None,
+    horizon: int = 10_000,
+) -> int:
+    if seeds.step != 1:
+        raise ValueError("level packs hold a contiguous range of seeds")
+
+    config = config or GameConfig()
+    starts = array("I", [0])
+    ticks = array("I")
+    gap_y = array("H")
+    gap_h = array("H")
+
+    for seed in seeds:
+        for entry in compile_course(seed, mode=mode, config=config, horizon=horizon):
+            ticks.append(entry.tick)
+            gap_y.append(entry.gap_y)
+            gap_h.append(entry.gap_h)
+        starts.append(len(ticks))
+
+    if sys.byteorder != "little":
+        for column in (starts, ticks, gap_y, gap_h):
+            column.byteswap()
+
+    out.write(HEADER.pack(
+        MAGIC,
+        VERSION,
+        MODES.index(mode),
+        config.width,
+        config.height,
+        config.bird_x,
+        len(seeds),
+        seeds.start,
+        horizon,
+    ))
+    for column in (starts, ticks, gap_y, gap_h):
+        out.write(column.tobytes())
+
+    return len(ticks)
+
+
+@dataclass(slots=True)
+class LevelPack:
+    path: str
+    mode: GameMode = field(init=False)
+    width: int = field(init=False)
+    height: int = field(init=False)
+    bird_x: int = field(init=False)
+    first_seed: int = field(init=False)
+    courses: int = field(init=False)
+    horizon: int = field(init=False)
+
+    starts: Sequence[int] = field(init=False, repr=False)
+    ticks: Sequence[int] = field(init=False, repr=False)
+    gap_y: Sequence[int] = field(init=False, repr=False)
+    gap_h: Sequence[int] = field(init=False, repr=False)
+    _map: Any = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        if sys.byteorder != "little":
+            raise ValueError("level packs are little-endian and can only be mapped on little-endian hosts")
+
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if len(self._map) < HEADER.size:
+            raise ValueError("truncated level pack")
+
+        magic, version, mode, width, height, bird_x, courses, first_seed, horizon = HEADER.unpack_from(self._map)
+        if magic != MAGIC:
+            raise ValueError("not a level pack")
+        if version != VERSION:
+            raise ValueError(f"unsupported level pack version {version}")
+
+        self.mode = MODES[mode]
+        self.width = width
+        self.height = height
+        self.bird_x = bird_x
+        self.courses = courses
+        self.first_seed = first_seed
+        self.horizon = horizon
+
+        view = memoryview(self._map)
+        pos = HEADER.size
+        self.starts = view[pos:pos + 4 * (courses + 1)].cast("I")
+        pos += 4 * (courses + 1)
+
+        total = self.starts[courses]
+        self.ticks = view[pos:pos + 4 * total].cast("I")
+        pos += 4 * total
+        self.gap_y = view[pos:pos + 2 * total].cast("H")
+        pos += 2 * total
+        self.gap_h = view[pos:pos + 2 * total].cast("H")
+
+        if len(self.gap_h) != total:
+            raise ValueError("truncated level pack")
+
+    def __reduce__(self) -> tuple:
+        return LevelPack, (self.path,)
+
+    def __len__(self) -> int:
+        return self.courses
+
+    def __contains__(self, seed: object) -> bool:
+        return isinstance(seed, int) and 0 <= seed - self.first_seed < self.courses
+
+    def bounds(self, seed: int) -> tuple[int, int]:
+        if seed not in self:
+            raise KeyError(seed)
+
+        i = seed - self.first_seed
+        return self.starts[i], self.starts[i + 1]
+
+    def course(self, seed: int) -> List[PipeEntry]:
+        start, end = self.bounds(seed)
+        return [PipeEntry(self.ticks[i], self.gap_y[i], self.gap_h[i]) for i in range(start, end)]
+
+    def check(self, config: GameConfig) -> None:
+        if (config.width, config.height, config.bird_x) != (self.width, self.height, self.bird_x):
+            raise ValueError(
+                f"level pack was compiled for a {self.width}x{self.height} world with bird_x={self.bird_x}"
+            )
+
+    def spawner(self, seed: int) -> PackSpawner:
+        return PackSpawner(pack=self, seed=seed)
+
+    def close(self) -> None:
+        for name in ("starts", "ticks", "gap_y", "gap_h"):
+            getattr(self, name).release()
+        self._map.close()
+
+
+@dataclass(slots=True)
+class PackSpawner:
+    pack: LevelPack
+    seed: int
+    cursor: int = field(default=0, init=False)
+    start: int = field(default=0, init=False, repr=False)
+    end: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.start, self.end = self.pack.bounds(self.seed)
+        self.cursor = self.start
+
+    def reset(self) -> None:
+        self.cursor = self.start
+
+    @property
+    def exhausted(self) -> bool:
+        return self.cursor >= self.end
+
+    def should_spawn(self, *, tick: int, world: World) -> bool:
+        return self.cursor < self.end and self.pack.ticks[self.cursor] <= tick
+
+    def make_pipe(self, *, world: World, rng: random.Random) -> Pipe:
+        i = self.cursor
+        self.cursor = i + 1
+
+        return Pipe(x=world.width - 1, gap_y=self.pack.gap_y[i], gap_h=self.pack.gap_h[i])
+
+    def peek(self, k: int = 0) -> Optional[PipeEntry]:
+        i = self.cursor + k
+        if not self.start <= i < self.end:
+            return None
+
+        pack = self.pack
+        return PipeEntry(pack.ticks[i], pack.gap_y[i], pack.gap_h[i])
+
+    def upcoming(self, n: int) -> List[PipeEntry]:
+        pack = self.pack
+        stop = min(self.end, self.cursor + n)
+
+        return [PipeEntry(pack.ticks[i], pack.gap_y[i], pack.gap_h[i]) for i in range(self.cursor, stop)]
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(prog="flappy_cli.levels")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    build = sub.add_parser("compile", help="precompute pipe schedules for a range of seeds")
+    build.add_argument("out")
+    build.add_argument("--mode", choices=[m.value for m in GameMode], default=GameMode.EASY.value)
+    build.add_argument("--seeds", type=int, default=1000)
+    build.add_argument("--first-seed", type=int, default=0)
+    build.add_argument("--horizon", type=int, default=10_000, help="ticks of course to precompute per seed")
+
+    show = sub.add_parser("show", help="print the pack header and one seed's course")
+    show.add_argument("path")
+    show.add_argument("--seed", type=int, default=None)
+    show.add_argument("--pipes", type=int, default=10)
+
+    args = parser.parse_args(argv)
+
+    if args.command == "compile":
+        seeds = range(args.first_seed, args.first_seed + args.seeds)
+        with open(args.out, "wb") as out:
+            pipes = write_pack(out, seeds, mode=GameMode(args.mode), horizon=args.horizon)
+        print(json.dumps({"courses": len(seeds), "pipes": pipes}))
+        return
+
+    pack = LevelPack(args.path)
+    seed = pack.first_seed if args.seed is None else args.seed
+    print(json.dumps({
+        "mode": pack.mode.value,
+        "world": [pack.width, pack.height],
+        "bird_x": pack.bird_x,
+        "seeds": [pack.first_seed, pack.first_seed + pack.courses],
+        "horizon": pack.horizon,
+        "seed": seed,
+        "pipes": [[e.tick, e.gap_y, e.gap_h] for e in pack.course(seed)[:args.pipes]],
+    }))
+
+
+if __name__ == "__main__":
+    main()
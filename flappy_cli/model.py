@@ -1,8 +1,11 @@
 from __future__ import annotations
 
+import bisect
+
 from dataclasses import dataclass, field
+from functools import lru_cache
 
-from typing import List
+from typing import Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 
 @dataclass(slots=True)
@@ -25,21 +28,369 @@ class Bird:
         return int(self.y)
 
 
+@lru_cache(maxsize=None)
+def to_fixed(value: float, scale: int) -> int:
+    q = round(value * scale)
+    if abs(q - value * scale) > 1e-6:
+        raise ValueError(f"{value!r} is not representable with fixed-point scale {scale}")
+
+    return q
+
+
+@dataclass(slots=True)
+class FixedBird:
+    x: int
+    qy: int
+    qvy: int = 0
+    scale: int = 100
+
+    @classmethod
+    def from_float(cls, *, x: int, y: float, vy: float = 0.0, scale: int = 100) -> FixedBird:
+        return cls(x=x, qy=round(y * scale), qvy=round(vy * scale), scale=scale)
+
+    @property
+    def y(self) -> float:
+        return self.qy / self.scale
+
+    @y.setter
+    def y(self, value: float) -> None:
+        self.qy = round(value * self.scale)
+
+    @property
+    def vy(self) -> float:
+        return self.qvy / self.scale
+
+    @vy.setter
+    def vy(self, value: float) -> None:
+        self.qvy = round(value * self.scale)
+
+    def flap(self, flap_velocity: float) -> None:
+        self.qvy = to_fixed(flap_velocity, self.scale)
+
+    def apply_gravity(self, gravity: float) -> None:
+        self.qvy += to_fixed(gravity, self.scale)
+
+    def step(self) -> None:
+        self.qy += self.qvy
+
+    @property
+    def cell_y(self) -> int:
+        qy = self.qy
+        if qy >= 0:
+            return qy // self.scale
+
+        return -(-qy // self.scale)
+
+
+@lru_cache(maxsize=None)
+def blocked_rows(gap_y: int, gap_h: int) -> int:
+    lo = max(0, gap_y)
+    hi = max(lo, gap_y + gap_h)
+    gap = ((1 << (hi - lo)) - 1) << lo
+
+    return ~gap
+
+
 @dataclass(slots=True)
 class Pipe:
     x: int
     gap_y: int
     gap_h: int
     passed: bool = False
+    blocked: int = field(default=-1, init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        self.blocked = blocked_rows(self.gap_y, self.gap_h)
+
+    def blocks(self, y: int) -> bool:
+        return y < 0 or (self.blocked >> y) & 1 == 1
+
+
+class PipeTrack:
+    __slots__ = ("_pipes", "_pos", "_head", "_next", "_scroll")
+
+    def __init__(self, pipes: Iterable[Pipe] = ()) -> None:
+        self._pipes: List[Optional[Pipe]] = []
+        self._pos: List[int] = []
+        self._head = 0
+        self._next = 0
+        self._scroll = 0
+
+        for p in pipes:
+            self.append(p)
+
+    def __len__(self) -> int:
+        return len(self._pipes) - self._head
+
+    def __iter__(self) -> Iterator[Pipe]:
+        pipes = self._pipes
+        pos = self._pos
+        scroll = self._scroll
+
+        for i in range(self._head, len(pipes)):
+            p = pipes[i]
+            p.x = pos[i] - scroll
+            yield p
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Pipe, List[Pipe]]:
+        if isinstance(index, slice):
+            return list(self)[index]
+
+        n = len(self)
+        if index < 0:
+            index += n
+        if not 0 <= index < n:
+            raise IndexError("pipe index out of range")
+
+        return self._view(self._head + index)
+
+    def __eq__(self, other: object) -> bool:
+        if isinstance(other, (PipeTrack, list)):
+            return list(self) == list(other)
+
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"PipeTrack({list(self)!r})"
+
+    def _view(self, i: int) -> Pipe:
+        p = self._pipes[i]
+        p.x = self._pos[i] - self._scroll
+
+        return p
+
+    def append(self, pipe: Pipe) -> None:
+        pos = pipe.x + self._scroll
+
+        if len(self) == 0 or pos >= self._pos[-1]:
+            self._pipes.append(pipe)
+            self._pos.append(pos)
+            return
+
+        i = bisect.bisect_right(self._pos, pos, self._head)
+        self._pipes.insert(i, pipe)
+        self._pos.insert(i, pos)
+        self._next = min(self._next, i)
+
+    def clear(self) -> None:
+        self._pipes.clear()
+        self._pos.clear()
+        self._head = 0
+        self._next = 0
+        self._scroll = 0
+
+    def reset(self, pipes: Iterable[Pipe], *, offset: int = 0, bird_x: Optional[int] = None) -> None:
+        self.clear()
+        self._scroll = offset
+        for p in pipes:
+            self.append(p)
+        self._skip_passed(bird_x)
+
+    def load(
+        self,
+        rows: Iterable[Tuple[int, int, int, bool]],
+        *,
+        offset: int = 0,
+        bird_x: Optional[int] = None,
+    ) -> None:
+        # rows are (x, gap_y, gap_h, passed) in track order; the track's own
+        # Pipe objects are refilled, so a warm rewind allocates no pipes
+        pipes = self._pipes
+        pos = self._pos
+        if self._head:
+            del pipes[:self._head]
+            del pos[:self._head]
+
+        n = 0
+        for x, gap_y, gap_h, passed in rows:
+            if n < len(pipes):
+                p = pipes[n]
+                p.gap_y = gap_y
+                p.gap_h = gap_h
+                p.passed = passed
+                p.blocked = blocked_rows(gap_y, gap_h)
+                pos[n] = x + offset
+            else:
+                pipes.append(Pipe(x=x, gap_y=gap_y, gap_h=gap_h, passed=passed))
+                pos.append(x + offset)
+            n += 1
+
+        del pipes[n:]
+        del pos[n:]
+        self._head = 0
+        self._scroll = offset
+        self._skip_passed(bird_x)
+
+    def _skip_passed(self, bird_x: Optional[int]) -> None:
+        pipes = self._pipes
+        pos = self._pos
+        limit = None if bird_x is None else bird_x + self._scroll
+        n = len(pipes)
+
+        i = self._head
+        while i < n and (pipes[i].passed or (limit is not None and pos[i] < limit)):
+            i += 1
+        self._next = i
+
+    @property
+    def offset(self) -> int:
+        return self._scroll
+
+    def scroll(self, dx: int = 1) -> None:
+        self._scroll += dx
+
+    def mark_passed(self, x: int) -> int:
+        pipes = self._pipes
+        pos = self._pos
+        limit = x + self._scroll
+        n = len(pipes)
+
+        scored = 0
+        i = self._next
+        while i < n and pos[i] < limit:
+            p = pipes[i]
+            if not p.passed:
+                p.passed = True
+                scored += 1
+            i += 1
+        self._next = i
+
+        return scored
+
+    def expire(self) -> None:
+        pipes = self._pipes
+        pos = self._pos
+        limit = self._scroll
+        n = len(pipes)
+
+        head = self._head
+        if head == n or pos[head] >= limit:
+            return
+
+        while head < n and pos[head] < limit:
+            pipes[head] = None
+            head += 1
+
+        if head > 32 and 2 * head > n:
+            del pipes[:head]
+            del pos[:head]
+            self._next -= head
+            head = 0
+
+        self._head = head
+        if self._next < head:
+            self._next = head
+
+    def at_column(self, x: int) -> Sequence[Pipe]:
+        pos = self._pos
+        target = x + self._scroll
+        n = len(pos)
+
+        i = bisect.bisect_left(pos, target, self._head)
+        if i == n or pos[i] != target:
+            return ()
+
+        found: List[Pipe] = []
+        while i < n and pos[i] == target:
+            found.append(self._view(i))
+            i += 1
+
+        return found
+
+    def ahead(self, k: int = 0) -> Optional[Pipe]:
+        i = self._next + k
+        if i >= len(self._pipes):
+            return None
+
+        return self._view(i)
 
 
 @dataclass(slots=True)
 class World:
     width: int
     height: int
-    bird: Bird
-    pipes: List[Pipe] = field(default_factory=list)
+    bird: Union[Bird, FixedBird]
+    pipes: PipeTrack = field(default_factory=PipeTrack)
+    score: int = 0
+
+    def __post_init__(self) -> None:
+        if not isinstance(self.pipes, PipeTrack):
+            self.pipes = PipeTrack(self.pipes)
+
+
+@dataclass(slots=True)
+class WorldSnapshot:
+    bird_y: float = 0.0
+    bird_vy: float = 0.0
     score: int = 0
+    offset: int = 0
+    pipes: List[int] = field(default_factory=list)
+
+    def capture(self, world: World) -> None:
+        self.bird_y = world.bird.y
+        self.bird_vy = world.bird.vy
+        self.score = world.score
+        self.offset = world.pipes.offset
+
+        data = self.pipes
+        data.clear()
+        for p in world.pipes:
+            data += (p.x, p.gap_y, p.gap_h, p.passed)
+
+    def restore(self, world: World) -> None:
+        world.bird.y = self.bird_y
+        world.bird.vy = self.bird_vy
+        world.score = self.score
+
+        rows = iter(self.pipes)
+        world.pipes.load(zip(rows, rows, rows, rows), offset=self.offset, bird_x=world.bird.x)
+
+
+@dataclass(slots=True)
+class WorldHistory:
+    capacity: int = 64
+    _slots: List[WorldSnapshot] = field(init=False, repr=False)
+    _head: int = field(default=0, init=False)
+    _size: int = field(default=0, init=False)
+
+    def __post_init__(self) -> None:
+        if self.capacity < 1:
+            raise ValueError("history capacity must be at least 1")
+
+        self._slots = [WorldSnapshot() for _ in range(self.capacity)]
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self) -> None:
+        self._head = 0
+        self._size = 0
+
+    def push(self, world: World) -> WorldSnapshot:
+        snap = self._slots[self._head]
+        snap.capture(world)
+
+        self._head = (self._head + 1) % self.capacity
+        self._size = min(self._size + 1, self.capacity)
+
+        return snap
+
+    def peek(self, back: int = 0) -> WorldSnapshot:
+        if not 0 <= back < self._size:
+            raise IndexError("history index out of range")
+
+        return self._slots[(self._head - 1 - back) % self.capacity]
+
+    def rewind(self, world: World, ticks: int = 1) -> int:
+        ticks = min(ticks, self._size)
+        if ticks <= 0:
+            return 0
+
+        self.peek(ticks - 1).restore(world)
+        self._head = (self._head - ticks) % self.capacity
+        self._size -= ticks
+
+        return ticks
 
 
 def in_bounds_y(world: World, y: int) -> bool:
@@ -47,9 +398,7 @@ def in_bounds_y(world: World, y: int) -> bool:
 
 
 def pipe_blocks_cell(pipe: Pipe, y: int) -> bool:
-    in_gap = pipe.gap_y <= y < (pipe.gap_y + pipe.gap_h)
-
-    return not in_gap
+    return y < 0 or (pipe.blocked >> y) & 1 == 1
 
 
 def collides_bounds(world: World) -> bool:
@@ -60,10 +409,12 @@ def collides_bounds(world: World) -> bool:
 
 def collides_pipe(world: World) -> bool:
     by = world.bird.cell_y
-    bx = world.bird.x
 
-    for p in world.pipes:
-        if p.x == bx and pipe_blocks_cell(p, by):
+    if by < 0:
+        return bool(world.pipes.at_column(world.bird.x))
+
+    for p in world.pipes.at_column(world.bird.x):
+        if (p.blocked >> by) & 1:
             return True
 
     return False
@@ -74,20 +425,15 @@ def collides(world: World) -> bool:
 
 
 def move_pipes_left(world: World, dx: int = 1) -> None:
-    for p in world.pipes:
-        p.x -= dx
+    world.pipes.scroll(dx)
 
 
 def remove_offscreen_pipes(world: World) -> None:
-    world.pipes = [p for p in world.pipes if p.x >= 0]
+    world.pipes.expire()
 
 
 def update_score(world: World) -> None:
-    bx = world.bird.x
-    for p in world.pipes:
-        if (not p.passed) and p.x < bx:
-            p.passed = True
-            world.score += 1
+    world.score += world.pipes.mark_passed(world.bird.x)
 
 
 def advance_world(world: World, *, gravity: float) -> None:
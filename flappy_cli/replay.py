@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import bisect
+import random
+import struct
+
+from dataclasses import dataclass, field
+
+from typing import BinaryIO, Callable, Dict, List, Optional
+
+from .config import GameConfig, GameMode, make_bird, make_spawner
+from .game.core import Game
+from .game.states import PlayingState, make_state, state_code
+from .io.base import KeyReader, NullRenderer, Renderer
+from .model import World
+
+
+MAGIC = b"FLRP"
+VERSION = 1
+
+MODES = list(GameMode)
+
+HEADER = struct.Struct("<4sBB?qHHHddH")
+TAG = struct.Struct("<B")
+KEY_EVENT = struct.Struct("<II")
+SNAPSHOT = struct.Struct("<IBiBIIiddqH")
+PIPE = struct.Struct("<hHH?")
+RNG = struct.Struct("<625I?d")
+END = struct.Struct("<IIi")
+
+TAG_KEY = 1
+TAG_SNAPSHOT = 2
+TAG_END = 3
+
+
+def _pack_snapshot(frame: int, game: Game) -> bytes:
+    code, final_score = state_code(game.state)
+    world = game.world
+    parts = [
+        TAG.pack(TAG_SNAPSHOT),
+        SNAPSHOT.pack(
+            frame,
+            code,
+            final_score,
+            MODES.index(game.mode),
+            game.tick,
+            getattr(game.spawner, "next_spawn_tick", 0),
+            world.score,
+            world.bird.y,
+            world.bird.vy,
+            world.pipes.offset,
+            len(world.pipes),
+        ),
+    ]
+    parts.extend(PIPE.pack(p.x, p.gap_y, p.gap_h, p.passed) for p in world.pipes)
+
+    version, internal, gauss = game.rng.getstate()
+    parts.append(RNG.pack(*internal, gauss is not None, gauss or 0.0))
+
+    return b"".join(parts)
+
+
+def _restore_snapshot(data: bytes, offset: int, game: Game) -> int:
+    (
+        frame, code, final_score, mode, tick, next_spawn,
+        score, bird_y, bird_vy, scroll, n_pipes,
+    ) = SNAPSHOT.unpack_from(data, offset)
+    offset += SNAPSHOT.size
+
+    end = offset + n_pipes * PIPE.size
+    pipes = PIPE.iter_unpack(memoryview(data)[offset:end])
+    offset = end
+
+    *internal, has_gauss, gauss = RNG.unpack_from(data, offset)
+    game.rng.setstate((3, tuple(internal), gauss if has_gauss else None))
+
+    game.mode = MODES[mode]
+    game.spawner = make_spawner(game.mode)
+    game.spawner.next_spawn_tick = next_spawn
+    game.tick = tick
+    game.world.bird.y = bird_y
+    game.world.bird.vy = bird_vy
+    game.world.score = score
+    game.world.pipes.load(pipes, offset=scroll, bird_x=game.world.bird.x)
+    game.history.clear()
+    game.set_state(make_state(code, final_score))
+    game.is_running = True
+
+    return frame
+
+
+@dataclass(slots=True)
+class ReplayRecorder:
+    game: Game
+    out: BinaryIO
+    snapshot_every: int = 256
+    frame: int = 0
+    inner: KeyReader = field(init=False)
+    pilot: Optional[Callable[[World], bool]] = field(default=None, init=False)
+
+    def __post_init__(self) -> None:
+        config = self.game.config
+        self.out.write(HEADER.pack(
+            MAGIC,
+            VERSION,
+            MODES.index(self.game.mode),
+            config.seed is not None,
+            config.seed or 0,
+            config.width,
+            config.height,
+            config.bird_x,
+            config.gravity,
+            config.flap_velocity,
+            config.fixed_point_scale,
+        ))
+
+        self.inner = self.game.keys
+        self.game.keys = self
+
+        if self.game.autopilot is not None:
+            self.pilot = self.game.autopilot
+            self.game.autopilot = self._autopilot
+
+    def _autopilot(self, world: World) -> bool:
+        flap = self.pilot(world)
+        if flap:
+            self.out.write(TAG.pack(TAG_KEY) + KEY_EVENT.pack(self.frame - 1, ord(" ")))
+
+        return flap
+
+    def read_key(self) -> Optional[str]:
+        if self.frame % self.snapshot_every == 0:
+            self.out.write(_pack_snapshot(self.frame, self.game))
+
+        key = self.inner.read_key()
+
+        # while the autopilot flies it decides every flap and _autopilot
+        # records that decision; a raw space would replay as a flap it overrode
+        overridden = key == " " and self.pilot is not None and isinstance(self.game.state, PlayingState)
+        if key is not None and not overridden:
+            self.out.write(TAG.pack(TAG_KEY) + KEY_EVENT.pack(self.frame, ord(key)))
+
+        self.frame += 1
+
+        return key
+
+    def flush(self) -> None:
+        self.inner.flush()
+
+    def close(self) -> None:
+        self.out.write(TAG.pack(TAG_END) + END.pack(self.frame, self.game.tick, self.game.world.score))
+        self.out.flush()
+        self.game.keys = self.inner
+        if self.pilot is not None:
+            self.game.autopilot = self.pilot
+
+
+@dataclass(slots=True)
+class Replay:
+    config: GameConfig
+    mode: GameMode
+    data: bytes
+    keys: Dict[int, str] = field(default_factory=dict)
+    snapshots: List[tuple[int, int]] = field(default_factory=list)
+    frames: int = 0
+    final_tick: int = 0
+    final_score: int = 0
+
+    @classmethod
+    def load(cls, source: BinaryIO) -> "Replay":
+        return cls.parse(source.read())
+
+    @classmethod
+    def parse(cls, data: bytes) -> "Replay":
+        magic, version = struct.unpack_from("<4sB", data, 0)
+        if magic != MAGIC:
+            raise ValueError("not a replay file")
+
+        if version != VERSION:
+            raise ValueError(f"unsupported replay version {version}")
+
+        (
+            _, _, mode, has_seed, seed,
+            width, height, bird_x, gravity, flap_velocity, fixed_point_scale,
+        ) = HEADER.unpack_from(data, 0)
+
+        config = GameConfig(
+            width=width,
+            height=height,
+            bird_x=bird_x,
+            gravity=gravity,
+            flap_velocity=flap_velocity,
+            seed=seed if has_seed else None,
+            fixed_point_scale=fixed_point_scale,
+        )
+        replay = cls(config=config, mode=MODES[mode], data=data)
+
+        offset = HEADER.size
+        ended = False
+        while offset < len(data):
+            (tag,) = TAG.unpack_from(data, offset)
+            offset += TAG.size
+
+            if tag == TAG_KEY:
+                frame, key = KEY_EVENT.unpack_from(data, offset)
+                replay.keys[frame] = chr(key)
+                offset += KEY_EVENT.size
+            elif tag == TAG_SNAPSHOT:
+                frame, *_, n_pipes = SNAPSHOT.unpack_from(data, offset)
+                replay.snapshots.append((frame, offset))
+                offset += SNAPSHOT.size + n_pipes * PIPE.size + RNG.size
+            elif tag == TAG_END:
+                replay.frames, replay.final_tick, replay.final_score = END.unpack_from(data, offset)
+                offset += END.size
+                ended = True
+            else:
+                raise ValueError(f"corrupt replay: unknown record tag {tag}")
+
+        if not ended:
+            raise ValueError("replay is truncated: missing end record")
+        if not replay.snapshots or replay.snapshots[0][0] != 0:
+            raise ValueError("replay has no initial snapshot")
+
+        return replay
+
+
+@dataclass(slots=True)
+class ReplayKeyReader:
+    replay: Replay
+    frame: int = 0
+
+    def read_key(self) -> Optional[str]:
+        key = self.replay.keys.get(self.frame)
+        self.frame += 1
+
+        return key
+
+    def flush(self) -> None:
+        return
+
+
+@dataclass(slots=True)
+class ReplayPlayer:
+    replay: Replay
+    renderer: Renderer = field(default_factory=NullRenderer)
+    game: Game = field(init=False)
+    reader: ReplayKeyReader = field(init=False)
+
+    def __post_init__(self) -> None:
+        config = self.replay.config
+        world = World(
+            width=config.width,
+            height=config.height,
+            bird=make_bird(config),
+        )
+        self.reader = ReplayKeyReader(self.replay)
+        self.game = Game(
+            world=world,
+            spawner=make_spawner(self.replay.mode),
+            mode=self.replay.mode,
+            config=config,
+            renderer=self.renderer,
+            keys=self.reader,
+            rng=random.Random(config.seed),
+        )
+        replay = self.replay
+        self.reader.frame = _restore_snapshot(replay.data, replay.snapshots[0][1], self.game)
+
+    @property
+    def frame(self) -> int:
+        return self.reader.frame
+
+    def step(self) -> None:
+        self.game.step_once(self.reader.read_key())
+
+    def seek(self, frame: int) -> None:
+        frame = max(0, min(frame, self.replay.frames))
+
+        i = bisect.bisect_right(self.replay.snapshots, frame, key=lambda entry: entry[0])
+        best = self.replay.snapshots[max(0, i - 1)]
+
+        if not (best[0] <= self.frame <= frame):
+            self.reader.frame = _restore_snapshot(self.replay.data, best[1], self.game)
+
+        while self.frame < frame:
+            self.step()
+
+    def play_to_end(self) -> None:
+        self.seek(self.replay.frames)
+        self.verify()
+
+    def verify(self) -> None:
+        if self.frame != self.replay.frames:
+            raise ValueError(f"replay stopped at frame {self.frame}, expected {self.replay.frames}")
+
+        if self.game.tick != self.replay.final_tick or self.game.world.score != self.replay.final_score:
+            raise ValueError(
+                "replay diverged: "
+                f"tick {self.game.tick} score {self.game.world.score}, "
+                f"recorded tick {self.replay.final_tick} score {self.replay.final_score}"
+            )
@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+
+from dataclasses import dataclass, field
+
+from typing import Any, List, Optional, Sequence
+
+from .config import GameMode
+
+
+MAGIC = b"FLRS"
+VERSION = 1
+
+MODES = list(GameMode)
+
+HEADER = struct.Struct("<4sBxxxI")
+RECORD = struct.Struct("<qdfIIBB2x")
+
+FLAG_SEED = 1
+
+DTYPE = [
+    ("seed", "<i8"),
+    ("timestamp", "<f8"),
+    ("duration", "<f4"),
+    ("score", "<u4"),
+    ("ticks", "<u4"),
+    ("mode", "u1"),
+    ("flags", "u1"),
+    ("pad", "V2"),
+]
+
+
+@dataclass(slots=True, frozen=True)
+class GameRecord:
+    seed: Optional[int]
+    mode: GameMode
+    score: int
+    ticks: int
+    duration: float
+    timestamp: float
+
+    def pack(self) -> bytes:
+        return RECORD.pack(
+            self.seed or 0,
+            self.timestamp,
+            self.duration,
+            self.score,
+            self.ticks,
+            MODES.index(self.mode),
+            FLAG_SEED if self.seed is not None else 0,
+        )
+
+    @classmethod
+    def unpack(cls, data: bytes, offset: int = 0) -> GameRecord:
+        seed, timestamp, duration, score, ticks, mode, flags = RECORD.unpack_from(data, offset)
+        return cls(
+            seed=seed if flags & FLAG_SEED else None,
+            mode=MODES[mode],
+            score=score,
+            ticks=ticks,
+            duration=duration,
+            timestamp=timestamp,
+        )
+
+
+def _check_header(data: bytes) -> None:
+    if len(data) < HEADER.size:
+        raise ValueError("truncated results header")
+
+    magic, version, record_size = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a results store")
+    if version != VERSION or record_size != RECORD.size:
+        raise ValueError(f"unsupported results store version {version}")
+
+
+def _create(path: str) -> None:
+    import tempfile
+
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(path)), suffix=".tmp")
+    try:
+        os.write(fd, HEADER.pack(MAGIC, VERSION, RECORD.size))
+        os.close(fd)
+        os.link(tmp, path)
+    except FileExistsError:
+        pass
+    finally:
+        os.unlink(tmp)
+
+
+@dataclass(slots=True)
+class ResultsWriter:
+    path: str
+    batch_size: int = 1024
+    written: int = 0
+
+    _fd: int = field(default=-1, repr=False)
+    _buf: bytearray = field(default_factory=bytearray, repr=False)
+    _pending: int = field(default=0, repr=False)
+
+    def __post_init__(self) -> None:
+        if not os.path.exists(self.path):
+            _create(self.path)
+
+        flags = os.O_WRONLY | os.O_APPEND | getattr(os, "O_BINARY", 0)
+        self._fd = os.open(self.path, flags)
+        with open(self.path, "rb") as f:
+            _check_header(f.read(HEADER.size))
+
+    def append(self, record: GameRecord) -> None:
+        self._buf += record.pack()
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buf:
+            return
+
+        data, self._buf = memoryview(self._buf), bytearray()
+        while data:
+            data = data[os.write(self._fd, data):]
+
+        self.written += self._pending
+        self._pending = 0
+
+    def close(self) -> None:
+        if self._fd < 0:
+            return
+
+        self.flush()
+        os.close(self._fd)
+        self._fd = -1
+
+
+@dataclass(slots=True)
+class ResultsStore:
+    path: str
+
+    _map: Optional[mmap.mmap] = field(default=None, repr=False)
+    _rows: Any = field(default=None, repr=False)
+    _count: int = field(default=0, repr=False)
+
+    def __post_init__(self) -> None:
+        with open(self.path, "rb") as f:
+            _check_header(f.read(HEADER.size))
+        self.refresh()
+
+    def refresh(self) -> int:
+        import numpy as np
+
+        count = (os.path.getsize(self.path) - HEADER.size) // RECORD.size
+        if count == self._count and self._rows is not None:
+            return count
+
+        self._unmap()
+        length = HEADER.size + count * RECORD.size
+        with open(self.path, "rb") as f:
+            self._map = mmap.mmap(f.fileno(), length, access=mmap.ACCESS_READ)
+
+        self._rows = np.frombuffer(self._map, dtype=np.dtype(DTYPE), count=count, offset=HEADER.size)
+        self._count = count
+
+        return count
+
+    def __len__(self) -> int:
+        return self._count
+
+    def __getitem__(self, index: int) -> GameRecord:
+        if index < 0:
+            index += self._count
+        if not 0 <= index < self._count:
+            raise IndexError(index)
+
+        return GameRecord.unpack(self._map, HEADER.size + index * RECORD.size)
+
+    def rows(self, *, mode: Optional[GameMode] = None) -> Any:
+        if mode is None:
+            return self._rows
+
+        return self._rows[self._rows["mode"] == MODES.index(mode)]
+
+    def top_k(self, k: int, *, mode: Optional[GameMode] = None) -> List[GameRecord]:
+        import numpy as np
+
+        rows = self._rows
+        index = np.arange(len(rows)) if mode is None else np.flatnonzero(rows["mode"] == MODES.index(mode))
+        if k <= 0 or not len(index):
+            return []
+
+        if k < len(index):
+            scores = rows["score"][index]
+            cut = np.partition(scores, len(index) - k)[len(index) - k]
+            above = index[scores > cut]
+            ties = index[scores == cut]
+
+            need = k - len(above)
+            if need < len(ties):
+                ties = ties[np.argpartition(rows["timestamp"][ties], need - 1)[:need]]
+            index = np.concatenate((above, ties))
+
+        picked = rows[index]
+        order = np.lexsort((index, picked["timestamp"], -picked["score"].astype(np.int64)))
+
+        return [self[int(i)] for i in index[order]]
+
+    def percentiles(self, qs: Sequence[float], *, mode: Optional[GameMode] = None) -> List[int]:
+        import numpy as np
+
+        scores = self.rows(mode=mode)["score"]
+        if not len(scores):
+            return [0] * len(qs)
+
+        ranks = [int(q / 100.0 * (len(scores) - 1)) for q in qs]
+        ordered = np.partition(scores, sorted(set(ranks)))
+
+        return [int(ordered[r]) for r in ranks]
+
+    def percentile(self, q: float, *, mode: Optional[GameMode] = None) -> int:
+        return self.percentiles([q], mode=mode)[0]
+
+    def _unmap(self) -> None:
+        self._rows = None
+        if self._map is None:
+            return
+
+        try:
+            self._map.close()
+        except BufferError:
+            # a caller still holds rows() from this map; it is unmapped when
+            # the last of them goes
+            pass
+        self._map = None
+
+    def close(self) -> None:
+        self._unmap()
+        self._count = 0
+
+    def __enter__(self) -> "ResultsStore":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(prog="flappy_cli.results")
+    parser.add_argument("path")
+    parser.add_argument("--mode", choices=[m.value for m in GameMode], default=None)
+    parser.add_argument("--top", type=int, default=10)
+    parser.add_argument("--percentiles", type=float, nargs="*", default=[50, 90, 99])
+    args = parser.parse_args(argv)
+
+    mode = GameMode(args.mode) if args.mode else None
+    with ResultsStore(args.path) as store:
+        print(json.dumps({
+            "games": len(store.rows(mode=mode)),
+            "percentiles": dict(zip(map(str, args.percentiles), store.percentiles(args.percentiles, mode=mode))),
+            "top": [
+                {"seed": r.seed, "mode": r.mode.value, "score": r.score, "ticks": r.ticks, "timestamp": r.timestamp}
+                for r in store.top_k(args.top, mode=mode)
+            ],
+        }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,309 @@
+from __future__ import annotations
+
+import argparse
+import asyncio
+import io
+import random
+
+from collections import deque
+from dataclasses import dataclass, field
+
+from typing import Deque, List, Optional, Sequence
+
+from .config import GameConfig, GameMode, make_bird, make_spawner
+from .game.core import Game
+from .io.input import EscapeFilter
+from .io.render import AsciiRenderer
+from .model import World
+
+
+IAC = 0xFF
+DONT = 0xFE
+WILL = 0xFB
+SB = 0xFA
+SE = 0xF0
+
+TELNET_CHAR_MODE = bytes([IAC, 251, 1, IAC, 251, 3])
+
+_DATA = 0
+_COMMAND = 1
+_OPTION = 2
+_SUB = 3
+_SUB_IAC = 4
+
+
+@dataclass(slots=True)
+class TelnetFilter:
+    # strips IAC commands: WILL/WONT/DO/DONT take an option byte, SB runs to
+    # IAC SE, IAC IAC is a literal 0xFF and anything else is a 2-byte command;
+    # state carries over when a command is split across reads
+    state: int = _DATA
+
+    def feed(self, data: bytes) -> bytes:
+        if self.state == _DATA and IAC not in data:
+            return data
+
+        out = bytearray()
+        state = self.state
+        for b in data:
+            if state == _DATA:
+                if b == IAC:
+                    state = _COMMAND
+                else:
+                    out.append(b)
+            elif state == _COMMAND:
+                if b == IAC:
+                    out.append(IAC)
+                    state = _DATA
+                elif WILL <= b <= DONT:
+                    state = _OPTION
+                elif b == SB:
+                    state = _SUB
+                else:
+                    state = _DATA
+            elif state == _OPTION:
+                state = _DATA
+            elif state == _SUB:
+                if b == IAC:
+                    state = _SUB_IAC
+            else:
+                state = _DATA if b == SE else _SUB
+        self.state = state
+
+        return bytes(out)
+
+
+@dataclass(slots=True)
+class StreamKeyReader:
+    reader: asyncio.StreamReader
+    max_pending: int = 256
+    closed: bool = False
+    keys: Deque[str] = field(init=False)
+    telnet: TelnetFilter = field(default_factory=TelnetFilter, repr=False)
+    escapes: EscapeFilter = field(default_factory=EscapeFilter, repr=False)
+
+    def __post_init__(self) -> None:
+        self.keys = deque(maxlen=self.max_pending)
+
+    async def pump(self) -> None:
+        while True:
+            try:
+                data = await self.reader.read(64)
+            except ConnectionError:
+                data = b""
+
+            if not data:
+                self.closed = True
+                return
+
+            text = self.telnet.feed(data).decode("utf-8", errors="ignore")
+            for ch in self.escapes.feed(text, asyncio.get_running_loop().time()):
+                self.keys.append(ch.lower())
+
+    def read_key(self) -> Optional[str]:
+        try:
+            return self.keys.popleft()
+        except IndexError:
+            return None
+
+    def flush(self) -> None:
+        self.keys.clear()
+
+
+@dataclass(slots=True)
+class StreamRenderer:
+    writer: asyncio.StreamWriter
+    high_water: int = 64 * 1024
+    size: tuple[int, int] = (80, 30)
+    frames_sent: int = 0
+    frames_dropped: int = 0
+    inner: AsciiRenderer = field(init=False)
+    buffer: io.StringIO = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.buffer = io.StringIO()
+        self.inner = AsciiRenderer(
+            clear_once=True,
+            diff=True,
+            stream=self.buffer,
+            size=self.size,
+            console=False,
+        )
+
+    def render(self, world: World, *, message: str = "") -> None:
+        transport = self.writer.transport
+        if transport.is_closing():
+            return
+
+        if transport.get_write_buffer_size() > self.high_water:
+            self.frames_dropped += 1
+            self.inner.invalidate()
+            return
+
+        self.inner.render(world, message=message)
+
+        data = self.buffer.getvalue()
+        self.buffer.seek(0)
+        self.buffer.truncate()
+
+        if data:
+            self.writer.write(data.encode("utf-8"))
+        self.frames_sent += 1
+
+
+@dataclass(slots=True)
+class Session:
+    game: Game
+    keys: StreamKeyReader
+    renderer: StreamRenderer
+    pump: Optional[asyncio.Task] = None
+
+    @property
+    def finished(self) -> bool:
+        return self.keys.closed or not self.game.is_running
+
+    async def close(self) -> None:
+        if self.pump is not None:
+            self.pump.cancel()
+
+        writer = self.renderer.writer
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except ConnectionError:
+            pass
+
+
+def make_session(
+    reader: asyncio.StreamReader,
+    writer: asyncio.StreamWriter,
+    *,
+    config: GameConfig,
+    mode: GameMode = GameMode.EASY,
+    seed: Optional[int] = None,
+) -> Session:
+    keys = StreamKeyReader(reader)
+    renderer = StreamRenderer(writer)
+    world = World(
+        width=config.width,
+        height=config.height,
+        bird=make_bird(config),
+    )
+    game = Game(
+        world=world,
+        spawner=make_spawner(mode),
+        mode=mode,
+        config=config,
+        renderer=renderer,
+        keys=keys,
+        rng=random.Random(seed if seed is not None else config.seed),
+    )
+
+    return Session(game=game, keys=keys, renderer=renderer)
+
+
+@dataclass(slots=True)
+class SessionHub:
+    config: GameConfig = field(default_factory=GameConfig)
+    sessions: List[Session] = field(default_factory=list)
+    running: bool = True
+    ticks: int = 0
+
+    def add(self, session: Session) -> None:
+        session.pump = asyncio.get_running_loop().create_task(session.keys.pump())
+        self.sessions.append(session)
+
+    async def _reap(self) -> None:
+        done = [s for s in self.sessions if s.finished]
+        if not done:
+            return
+
+        self.sessions = [s for s in self.sessions if not s.finished]
+        for s in done:
+            await s.close()
+
+    async def run(self) -> None:
+        loop = asyncio.get_running_loop()
+        sim_dt = 1.0 / self.config.sim_hz
+        render_dt = 1.0 / self.config.render_hz
+        max_steps = max(1, self.config.max_catch_up)
+
+        next_sim = loop.time()
+        next_render = next_sim
+
+        while self.running:
+            now = loop.time()
+
+            steps = 0
+            while next_sim <= now and steps < max_steps:
+                for s in self.sessions:
+                    if s.game.is_running:
+                        s.game.sim_step()
+                next_sim += sim_dt
+                steps += 1
+                self.ticks += 1
+
+            if next_sim <= now:
+                next_sim = now + sim_dt
+
+            if next_render <= now:
+                for s in self.sessions:
+                    if s.game.is_running:
+                        s.game.render_frame()
+                        s.game.frames_rendered += 1
+                next_render += render_dt
+                if next_render <= now:
+                    next_render = now + render_dt
+
+            await self._reap()
+
+            delay = min(next_sim, next_render) - loop.time()
+            await asyncio.sleep(max(0.0, delay))
+
+        for s in self.sessions:
+            await s.close()
+        self.sessions.clear()
+
+
+async def serve(
+    host: str = "127.0.0.1",
+    port: int = 7777,
+    *,
+    config: Optional[GameConfig] = None,
+    mode: GameMode = GameMode.EASY,
+) -> tuple[asyncio.AbstractServer, SessionHub]:
+    config = config or GameConfig()
+    hub = SessionHub(config=config)
+    seeds = iter(range(1 << 62))
+
+    async def handle(reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        writer.write(TELNET_CHAR_MODE)
+        seed = config.seed if config.seed is not None else next(seeds)
+        hub.add(make_session(reader, writer, config=config, mode=mode, seed=seed))
+
+    server = await asyncio.start_server(handle, host, port)
+
+    return server, hub
+
+
+async def _main(host: str, port: int, mode: GameMode) -> None:
+    server, hub = await serve(host, port, mode=mode)
+    async with server:
+        await hub.run()
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="flappy_cli.server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=7777)
+    parser.add_argument("--mode", choices=[m.value for m in GameMode], default=GameMode.EASY.value)
+    args = parser.parse_args(argv)
+
+    try:
+        asyncio.run(_main(args.host, args.port, GameMode(args.mode)))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,351 @@
+from __future__ import annotations
+
+import math
+import os
+
+from dataclasses import dataclass, replace
+from functools import lru_cache
+
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence
+
+from .config import GameConfig, GameMode, make_spawner
+from .levels import PipeEntry, compile_course
+from .model import to_fixed
+from .strategy import SpawnerStrategy
+
+
+DEFAULT_SCALE = 100
+
+
+@dataclass(slots=True, frozen=True)
+class Verdict:
+    survivable: bool
+    horizon: int
+    dead_tick: Optional[int] = None
+    pipe: Optional[int] = None
+    seed: Optional[int] = None
+
+
+@lru_cache(maxsize=None)
+def _bounds_mask(height: int, unit: int) -> int:
+    # bit i is y == (i - unit) / unit cells; cell_y truncates toward zero, so
+    # (-1, 0) still lands in row 0
+    return ((1 << ((height + 1) * unit - 1)) - 1) << 1
+
+
+@lru_cache(maxsize=None)
+def _gap_mask(gap_y: int, gap_h: int, height: int, unit: int) -> int:
+    top = max(0, gap_y)
+    bottom = min(height, gap_y + gap_h)
+    if top >= bottom:
+        return 0
+
+    lo = 1 if top == 0 else (top + 1) * unit
+    hi = (bottom + 1) * unit
+
+    return ((1 << (hi - lo)) - 1) << lo
+
+
+@lru_cache(maxsize=None)
+def _start_bit(height: int, unit: int) -> int:
+    return 1 << ((height // 2) * unit + unit)
+
+
+def _pipe_columns(course: Sequence[PipeEntry], config: GameConfig) -> Dict[int, tuple[int, int, int]]:
+    delay = config.width - 2 - config.bird_x
+    columns: Dict[int, tuple[int, int, int]] = {}
+    for i, entry in enumerate(course):
+        columns[entry.tick + delay] = (i, entry.gap_y, entry.gap_h)
+
+    return columns
+
+
+@lru_cache(maxsize=None)
+def _lattice(gravity: float, flap_velocity: float, height: int, scale: int) -> tuple[int, tuple[int, ...]]:
+    g = to_fixed(gravity, scale)
+    f = to_fixed(flap_velocity, scale)
+    if g <= 0:
+        raise ValueError("the solvability analyzer needs positive gravity")
+
+    # every reachable y is a multiple of this step, so one bit per step is exact
+    step = math.gcd(g, f, scale)
+    unit = scale // step
+    g //= step
+    f //= step
+
+    # vy after a flap and k more ticks of gravity, for as long as the arc
+    # since that flap still fits inside the world
+    room = (height + 1) * unit - 2
+    velocities: List[int] = []
+    offset = low = high = 0
+    v = f + g
+    while True:
+        offset += v
+        low = min(low, offset)
+        high = max(high, offset)
+        if high - low > room:
+            break
+        velocities.append(v)
+        v += g
+
+    return unit, tuple(velocities)
+
+
+def _advance(buckets: List[int], allowed: int, velocities: Sequence[int], tick: int) -> List[int]:
+    # bucket k holds the y values reachable k ticks after the last flap, so
+    # they all share vy == velocities[k]
+    merged = 0
+    for bits in buckets:
+        merged |= bits
+    v = velocities[0]
+    out = [(merged << v if v >= 0 else merged >> -v) & allowed]
+
+    # the game always flaps on the first tick
+    if not tick:
+        return out
+
+    for k in range(1, min(len(buckets) + 1, len(velocities))):
+        bits = buckets[k - 1]
+        if bits:
+            v = velocities[k]
+            bits = (bits << v if v >= 0 else bits >> -v) & allowed
+        out.append(bits)
+
+    while len(out) > 1 and not out[-1]:
+        out.pop()
+
+    return out
+
+
+def analyze_course(
+    course: Sequence[PipeEntry],
+    *,
+    config: Optional[GameConfig] = None,
+    horizon: int = 10_000,
+    seed: Optional[int] = None,
+    trace: Optional[List[List[int]]] = None,
+) -> Verdict:
+    config = config or GameConfig()
+    height = config.height
+    unit, velocities = _lattice(config.gravity, config.flap_velocity, height, config.fixed_point_scale or DEFAULT_SCALE)
+
+    bounds = _bounds_mask(height, unit)
+    columns = _pipe_columns(course, config)
+    buckets = [_start_bit(height, unit)]
+
+    for tick in range(horizon):
+        pipe = columns.get(tick)
+        allowed = bounds if pipe is None else bounds & _gap_mask(pipe[1], pipe[2], height, unit)
+        buckets = _advance(buckets, allowed, velocities, tick)
+
+        if trace is not None:
+            trace.append(buckets)
+
+        if len(buckets) == 1 and not buckets[0]:
+            return Verdict(
+                survivable=False,
+                horizon=horizon,
+                dead_tick=tick,
+                pipe=pipe[0] if pipe is not None else None,
+                seed=seed,
+            )
+
+    return Verdict(survivable=True, horizon=horizon, seed=seed)
+
+
+def analyze_batch(
+    courses: Sequence[Sequence[PipeEntry]],
+    *,
+    config: Optional[GameConfig] = None,
+    horizon: int = 10_000,
+    seeds: Optional[Sequence[int]] = None,
+) -> List[Verdict]:
+    config = config or GameConfig()
+    height = config.height
+    unit, velocities = _lattice(config.gravity, config.flap_velocity, height, config.fixed_point_scale or DEFAULT_SCALE)
+    n = len(courses)
+    if not n:
+        return []
+
+    # every course gets its own byte-aligned segment of one big int, wide
+    # enough that no shift carries bits into a neighbour's rows
+    reach = max(abs(v) for v in velocities)
+    stride = -(-((height + 1) * unit + reach) // 8)
+
+    bounds = _bounds_mask(height, unit).to_bytes(stride, "little")
+    parts = [bounds] * n
+    everywhere = int.from_bytes(b"".join(parts), "little")
+
+    events: Dict[int, List[tuple[int, bytes]]] = {}
+    for i, course in enumerate(courses):
+        for tick, (_, gap_y, gap_h) in _pipe_columns(course, config).items():
+            if tick < horizon:
+                mask = _bounds_mask(height, unit) & _gap_mask(gap_y, gap_h, height, unit)
+                events.setdefault(tick, []).append((i, mask.to_bytes(stride, "little")))
+
+    start = _start_bit(height, unit)
+    buckets = [int.from_bytes(b"".join([start.to_bytes(stride, "little")] * n), "little")]
+
+    for tick in range(horizon):
+        changes = events.get(tick)
+        if changes is None:
+            allowed = everywhere
+        else:
+            row = parts.copy()
+            for i, mask in changes:
+                row[i] = mask
+            allowed = int.from_bytes(b"".join(row), "little")
+
+        buckets = _advance(buckets, allowed, velocities, tick)
+        if len(buckets) == 1 and not buckets[0]:
+            break
+
+    # a course that empties out stays empty, so one look at the end is enough
+    merged = 0
+    for bits in buckets:
+        merged |= bits
+    state = merged.to_bytes(stride * n, "little")
+    empty = bytes(stride)
+
+    verdicts = []
+    for i, course in enumerate(courses):
+        seed = seeds[i] if seeds is not None else None
+        if state[i * stride:(i + 1) * stride] == empty:
+            verdicts.append(analyze_course(course, config=config, horizon=horizon, seed=seed))
+        else:
+            verdicts.append(Verdict(survivable=True, horizon=horizon, seed=seed))
+
+    return verdicts
+
+
+def analyze_seed(
+    seed: int,
+    *,
+    mode: GameMode,
+    config: Optional[GameConfig] = None,
+    horizon: int = 10_000,
+    spawner: Optional[SpawnerStrategy] = None,
+) -> Verdict:
+    config = config or GameConfig()
+    course = compile_course(seed, mode=mode, config=config, horizon=horizon, spawner=spawner)
+
+    return analyze_course(course, config=config, horizon=horizon, seed=seed)
+
+
+def witness(
+    course: Sequence[PipeEntry],
+    *,
+    config: Optional[GameConfig] = None,
+    horizon: int = 10_000,
+) -> Optional[List[bool]]:
+    config = config or GameConfig()
+    _, velocities = _lattice(config.gravity, config.flap_velocity, config.height, config.fixed_point_scale or DEFAULT_SCALE)
+
+    trace: List[List[int]] = []
+    if not analyze_course(course, config=config, horizon=horizon, trace=trace).survivable:
+        return None
+
+    last = trace[-1]
+    k = next(i for i, bits in enumerate(last) if bits)
+    bit = (last[k] & -last[k]).bit_length() - 1
+
+    flaps: List[bool] = []
+    for tick in range(horizon - 1, 0, -1):
+        prev = bit - velocities[k]
+        flaps.append(k == 0)
+        if k == 0:
+            before = trace[tick - 1]
+            k = next(i for i, bits in enumerate(before) if (bits >> prev) & 1)
+        else:
+            k -= 1
+        bit = prev
+
+    flaps.append(True)
+    flaps.reverse()
+
+    return flaps
+
+
+def _audit_chunk(
+    seeds: Sequence[int],
+    mode: GameMode,
+    config: GameConfig,
+    horizon: int,
+    spawner: Optional[SpawnerStrategy],
+) -> List[Verdict]:
+    courses = [compile_course(seed, mode=mode, config=config, horizon=horizon, spawner=spawner) for seed in seeds]
+
+    return analyze_batch(courses, config=config, horizon=horizon, seeds=seeds)
+
+
+def audit(
+    seeds: Iterable[int],
+    *,
+    mode: GameMode,
+    config: Optional[GameConfig] = None,
+    horizon: int = 10_000,
+    spawner: Optional[SpawnerStrategy] = None,
+    workers: Optional[int] = None,
+    chunk_size: int = 256,
+) -> Iterator[Verdict]:
+    config = config or GameConfig()
+    seeds = list(seeds)
+    workers = workers or os.cpu_count() or 1
+    chunks = [seeds[i:i + chunk_size] for i in range(0, len(seeds), chunk_size)]
+
+    if workers == 1:
+        for chunk in chunks:
+            yield from _audit_chunk(chunk, mode, config, horizon, spawner)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    from itertools import repeat
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for verdicts in pool.map(_audit_chunk, chunks, repeat(mode), repeat(config), repeat(horizon), repeat(spawner)):
+            yield from verdicts
+
+
+def main(argv: Optional[Sequence[str]] = None) -> None:
+    import argparse
+    import json
+    import time
+
+    parser = argparse.ArgumentParser(prog="flappy_cli.solver")
+    parser.add_argument("--mode", choices=[m.value for m in GameMode], default=GameMode.HARD.value)
+    parser.add_argument("--seeds", type=int, default=1000)
+    parser.add_argument("--first-seed", type=int, default=0)
+    parser.add_argument("--horizon", type=int, default=2_000, help="ticks a course must be survivable for")
+    parser.add_argument("--gap-h", type=int, default=None, help="audit the mode's spawner with this gap height instead")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--fair-out", metavar="PATH", help="write the survivable seeds to this file, one per line")
+    args = parser.parse_args(argv)
+
+    mode = GameMode(args.mode)
+    spawner = make_spawner(mode)
+    if args.gap_h is not None:
+        spawner = replace(spawner, gap_h=args.gap_h)
+
+    started = time.perf_counter()
+    seeds = range(args.first_seed, args.first_seed + args.seeds)
+    verdicts = list(audit(seeds, mode=mode, horizon=args.horizon, spawner=spawner, workers=args.workers))
+    elapsed = time.perf_counter() - started
+
+    fair = [v.seed for v in verdicts if v.survivable]
+    if args.fair_out:
+        with open(args.fair_out, "w", encoding="utf-8") as f:
+            f.writelines(f"{seed}\n" for seed in fair)
+
+    print(json.dumps({
+        "seeds": len(verdicts),
+        "survivable": len(fair),
+        "seeds_per_sec": len(verdicts) / elapsed if elapsed > 0 else 0.0,
+        "impossible": [
+            {"seed": v.seed, "tick": v.dead_tick, "pipe": v.pipe}
+            for v in verdicts if not v.survivable
+        ][:50],
+    }))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+from __future__ import annotations
+
+import math
+
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from .config import GameConfig
+from .model import Bird, FixedBird, to_fixed
+
+
+ARC_TICKS = 256
+
+Number = Union[int, float]
+
+
+def bird_state(bird: Union[Bird, FixedBird]) -> Tuple[Number, Number]:
+    if isinstance(bird, FixedBird):
+        return bird.qy, bird.qvy
+
+    return bird.y, bird.vy
+
+
+def _first(pred: Callable[[int], bool], lo: int, hi: int) -> int:
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if pred(mid):
+            hi = mid
+        else:
+            lo = mid + 1
+
+    return lo
+
+
+@dataclass(slots=True, frozen=True)
+class ArcTable:
+    gravity: Number
+    flap_velocity: Number
+    scale: int
+
+    # velocities[k] is vy k ticks after a flap, offsets[k] how far the bird
+    # has moved by then; both are built with the bird's own arithmetic
+    velocities: Tuple[Number, ...] = field(repr=False)
+    offsets: Tuple[Number, ...] = field(repr=False)
+    phases: Dict[Number, int] = field(repr=False, compare=False)
+
+    def cell(self, y: Number) -> int:
+        scale = self.scale
+        if not scale:
+            return int(y)
+        if y >= 0:
+            return y // scale
+
+        return -(-y // scale)
+
+    def displacement(self, vy: Number, k: int) -> Number:
+        j = self.phases.get(vy)
+        if j is not None and j + k < len(self.offsets):
+            return self.offsets[j + k] - self.offsets[j]
+
+        # off the tabled arc (e.g. before the first flap) the sum still has
+        # a closed form
+        return k * vy + self.gravity * (k * (k + 1) // 2)
+
+    def y_at(self, y: Number, vy: Number, k: int) -> Number:
+        return y + self.displacement(vy, k)
+
+    def cell_at(self, y: Number, vy: Number, k: int) -> int:
+        return self.cell(y + self.displacement(vy, k))
+
+    def apex(self, vy: Number) -> int:
+        # ticks until the bird stops rising, i.e. the k with the lowest y
+        g = self.gravity
+        if vy + g >= 0:
+            return 0
+        if self.scale:
+            return (-vy + g - 1) // g - 1
+
+        return math.ceil(-vy / g) - 1
+
+    def exit_tick(self, y: Number, vy: Number, low: int, high: int, *, limit: int = 10_000) -> Optional[int]:
+        def cell(k: int) -> int:
+            return self.cell(y + self.displacement(vy, k))
+
+        # cell_y falls until the apex and rises after it, so each side is
+        # one binary search
+        apex = min(self.apex(vy), limit)
+        if apex >= 1:
+            top = cell(1)
+            if top >= high or top < low:
+                return 1
+
+            k = _first(lambda k: cell(k) < low, 2, apex + 1)
+            if k <= apex:
+                return k
+
+        start = max(1, apex + 1)
+        if start > limit:
+            return None
+
+        first = cell(start)
+        if first < low or first >= high:
+            return start
+
+        passed = start
+        span = 1
+        while passed < limit:
+            k = min(limit, start + span)
+            if cell(k) >= high:
+                return _first(lambda k: cell(k) >= high, passed + 1, k)
+            passed = k
+            span *= 2
+
+        return None
+
+    def path(self, y: Number, vy: Number, n: int) -> List[int]:
+        return [self.cell(y + self.displacement(vy, k)) for k in range(1, n + 1)]
+
+    def flap_path(self, y: Number, n: int) -> List[int]:
+        return self.path(y, self.velocities[0], n)
+
+
+def arc_table(gravity: float, flap_velocity: float, scale: int = 0, ticks: int = ARC_TICKS) -> ArcTable:
+    return _arc_table(gravity, flap_velocity, scale, ticks)
+
+
+@lru_cache(maxsize=None)
+def _arc_table(gravity: float, flap_velocity: float, scale: int, ticks: int) -> ArcTable:
+    if gravity <= 0:
+        raise ValueError("trajectory tables need positive gravity")
+
+    g: Number = gravity
+    v: Number = flap_velocity
+    if scale:
+        g = to_fixed(gravity, scale)
+        v = to_fixed(flap_velocity, scale)
+
+    velocities = [v]
+    offsets: List[Number] = [0]
+    for _ in range(ticks):
+        v += g
+        velocities.append(v)
+        offsets.append(offsets[-1] + v)
+
+    return ArcTable(
+        gravity=g,
+        flap_velocity=velocities[0],
+        scale=scale,
+        velocities=tuple(velocities),
+        offsets=tuple(offsets),
+        phases={v: k for k, v in enumerate(velocities)},
+    )
+
+
+def table_for(config: GameConfig) -> ArcTable:
+    return arc_table(config.gravity, config.flap_velocity, config.fixed_point_scale)
@@ -0,0 +1,30 @@
+import re
+
+import pytest
+
+
+CSI = re.compile(r"\x1b\[([0-9;?]*)([A-Za-z])")
+
+
+def _apply_to_screen(screen: dict, data: str) -> None:
+    row, col = 1, 1
+    pos = 0
+    while pos < len(data):
+        m = CSI.match(data, pos)
+        if m:
+            args, cmd = m.groups()
+            if cmd == "H":
+                row, col = (int(v) for v in args.split(";")) if args else (1, 1)
+            elif cmd == "J":
+                screen.clear()
+            pos = m.end()
+            continue
+
+        screen[(row, col)] = data[pos]
+        col += 1
+        pos += 1
+
+
+@pytest.fixture
+def apply_to_screen():
+    return _apply_to_screen
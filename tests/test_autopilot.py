@@ -0,0 +1,89 @@
+import random
+
+from flappy_cli.autopilot import Autopilot
+from flappy_cli.config import GameConfig, GameMode, make_spawner
+from flappy_cli.evaluate import evaluate, play_headless
+from flappy_cli.game.core import Game
+from flappy_cli.game.states import PlayingState
+from flappy_cli.io.input import NullKeyReader
+from flappy_cli.io.render import NullRenderer
+from flappy_cli.model import Bird, World
+
+
+class StepClock:
+    def __init__(self, step: float) -> None:
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+def test_autopilot_survives_easy_and_medium():
+    for mode in (GameMode.EASY, GameMode.MEDIUM):
+        result = play_headless(Autopilot(), seed=4, mode=mode, max_ticks=1500)
+        assert result.ticks == 1500
+
+
+def test_autopilot_flies_playing_state_live():
+    config = GameConfig()
+    game = Game(
+        world=World(width=config.width, height=config.height, bird=Bird(x=config.bird_x, y=config.height // 2)),
+        spawner=make_spawner(GameMode.EASY),
+        mode=GameMode.EASY,
+        config=config,
+        renderer=NullRenderer(),
+        keys=NullKeyReader(),
+        rng=random.Random(2),
+        autopilot=Autopilot(config=config),
+    )
+    game.set_state(PlayingState())
+
+    for _ in range(600):
+        game.step_once(None)
+
+    assert isinstance(game.state, PlayingState)
+    assert game.world.score > 0
+
+
+def test_search_depth_shrinks_to_fit_budget():
+    roomy = Autopilot(max_depth=16)
+    play_headless(roomy, seed=1, max_ticks=200)
+    assert roomy.depth == 16
+
+    tight = Autopilot(max_depth=16, budget=0.05, check_every=1, clock=StepClock(0.01))
+    play_headless(tight, seed=1, max_ticks=200)
+    assert 0 < tight.depth < 16
+
+
+def test_node_budget_is_deterministic_under_any_clock():
+    fast = Autopilot(max_depth=16, max_nodes=300)
+    slow = Autopilot(max_depth=16, max_nodes=300, check_every=1, clock=StepClock(1.0))
+
+    assert play_headless(fast, seed=3, max_ticks=400) == play_headless(slow, seed=3, max_ticks=400)
+    assert fast.nodes == slow.nodes
+
+    starved = Autopilot(max_depth=16, max_nodes=8)
+    play_headless(starved, seed=1, max_ticks=50)
+    assert starved.depth < 16
+
+
+def test_transposition_table_is_bounded_and_reused():
+    pilot = Autopilot(table_size=128)
+    play_headless(pilot, seed=7, max_ticks=400)
+
+    assert len(pilot.table) <= 128
+    assert pilot.hits > pilot.nodes // 4
+
+
+def test_autopilot_policy_runs_in_worker_processes():
+    summary = evaluate(Autopilot(), range(4), mode=GameMode.EASY, max_ticks=300, workers=2, chunk_size=2)
+    assert summary.games == 4
+    assert summary.total_ticks == 1200
+
+
+def test_autopilot_plans_in_fixed_point_units():
+    config = GameConfig(fixed_point_scale=100)
+    result = play_headless(Autopilot(config=config), seed=4, config=config, max_ticks=1000)
+    assert result.ticks == 1000
@@ -0,0 +1,57 @@
+import subprocess
+import sys
+
+import pytest
+
+from flappy_cli.io import backends
+from flappy_cli.io.base import NullKeyReader, NullRenderer
+
+
+TERMINAL_MODULES = (
+    "ctypes", "msvcrt", "termios", "selectors", "threading", "shutil", "signal",
+    "flappy_cli.io.input", "flappy_cli.io.render",
+)
+
+
+def test_headless_imports_pull_in_no_terminal_modules():
+    code = (
+        "import sys\n"
+        "import flappy_cli.model, flappy_cli.strategy, flappy_cli.game, flappy_cli.evaluate, flappy_cli.env\n"
+        f"print([m for m in {TERMINAL_MODULES!r} if m in sys.modules])\n"
+    )
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    assert out.stdout.strip() == "[]"
+
+
+@pytest.fixture
+def registry(monkeypatch):
+    monkeypatch.setattr(backends, "INPUTS", dict(backends.INPUTS))
+    monkeypatch.setattr(backends, "RENDERERS", dict(backends.RENDERERS))
+    return backends
+
+
+def test_registry_resolves_lazily_and_caches(registry):
+    backends.register_renderer("lazy-null", "flappy_cli.io.base:NullRenderer")
+    assert backends.RENDERERS["lazy-null"] == "flappy_cli.io.base:NullRenderer"
+
+    assert isinstance(backends.make_renderer("lazy-null"), NullRenderer)
+    assert backends.RENDERERS["lazy-null"] is NullRenderer
+    assert isinstance(backends.make_input("null"), NullKeyReader)
+
+
+def test_registry_accepts_factories_and_rejects_unknown_names(registry):
+    backends.register_input("scripted", lambda keys="": iter(keys))
+    assert list(backends.make_input("scripted", keys="ab")) == ["a", "b"]
+
+    with pytest.raises(ValueError):
+        backends.make_renderer("no-such-backend")
+
+
+def test_registry_fixture_removes_registrations_on_undo(monkeypatch, registry):
+    registry.register_renderer("scoped", "flappy_cli.io.base:NullRenderer")
+    registry.register_input("scoped", "flappy_cli.io.base:NullKeyReader")
+    assert "scoped" in backends.renderer_names() and "scoped" in backends.input_names()
+
+    monkeypatch.undo()
+    assert "scoped" not in backends.renderer_names()
+    assert "scoped" not in backends.input_names()
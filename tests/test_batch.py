@@ -0,0 +1,87 @@
+import copy
+import random
+
+import numpy as np
+import pytest
+
+from flappy_cli.batch import BatchWorld
+from flappy_cli.config import GameConfig, GameMode, make_bird, make_spawner
+from flappy_cli.model import World, advance_world, collides, collides_pipe
+
+
+def play_reference(config, mode, seed, flaps):
+    world = World(width=config.width, height=config.height, bird=make_bird(config))
+    spawner = make_spawner(mode)
+    rng = random.Random(seed)
+    tick = 0
+
+    for flap in flaps:
+        if flap:
+            world.bird.flap(config.flap_velocity)
+
+        if spawner.should_spawn(tick=tick, world=world):
+            world.pipes.append(spawner.make_pipe(world=world, rng=rng))
+
+        safe_world = copy.deepcopy(world)
+        advance_world(world, gravity=config.gravity)
+
+        if collides(world):
+            if collides_pipe(world):
+                world = safe_world
+            return world, tick, True
+
+        tick += 1
+
+    return world, tick, False
+
+
+@pytest.mark.parametrize("scale", [0, 100])
+def test_batch_matches_single_world_simulation(scale):
+    config = GameConfig(width=30, height=14, bird_x=5, fixed_point_scale=scale)
+    modes = [GameMode.EASY, GameMode.MEDIUM, GameMode.HARD]
+    n = 24
+    seeds = list(range(n))
+    world_modes = [modes[i % 3] for i in range(n)]
+
+    noise = np.random.default_rng(7).random((400, n)) < 0.1
+
+    batch = BatchWorld.create(
+        config=config,
+        spawners=[make_spawner(m) for m in world_modes],
+        seeds=seeds,
+    )
+    flaps = np.zeros((400, n), dtype=bool)
+    for t in range(400):
+        ahead = batch.pipe_live & (batch.pipe_x >= config.bird_x)
+        nearest = np.where(ahead, batch.pipe_x, 10**9).argmin(axis=1)
+        target = batch.pipe_gap_y[np.arange(n), nearest] + 2
+        flaps[t] = ((batch.y > target * max(1, batch.scale)) & (batch.vy >= 0)) ^ noise[t]
+        batch.step(flaps[t])
+
+    assert batch.score.max() > 0
+
+    for i in range(n):
+        ref, tick, dead = play_reference(config, world_modes[i], seeds[i], flaps[:, i])
+        got = batch.world(i)
+
+        assert bool(batch.alive[i]) is (not dead)
+        assert int(batch.tick[i]) == tick
+        assert got.score == ref.score
+        assert type(got.bird) is type(ref.bird)
+        assert got.bird.y == ref.bird.y
+        assert got.bird.vy == ref.bird.vy
+        assert got.pipes == ref.pipes
+
+
+def test_batch_dead_worlds_stop_moving():
+    config = GameConfig(width=20, height=10, bird_x=5)
+    batch = BatchWorld.create(config=config, spawners=[make_spawner(GameMode.EASY)] * 2, seeds=[1, 2])
+
+    batch.y[0] = -5.0
+    died = batch.step(np.array([False, True]))
+
+    assert died.tolist() == [True, False]
+
+    y = batch.y[0]
+    batch.step(np.array([False, False]))
+    assert batch.y[0] == y
@@ -0,0 +1,26 @@
+import atexit
+
+from flappy_cli.bench import compare, default_benchmarks, run_benchmarks
+
+
+def test_compare_flags_only_slowdowns_above_threshold():
+    baseline = [{"name": "a", "median_ns": 100.0}, {"name": "b", "median_ns": 100.0}]
+    current = [{"name": "a", "median_ns": 105.0}, {"name": "b", "median_ns": 150.0}, {"name": "c", "median_ns": 1.0}]
+
+    rows = compare(current, baseline, threshold=0.10)
+
+    assert [(r["name"], r["regression"]) for r in rows] == [("a", False), ("b", True)]
+
+
+def test_run_benchmarks_reports_stats_and_render_bytes(monkeypatch):
+    exit_hooks = []
+    monkeypatch.setattr(atexit, "register", lambda *args: exit_hooks.append(args))
+
+    results = run_benchmarks(default_benchmarks(), repeat=2, scale=0.005, name_filter="render")
+
+    assert [r.name for r in results] == ["render.full", "render.diff"]
+    for r in results:
+        data = r.to_json()
+        assert len(data["runs_ns"]) == 2
+        assert data["bytes_per_frame"] > 0
+    assert exit_hooks == []
@@ -0,0 +1,107 @@
+import os
+import socket
+import time
+
+from flappy_cli.io.broadcast import BroadcastRenderer, QueueSubscriber, SendSubscriber, serve_spectators
+from flappy_cli.model import Bird, Pipe, World, advance_world
+
+
+def make_world() -> World:
+    world = World(width=20, height=8, bird=Bird(x=5, y=4.0))
+    world.pipes.append(Pipe(x=12, gap_y=2, gap_h=3))
+    return world
+
+
+def replay(sub: QueueSubscriber, apply_to_screen) -> dict:
+    screen: dict = {}
+    while (data := sub.get()) is not None:
+        apply_to_screen(screen, data.decode("utf-8"))
+    return screen
+
+
+def test_frames_are_encoded_once_and_shared():
+    broadcast = BroadcastRenderer(size=(40, 20))
+    subs = [QueueSubscriber(maxsize=100) for _ in range(300)]
+    for sub in subs:
+        broadcast.subscribe(sub)
+
+    world = make_world()
+    for _ in range(5):
+        advance_world(world, gravity=0.25)
+        broadcast.render(world, message="PLAYING")
+
+    assert broadcast.keyframes == 1
+    for i in range(5):
+        assert all(sub.frames[i] is subs[0].frames[i] for sub in subs)
+
+
+def test_late_joiner_and_slow_consumer_resync_with_keyframes(apply_to_screen):
+    broadcast = BroadcastRenderer(size=(40, 20))
+    steady = QueueSubscriber(maxsize=100)
+    slow = QueueSubscriber(maxsize=2)
+    broadcast.subscribe(steady)
+    broadcast.subscribe(slow)
+
+    world = make_world()
+    late = QueueSubscriber(maxsize=100)
+    for frame in range(8):
+        if frame == 4:
+            broadcast.subscribe(late)
+        if frame == 6:
+            replay(slow, apply_to_screen)
+        advance_world(world, gravity=0.25)
+        broadcast.render(world, message="PLAYING")
+
+    assert broadcast.dropped == 4
+    assert broadcast.keyframes == 5
+
+    expected = replay(steady, apply_to_screen)
+    assert replay(late, apply_to_screen) == expected
+    assert replay(slow, apply_to_screen) == expected
+
+
+def test_pipe_subscriber_drops_instead_of_blocking():
+    r, w = os.pipe()
+    sub = SendSubscriber.for_fd(w)
+    try:
+        while True:
+            os.write(w, b"x" * 4096)
+    except BlockingIOError:
+        pass
+
+    broadcast = BroadcastRenderer(size=(40, 20))
+    broadcast.subscribe(sub)
+
+    world = make_world()
+    start = time.monotonic()
+    for _ in range(200):
+        advance_world(world, gravity=0.0)
+        broadcast.render(world, message="PLAYING")
+
+    assert time.monotonic() - start < 5.0
+    assert broadcast.dropped >= 199
+    assert len(broadcast) == 1
+
+    broadcast.close()
+    os.close(r)
+
+
+def test_spectator_socket_receives_keyframe():
+    broadcast = BroadcastRenderer(size=(40, 20))
+    server, _ = serve_spectators(broadcast)
+    try:
+        client = socket.create_connection(server.getsockname())
+        deadline = time.monotonic() + 2.0
+        while len(broadcast) == 0 and time.monotonic() < deadline:
+            time.sleep(0.001)
+
+        broadcast.render(make_world(), message="WATCHING")
+        client.settimeout(2.0)
+        data = b""
+        while b"WATCHING" not in data:
+            data += client.recv(4096)
+        assert data.startswith(b"\x1b[?25l\x1b[2J")
+        client.close()
+    finally:
+        broadcast.close()
+        server.close()
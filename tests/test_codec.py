@@ -0,0 +1,124 @@
+import pickle
+import random
+
+from multiprocessing import shared_memory
+
+import pytest
+
+from flappy_cli.autopilot import Autopilot
+from flappy_cli.codec import decode_world, dump_world, encode_world, encoded_size, restore_game
+from flappy_cli.config import GameConfig, GameMode, make_bird, make_spawner
+from flappy_cli.game.core import Game
+from flappy_cli.game.states import GameOverState
+from flappy_cli.io.base import NullKeyReader, NullRenderer
+from flappy_cli.model import Bird, FixedBird, Pipe, World
+from flappy_cli.strategy import FixedIntervalSpawner
+
+
+def make_game(seed: int, scale: int = 0, spawner=None) -> Game:
+    config = GameConfig(fixed_point_scale=scale)
+    game = Game(
+        world=World(width=config.width, height=config.height, bird=make_bird(config)),
+        spawner=spawner or make_spawner(GameMode.HARD),
+        mode=GameMode.HARD,
+        config=config,
+        renderer=NullRenderer(),
+        keys=NullKeyReader(),
+        rng=random.Random(seed),
+        autopilot=Autopilot(config=config),
+    )
+    if spawner is None:
+        game.step_once(" ")
+    else:
+        game.start_playing()
+    return game
+
+
+def play(game: Game, ticks: int) -> None:
+    for _ in range(ticks):
+        if isinstance(game.state, GameOverState):
+            return
+        game.step_once(None)
+
+
+@pytest.mark.parametrize("bird", [Bird(x=6, y=7.25, vy=-1.35), FixedBird(x=6, qy=725, qvy=-135)])
+def test_world_round_trips(bird):
+    world = World(width=45, height=20, bird=bird, score=12)
+    world.pipes.scroll(300)
+    world.pipes.append(Pipe(x=3, gap_y=4, gap_h=6, passed=True))
+    world.pipes.append(Pipe(x=27, gap_y=9, gap_h=6))
+
+    data = dump_world(world)
+    assert len(data) == encoded_size(world)
+    assert len(data) < len(pickle.dumps(world))
+
+    copy, end = decode_world(data)
+    assert end == len(data)
+    assert copy == world
+    assert copy.pipes.offset == 300
+    assert copy.pipes.ahead().x == 27
+
+    target = World(width=1, height=1, bird=Bird(x=0, y=0))
+    assert decode_world(memoryview(data), world=target)[0] is target
+    assert target == world
+
+
+def test_worlds_pack_back_to_back_in_shared_memory():
+    worlds = [make_game(seed).world for seed in range(4)]
+    for i, world in enumerate(worlds):
+        world.score = i
+
+    shm = shared_memory.SharedMemory(create=True, size=sum(encoded_size(w) for w in worlds))
+    try:
+        offset = 0
+        for world in worlds:
+            offset = encode_world(world, shm.buf, offset)
+
+        offset = 0
+        for world in worlds:
+            copy, offset = decode_world(shm.buf, offset)
+            assert copy == world
+    finally:
+        shm.close()
+        shm.unlink()
+
+
+@pytest.mark.parametrize("scale", [0, 100])
+def test_restored_game_continues_identically(scale):
+    game = make_game(seed=5, scale=scale)
+    play(game, 150)
+    saved = dump_world(game.world, game=game)
+
+    resumed = make_game(seed=99, scale=scale)
+    assert restore_game(resumed, saved) == len(saved)
+
+    play(game, 300)
+    play(resumed, 300)
+    assert resumed.world == game.world
+    assert resumed.tick == game.tick
+    assert type(resumed.state) is type(game.state)
+
+
+def test_restored_game_keeps_a_custom_spawner():
+    game = make_game(seed=5, spawner=FixedIntervalSpawner(interval_ticks=9, gap_h=12))
+    play(game, 100)
+    saved = dump_world(game.world, game=game)
+
+    spawner = FixedIntervalSpawner(interval_ticks=9, gap_h=12)
+    resumed = make_game(seed=99, spawner=spawner)
+    restore_game(resumed, saved)
+    assert resumed.spawner is spawner
+    assert spawner.next_spawn_tick == game.spawner.next_spawn_tick
+
+    play(game, 200)
+    play(resumed, 200)
+    assert resumed.world == game.world
+    assert len(resumed.world.pipes) and all(p.gap_h == 12 for p in resumed.world.pipes)
+
+
+def test_restore_needs_game_state():
+    game = make_game(seed=1)
+    with pytest.raises(ValueError):
+        restore_game(game, dump_world(game.world))
+    with pytest.raises(ValueError):
+        decode_world(b"\0" * 64)
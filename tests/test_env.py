@@ -0,0 +1,68 @@
+import random
+
+from flappy_cli.config import GameConfig, GameMode, make_spawner
+from flappy_cli.env import OBS_BIRD_VY, OBS_BIRD_Y, OBS_PIPE1, OBS_PIPE2, PIPE, BIRD, FlappyEnv
+from flappy_cli.model import Bird, World, advance_world
+
+
+def make_env(**kwargs) -> FlappyEnv:
+    return FlappyEnv(config=GameConfig(width=30, height=14, bird_x=5), **kwargs)
+
+
+def test_step_follows_world_physics_and_spawning():
+    env = make_env(mode=GameMode.MEDIUM)
+    obs = env.reset(seed=9)
+
+    world = World(width=30, height=14, bird=Bird(x=5, y=7))
+    spawner = make_spawner(GameMode.MEDIUM)
+    rng = random.Random(9)
+
+    for tick in range(30):
+        action = int(world.bird.y > 7 and world.bird.vy >= 0)
+        if action:
+            world.bird.flap(env.config.flap_velocity)
+        if spawner.should_spawn(tick=tick, world=world):
+            world.pipes.append(spawner.make_pipe(world=world, rng=rng))
+        advance_world(world, gravity=env.config.gravity)
+
+        same, _, done, info = env.step(action)
+        assert same is obs
+        assert not done
+        assert obs[OBS_BIRD_Y] == world.bird.y
+        assert obs[OBS_BIRD_VY] == world.bird.vy
+
+    assert world.score == 1
+    pipe = world.pipes[1]
+    assert obs[OBS_PIPE1] == pipe.x - world.bird.x
+    assert obs[OBS_PIPE1 + 1] == pipe.gap_y
+    assert obs[OBS_PIPE1 + 2] == pipe.gap_y + pipe.gap_h
+    assert obs[OBS_PIPE2] == env.config.width
+    assert info["tick"] == 30
+
+
+def test_episode_ends_when_bird_falls():
+    env = make_env()
+    env.reset(seed=1)
+
+    done = False
+    steps = 0
+    while not done:
+        _, reward, done, _ = env.step(0)
+        steps += 1
+
+    assert reward == env.death_reward
+    assert steps < 20
+
+
+def test_grid_observation_reuses_one_buffer():
+    env = make_env(grid=True)
+    env.reset(seed=2)
+    buf = env.grid_obs
+
+    for _ in range(3):
+        env.step(1 if env.world.bird.vy > 0 else 0)
+
+    assert env.grid_obs is buf
+    assert len(buf) == 30 * 14
+    assert buf.count(BIRD) == 1
+    assert buf.count(PIPE) == 14 - env.world.pipes[0].gap_h
@@ -0,0 +1,52 @@
+from flappy_cli.config import GameMode
+from flappy_cli.evaluate import EvalSummary, GameResult, evaluate, gap_policy, never_flap, play_headless
+from flappy_cli.strategy import FixedIntervalSpawner
+
+
+def test_never_flap_dies_quickly_with_zero_score():
+    result = play_headless(never_flap, seed=1)
+    assert result.score == 0
+    assert 0 < result.ticks < 20
+
+
+def test_custom_spawner_is_used():
+    wide = play_headless(gap_policy, seed=3, spawner=FixedIntervalSpawner(interval_ticks=10, gap_h=20), max_ticks=300)
+    assert wide.ticks == 300
+    assert wide.score > 0
+
+
+def test_custom_spawner_drives_every_tick_and_restarts_each_game():
+    class Counting(FixedIntervalSpawner):
+        ticks = []
+
+        def should_spawn(self, *, tick, world):
+            Counting.ticks.append(tick)
+            return FixedIntervalSpawner.should_spawn(self, tick=tick, world=world)
+
+    spawner = Counting(interval_ticks=10, gap_h=20)
+    first = play_headless(gap_policy, seed=3, spawner=spawner, max_ticks=50)
+    assert Counting.ticks == list(range(first.ticks))
+
+    again = play_headless(gap_policy, seed=3, spawner=spawner, max_ticks=50)
+    assert again == first
+
+
+def test_results_do_not_depend_on_worker_count():
+    kwargs = dict(mode=GameMode.HARD, max_ticks=500, chunk_size=5)
+    single = evaluate(gap_policy, range(30), workers=1, **kwargs)
+    pooled = evaluate(gap_policy, range(30), workers=3, **kwargs)
+
+    assert single.games == pooled.games == 30
+    assert single.scores == pooled.scores
+    assert single.total_ticks == pooled.total_ticks
+    assert single.max_score > 0
+
+
+def test_summary_percentile():
+    summary = EvalSummary()
+    for score in [0, 0, 1, 2, 10]:
+        summary.add(GameResult(seed=0, score=score, ticks=1))
+
+    assert summary.percentile(0) == 0
+    assert summary.percentile(50) == 1
+    assert summary.percentile(100) == 10
@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from flappy_cli.config import GameConfig, GameMode
+from flappy_cli.evaluate import play_headless
+from flappy_cli.flock import FlockWorld, gap_flock_policy
+from flappy_cli.io.render import AsciiRenderer
+from flappy_cli.model import Pipe
+
+
+def scripted(bird: int, step: int) -> bool:
+    period = 3 + bird % 5
+    return (step + bird // 5) % period == 0
+
+
+def solo_policy(bird: int):
+    steps = iter(range(1, 1_000_000))
+    return lambda world: scripted(bird, next(steps))
+
+
+@pytest.mark.parametrize("mode,scale", [(GameMode.EASY, 0), (GameMode.HARD, 0), (GameMode.MEDIUM, 100)])
+def test_flock_birds_match_solo_games(mode, scale):
+    config = GameConfig(fixed_point_scale=scale)
+    flock = FlockWorld(size=40, config=config, mode=mode, seed=11)
+
+    flock.step(np.ones(flock.living, dtype=bool))
+    step = 1
+    while not flock.done and flock.tick < 400:
+        flock.step(np.array([scripted(int(b), step) for b in flock.ids], dtype=bool))
+        step += 1
+
+    for bird in range(flock.size):
+        solo = play_headless(solo_policy(bird), seed=11, mode=mode, config=config, max_ticks=400)
+        assert (flock.scores[bird], flock.ticks[bird]) == (solo.score, solo.ticks), bird
+
+
+def test_dead_birds_are_compacted_out():
+    flock = FlockWorld(size=6, config=GameConfig(height=20), seed=1)
+    flock.y[:] = [1.0, 18.0, 5.0, 10.0, 19.5, 0.2]
+    flock.vy[:] = [-1.0, 0.0, 0.0, 0.0, 0.5, -2.0]
+
+    gone = flock.step(np.zeros(6, dtype=bool))
+    assert sorted(gone.tolist()) == [4, 5]
+    assert flock.ids.tolist() == [0, 1, 2, 3]
+    assert flock.living == 4
+    assert flock.alive.tolist() == [True, True, True, True, False, False]
+    assert flock.y.shape == (4,)
+
+
+def test_pipe_column_kills_only_birds_outside_the_gap():
+    flock = FlockWorld(size=3, config=GameConfig(), seed=1)
+    course = flock.course
+    course.pipes.append(Pipe(x=course.bird.x + 1, gap_y=8, gap_h=4))
+    flock.spawner.next_spawn_tick = 10_000
+    flock.y[:] = [3.0, 9.0, 15.0]
+
+    gone = flock.step(np.zeros(3, dtype=bool))
+    assert sorted(gone.tolist()) == [0, 2]
+    assert flock.ids.tolist() == [1]
+
+
+def test_gap_policy_and_flock_rendering():
+    flock = FlockWorld(size=300, mode=GameMode.EASY, seed=3)
+    noise = np.random.default_rng(3)
+    flock.step(np.ones(flock.living, dtype=bool))
+    while not flock.done and flock.tick < 200:
+        flock.step(gap_flock_policy(flock, 0.5, noise))
+    assert flock.living > 0
+
+    renderer = AsciiRenderer(use_colors=False, size=(80, 30), console=False, flock_source=flock.row_counts)
+    cells = renderer.frame_cells(flock.course)
+    top = next(i for i, row in enumerate(cells) if row and row[0] == "▄") + 1
+    column = [row[flock.course.bird.x + 1] for row in cells[top:top + flock.course.height]]
+    counts = flock.row_counts()
+    assert [c != " " for c in column] == [bool(n) for n in counts]
+    assert "◉" in column or max(counts) == 1
@@ -0,0 +1,72 @@
+import os
+import time
+
+from flappy_cli.io.input import EscapeFilter, PosixKeyReader
+
+
+def wait_for(reader: PosixKeyReader, count: int) -> None:
+    deadline = time.monotonic() + 2.0
+    while len(reader.events) < count and time.monotonic() < deadline:
+        time.sleep(0.001)
+
+
+def test_posix_reader_queues_bursts_with_timestamps():
+    r, w = os.pipe()
+    reader = PosixKeyReader(fd=r)
+    try:
+        before = time.monotonic()
+        os.write(w, b"  Q")
+        wait_for(reader, 3)
+
+        events = reader.drain()
+        assert [e.key for e in events] == [" ", " ", "q"]
+        assert all(before <= e.t <= time.monotonic() for e in events)
+        assert reader.read_key() is None
+
+        os.write(w, b"ab")
+        wait_for(reader, 2)
+        assert reader.read_key() == "a"
+        reader.flush()
+        assert reader.read_key() is None
+    finally:
+        reader.close()
+        os.close(r)
+        os.close(w)
+
+
+def test_escape_filter_drops_arrow_and_function_keys():
+    keys = EscapeFilter()
+
+    assert list(keys.feed("\x1b[A\x1b[B\x1b[C\x1b[D")) == []
+    assert list(keys.feed("\x1bOB\x1b[1;5B\x1b[15~ ")) == [" "]
+    assert list(keys.feed("\x1b[")) == []
+    assert list(keys.feed("Bq")) == ["q"]
+
+
+def test_escape_filter_carries_split_sequences_across_reads():
+    keys = EscapeFilter(lone_timeout=0.05)
+
+    assert list(keys.feed("\x1b", 1.0)) == []
+    assert list(keys.feed("[B", 1.01)) == []
+    assert list(keys.feed("\x1bO", 2.0)) == []
+    assert list(keys.feed("B ", 2.2)) == [" "]
+
+    # nothing followed the ESC in time, so it was a lone press
+    assert list(keys.feed("\x1b", 3.0)) == []
+    assert list(keys.feed("[q", 3.5)) == ["[", "q"]
+    assert list(keys.feed("\x1bb", 4.0)) == ["b"]
+
+
+def test_posix_reader_ignores_arrow_keys():
+    r, w = os.pipe()
+    reader = PosixKeyReader(fd=r)
+    try:
+        os.write(w, b"\x1b[B\x1bOB \x1b[A")
+        os.write(w, b"q")
+        wait_for(reader, 2)
+
+        assert [e.key for e in reader.drain()] == [" ", "q"]
+    finally:
+        reader.close()
+        os.close(r)
+        os.close(w)
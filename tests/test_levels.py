@@ -0,0 +1,68 @@
+import pickle
+import random
+
+import pytest
+
+from flappy_cli.autopilot import Autopilot
+from flappy_cli.config import GameConfig, GameMode
+from flappy_cli.evaluate import evaluate, gap_policy, play_headless
+from flappy_cli.levels import LevelPack, compile_course, write_pack
+from flappy_cli.model import Bird, World
+
+
+def _pack(tmp_path, mode, seeds=range(10), horizon=2000):
+    path = tmp_path / f"{mode.value}.fllp"
+    with open(path, "wb") as out:
+        write_pack(out, seeds, mode=mode, horizon=horizon)
+    return LevelPack(str(path))
+
+
+@pytest.mark.parametrize("mode", list(GameMode))
+def test_pack_games_match_rng_games(tmp_path, mode):
+    pack = _pack(tmp_path, mode)
+
+    for seed in range(3):
+        rng_game = play_headless(Autopilot(max_nodes=4096), seed=seed, mode=mode, max_ticks=600)
+        pack_game = play_headless(Autopilot(max_nodes=4096), seed=seed, pack=pack, max_ticks=600)
+        assert pack_game == rng_game
+
+
+def test_course_lookup_and_lookahead(tmp_path):
+    pack = _pack(tmp_path, GameMode.HARD, seeds=range(100, 105), horizon=500)
+    assert len(pack) == 5 and 104 in pack and 105 not in pack
+    assert pack.course(102) == compile_course(102, mode=GameMode.HARD, horizon=500)
+
+    spawner = pack.spawner(102)
+    first = spawner.upcoming(3)
+    assert first == pack.course(102)[:3]
+    assert spawner.peek(1) == first[1]
+
+    world = World(width=45, height=20, bird=Bird(x=6, y=10))
+    assert not spawner.should_spawn(tick=first[0].tick - 1, world=world)
+    assert spawner.should_spawn(tick=first[0].tick, world=world)
+    pipe = spawner.make_pipe(world=world, rng=random.Random())
+    assert (pipe.x, pipe.gap_y, pipe.gap_h) == (44, first[0].gap_y, first[0].gap_h)
+    assert spawner.upcoming(2) == first[1:]
+
+    spawner.reset()
+    assert spawner.peek() == first[0]
+
+    with pytest.raises(KeyError):
+        pack.spawner(99)
+
+
+def test_pack_is_shared_with_worker_processes(tmp_path):
+    pack = _pack(tmp_path, GameMode.MEDIUM, seeds=range(40))
+    assert pickle.loads(pickle.dumps(pack)).course(7) == pack.course(7)
+
+    pooled = evaluate(gap_policy, range(40), pack=pack, workers=2, chunk_size=10, max_ticks=2000)
+    direct = evaluate(gap_policy, range(40), mode=GameMode.MEDIUM, workers=1, max_ticks=2000)
+    assert pooled.scores == direct.scores
+
+
+def test_pack_rejects_mismatched_worlds(tmp_path):
+    pack = _pack(tmp_path, GameMode.EASY, seeds=range(2), horizon=100)
+    with pytest.raises(ValueError):
+        play_headless(gap_policy, seed=0, pack=pack, config=GameConfig(width=60), max_ticks=100)
+    with pytest.raises(ValueError):
+        play_headless(gap_policy, seed=0, pack=pack, max_ticks=101)
@@ -1,4 +1,14 @@
-from flappy_cli.model import Bird, Pipe, World, advance_world, collides
+import random
+
+from fractions import Fraction
+
+import pytest
+
+from flappy_cli.config import GameConfig, make_bird
+
+from flappy_cli.model import (
+    Bird, FixedBird, Pipe, World, WorldHistory, WorldSnapshot, advance_world, collides, collides_pipe, pipe_blocks_cell,
+)
 
 
 def make_world(*, bird_x=5, bird_y=5.0, width=20, height=10) -> World:
@@ -35,6 +45,26 @@ def test_no_collision_with_pipe_when_in_gap():
     assert collides(world) is False
 
 
+def test_pipe_blocked_mask_matches_gap():
+    for gap_y in range(0, 12):
+        for gap_h in range(0, 6):
+            pipe = Pipe(x=3, gap_y=gap_y, gap_h=gap_h)
+            for y in range(-2, 80):
+                expected = not (gap_y <= y < gap_y + gap_h)
+                assert pipe.blocks(y) is expected
+                assert pipe_blocks_cell(pipe, y) is expected
+
+
+def test_pipe_blocked_mask_clips_negative_and_overflowing_gaps():
+    for gap_y in range(-8, 12):
+        for gap_h in range(-2, 12):
+            pipe = Pipe(x=3, gap_y=gap_y, gap_h=gap_h)
+            for y in range(0, 40):
+                expected = not (gap_y <= y < gap_y + gap_h)
+                assert pipe.blocks(y) is expected
+                assert pipe_blocks_cell(pipe, y) is expected
+
+
 def test_score_increments_once_when_pipe_passes_bird():
     world = make_world(bird_x=5, bird_y=5.0)
     pipe = Pipe(x=6, gap_y=0, gap_h=10)  
@@ -57,3 +87,147 @@ def test_offscreen_pipes_removed():
     world.pipes.append(pipe)
     advance_world(world, gravity=0.0)  
     assert len(world.pipes) == 0
+
+
+def test_snapshot_restores_bird_score_and_pipes():
+    world = make_world(bird_y=5.0)
+    world.pipes.append(Pipe(x=0, gap_y=0, gap_h=10))
+    world.pipes.append(Pipe(x=6, gap_y=2, gap_h=3))
+
+    snap = WorldSnapshot()
+    snap.capture(world)
+    advance_world(world, gravity=0.5)
+    advance_world(world, gravity=0.5)
+
+    snap.restore(world)
+    assert world.bird.y == 5.0
+    assert world.bird.vy == 0.0
+    assert world.score == 0
+    assert world.pipes == [Pipe(x=0, gap_y=0, gap_h=10), Pipe(x=6, gap_y=2, gap_h=3)]
+
+
+def test_history_keeps_last_k_ticks_and_rewinds():
+    world = make_world(bird_y=5.0)
+    history = WorldHistory(capacity=3)
+
+    for _ in range(5):
+        history.push(world)
+        advance_world(world, gravity=0.25)
+
+    assert len(history) == 3
+
+    assert history.rewind(world, 2) == 2
+    assert len(history) == 1
+    assert world.bird.vy == 0.75
+
+    assert history.rewind(world, 10) == 1
+    assert world.bird.vy == 0.5
+    assert history.rewind(world) == 0
+
+
+def test_pipe_track_matches_list_semantics():
+    rng = random.Random(4)
+    world = make_world(bird_x=5, width=400)
+    reference = []
+    score = 0
+
+    for tick in range(2000):
+        if tick % 3 == 0:
+            x = rng.randint(0, 399)
+            world.pipes.append(Pipe(x=x, gap_y=2, gap_h=3))
+            reference.append(Pipe(x=x, gap_y=2, gap_h=3))
+
+        advance_world(world, gravity=0.0)
+        for p in reference:
+            p.x -= 1
+        for p in reference:
+            if not p.passed and p.x < 5:
+                p.passed = True
+                score += 1
+        reference = sorted((p for p in reference if p.x >= 0), key=lambda p: p.x)
+
+        assert world.score == score
+        assert list(world.pipes) == reference
+        assert collides_pipe(world) == any(p.x == 5 and not 2 <= 5 < 5 for p in reference)
+
+
+def test_pipe_track_ahead_returns_next_unpassed_pipes():
+    world = make_world(bird_x=5)
+    world.pipes.append(Pipe(x=6, gap_y=0, gap_h=3))
+    world.pipes.append(Pipe(x=12, gap_y=4, gap_h=3))
+
+    assert world.pipes.ahead().x == 6
+    advance_world(world, gravity=0.0)
+    advance_world(world, gravity=0.0)
+
+    assert world.pipes.ahead().x == 10
+    assert world.pipes.ahead(1) is None
+
+
+def test_fixed_point_bird_is_exact_and_tracks_float_mode():
+    config = GameConfig(fixed_point_scale=100)
+    gravity = Fraction(1, 4)
+    flap = Fraction(-8, 5)
+    near_boundary = 0
+
+    for seed in range(200):
+        rng = random.Random(seed)
+        fixed = make_bird(config)
+        loose = Bird(x=config.bird_x, y=config.height // 2)
+        y, vy = Fraction(config.height // 2), Fraction(0)
+
+        assert isinstance(fixed, FixedBird)
+        for _ in range(300):
+            if rng.random() < 0.12 + 0.3 * (y > 12):
+                fixed.flap(config.flap_velocity)
+                loose.flap(config.flap_velocity)
+                vy = flap
+            for b in (fixed, loose):
+                b.apply_gravity(config.gravity)
+                b.step()
+            vy += gravity
+            y += vy
+
+            assert fixed.qy == y * 100 and fixed.qvy == vy * 100
+            assert fixed.cell_y == int(y)
+            if loose.cell_y != fixed.cell_y:
+                assert abs(loose.y - round(loose.y)) < 1e-9
+                near_boundary += 1
+            if not -1 < y < config.height:
+                break
+
+    assert near_boundary > 0
+
+
+def test_fixed_point_rejects_unrepresentable_constants():
+    with pytest.raises(ValueError):
+        make_bird(GameConfig(fixed_point_scale=8))
+
+
+def test_rewind_keeps_scroll_offset_cursor_and_pipe_objects():
+    world = make_world(bird_x=5, width=30)
+    world.pipes.append(Pipe(x=6, gap_y=0, gap_h=10))
+    world.pipes.append(Pipe(x=14, gap_y=2, gap_h=3))
+    history = WorldHistory(capacity=8)
+
+    for _ in range(3):
+        advance_world(world, gravity=0.0)
+    assert world.pipes.ahead().x == 11
+
+    history.push(world)
+    before = [id(p) for p in world.pipes]
+    advance_world(world, gravity=0.0)
+    history.rewind(world)
+
+    assert world.pipes.offset == 3
+    assert world.pipes.ahead().x == 11 and world.pipes.ahead(1) is None
+    assert [id(p) for p in world.pipes] == before
+    assert world.pipes == [Pipe(x=3, gap_y=0, gap_h=10, passed=True), Pipe(x=11, gap_y=2, gap_h=3)]
+
+
+def test_reset_skips_pipes_behind_the_bird():
+    world = make_world(bird_x=5)
+    world.pipes.reset([Pipe(x=2, gap_y=0, gap_h=3), Pipe(x=8, gap_y=0, gap_h=3)], offset=40, bird_x=5)
+
+    assert world.pipes.offset == 40
+    assert world.pipes.ahead().x == 8
@@ -0,0 +1,161 @@
+import io
+import json
+import random
+
+from flappy_cli.__main__ import main
+from flappy_cli.autopilot import Autopilot
+from flappy_cli.config import GameConfig, GameMode, make_bird, make_spawner
+from flappy_cli.game.core import Game
+from flappy_cli.game.states import PlayingState
+from flappy_cli.game.telemetry import FrameProfiler
+from flappy_cli.io.input import NullKeyReader
+from flappy_cli.io.record import AsciicastRenderer, DeltaRecorder, iter_recording
+from flappy_cli.model import World
+from flappy_cli.replay import ReplayRecorder
+
+
+def autopilot_game(renderer, seed: int = 3) -> Game:
+    config = GameConfig(seed=seed)
+    game = Game(
+        world=World(width=config.width, height=config.height, bird=make_bird(config)),
+        spawner=make_spawner(GameMode.MEDIUM),
+        mode=GameMode.MEDIUM,
+        config=config,
+        renderer=renderer,
+        keys=NullKeyReader(),
+        rng=random.Random(seed),
+        autopilot=Autopilot(config=config),
+    )
+    game.set_state(PlayingState())
+    return game
+
+
+def test_asciicast_and_delta_recordings_replay_to_the_same_screen(apply_to_screen):
+    cast = io.StringIO()
+    native = io.BytesIO()
+    a = AsciicastRenderer(cast, frame_time=0.05)
+    b = DeltaRecorder(native, frame_time=0.05, keyframe_every=100, sync_every=16)
+
+    class Both:
+        def render(self, world, *, message=""):
+            a.render(world, message=message)
+            b.render(world, message=message)
+
+    game = autopilot_game(Both())
+    for _ in range(400):
+        game.step_once(None)
+    a.close()
+    b.close()
+
+    lines = cast.getvalue().splitlines()
+    header = json.loads(lines[0])
+    assert header["version"] == 2
+    # a 45x20 board in its border, under the score and a 3-line message
+    assert (header["width"], header["height"]) == (47, 26)
+
+    events = [json.loads(line) for line in lines[1:]]
+    times = [e[0] for e in events]
+    assert times == sorted(times)
+    assert times[-1] == round(399 * 0.05, 6)
+
+    cast_screen: dict = {}
+    for _, kind, data in events:
+        assert kind == "o"
+        apply_to_screen(cast_screen, data)
+
+    native.seek(0)
+    frames = list(iter_recording(native))
+    assert len(frames) == 400
+    assert [f.index for f in frames if f.keyframe] == [0, 100, 200, 300]
+
+    native_screen: dict = {}
+    for f in frames:
+        apply_to_screen(native_screen, f.data)
+
+    assert native_screen == cast_screen
+    assert len(native.getvalue()) < len(cast.getvalue()) // 4
+
+
+def test_delta_recorder_streams_incrementally():
+    out = io.BytesIO()
+    recorder = DeltaRecorder(out, sync_every=8)
+    game = autopilot_game(recorder)
+
+    sizes = []
+    for _ in range(64):
+        game.step_once(None)
+        sizes.append(len(out.getvalue()))
+
+    assert sizes[7] < sizes[15] < sizes[31] < sizes[63]
+
+
+class FlapEvery:
+    def __init__(self, n: int) -> None:
+        self.n = n
+        self.frame = 0
+
+    def read_key(self):
+        self.frame += 1
+        return " " if self.frame % self.n == 0 else None
+
+    def flush(self):
+        return
+
+
+def test_replay_exports_headless(tmp_path):
+    config = GameConfig(seed=5)
+    game = autopilot_game(None, seed=5)
+    game.autopilot = None
+    game.keys = FlapEvery(5)
+    game.renderer = AsciicastRenderer(io.StringIO())
+    replay_path = tmp_path / "run.flrp"
+    with open(replay_path, "wb") as f:
+        recorder = ReplayRecorder(game, f)
+        for _ in range(300):
+            game.step_once(game.keys.read_key())
+        recorder.close()
+
+    main(["--replay", str(replay_path), "--export", str(tmp_path / "run.cast")])
+    main(["--replay", str(replay_path), "--export", str(tmp_path / "run.flcr")])
+
+    events = (tmp_path / "run.cast").read_text(encoding="utf-8").splitlines()[1:]
+    assert json.loads(events[-1])[0] <= 300 / config.sim_hz
+    with open(tmp_path / "run.flcr", "rb") as f:
+        assert sum(1 for _ in iter_recording(f)) > 0
+
+
+def test_timestamps_follow_the_tick_clock_across_skipped_frames():
+    cast = io.StringIO()
+    native = io.BytesIO()
+    game = autopilot_game(None)
+    a = AsciicastRenderer(cast, frame_time=0.05, ticks=lambda: game.steps)
+    b = DeltaRecorder(native, frame_time=0.05, ticks=lambda: game.steps)
+
+    for _ in range(40):
+        game.sim_step()
+        if game.steps % 4 == 0:
+            a.render(game.world, message="PLAYING")
+            b.render(game.world, message="PLAYING")
+    a.close()
+    b.close()
+
+    times = [json.loads(line)[0] for line in cast.getvalue().splitlines()[1:]]
+    assert times == [round(k * 0.2, 6) for k in range(1, 11)]
+
+    native.seek(0)
+    assert [round(f.t, 6) for f in iter_recording(native)] == times
+
+
+def test_declared_height_includes_the_telemetry_hud(apply_to_screen):
+    cast = io.StringIO()
+    renderer = AsciicastRenderer(cast)
+    game = autopilot_game(renderer)
+    FrameProfiler().attach(game, hud=True)
+
+    game.step_once(None)
+    renderer.close()
+
+    header, event = cast.getvalue().splitlines()[:2]
+    screen: dict = {}
+    apply_to_screen(screen, json.loads(event)[2])
+    assert json.loads(header)["height"] == max(row for row, _ in screen) == 20 + 2 + 1 + 3 + 2
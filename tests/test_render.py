@@ -0,0 +1,75 @@
+import io
+
+from flappy_cli.io import render
+from flappy_cli.io.render import AsciiRenderer
+from flappy_cli.model import Bird, Pipe, World, advance_world
+
+
+def make_world() -> World:
+    world = World(width=20, height=8, bird=Bird(x=5, y=4.0))
+    world.pipes.append(Pipe(x=12, gap_y=2, gap_h=3))
+    return world
+
+
+def make_renderer() -> tuple[AsciiRenderer, io.StringIO]:
+    out = io.StringIO()
+    renderer = AsciiRenderer(clear_once=False, diff=True, stream=out)
+    renderer._term = (40, 20)
+    renderer._watching_resize = True
+    renderer._term_generation = render._resize_generation
+    renderer._initialized = True
+    return renderer, out
+
+
+def test_diff_render_of_unchanged_frame_writes_nothing():
+    renderer, out = make_renderer()
+    world = make_world()
+
+    renderer.render(world, message="PLAYING")
+    first = len(out.getvalue())
+
+    renderer.render(world, message="PLAYING")
+    assert len(out.getvalue()) == first
+
+
+def test_diff_render_matches_full_redraw(apply_to_screen):
+    renderer, out = make_renderer()
+    world = make_world()
+
+    screen: dict = {}
+    for _ in range(6):
+        advance_world(world, gravity=0.25)
+        start = len(out.getvalue())
+        renderer.render(world, message="PLAYING")
+        apply_to_screen(screen, out.getvalue()[start:])
+
+    fresh, fresh_out = make_renderer()
+    fresh.render(world, message="PLAYING")
+    expected: dict = {}
+    apply_to_screen(expected, fresh_out.getvalue())
+
+    assert screen == expected
+    assert len(out.getvalue()) - start < len(fresh_out.getvalue()) // 5
+    assert renderer.last_cells == fresh.frame_cells(world, message="PLAYING")
+
+    full = AsciiRenderer(clear_once=False, stream=io.StringIO())
+    full.render(world, message="PLAYING")
+    assert full.last_cells is None
+
+
+def test_row_templates_match_per_cell_drawing_on_tall_boards():
+    renderer = AsciiRenderer(use_colors=False, size=(120, 90))
+    theme = renderer._theme()
+    world = World(width=60, height=70, bird=Bird(x=5, y=33.0))
+    for x, gap_y in ((-1, 3), (8, 30), (9, 2), (30, 60), (59, 0), (60, 10)):
+        world.pipes.append(Pipe(x=x, gap_y=gap_y, gap_h=6))
+
+    grid = renderer._build_grid(world, theme)
+
+    for y in range(world.height):
+        for x in range(world.width):
+            blocked = any(p.x == x and p.blocks(y) for p in world.pipes)
+            if (x, y) == (5, 33):
+                assert grid[y][x] == theme.bird
+            else:
+                assert grid[y][x] == (theme.pipe if blocked else theme.sky)
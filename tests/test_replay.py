@@ -0,0 +1,136 @@
+import io
+import random
+
+from dataclasses import dataclass, field
+
+import pytest
+
+from flappy_cli.config import GameConfig, GameMode, make_bird, make_spawner
+from flappy_cli.evaluate import gap_policy
+from flappy_cli.game.core import Game
+from flappy_cli.game.states import GameOverState
+from flappy_cli.io.render import NullRenderer
+from flappy_cli.model import FixedBird, World
+from flappy_cli.replay import Replay, ReplayPlayer, ReplayRecorder
+
+
+@dataclass
+class ScriptedKeyReader:
+    keys: dict = field(default_factory=dict)
+    frame: int = 0
+
+    def read_key(self):
+        key = self.keys.get(self.frame)
+        self.frame += 1
+        return key
+
+    def flush(self):
+        return
+
+
+def record_game(frames: int, keys: dict, snapshot_every: int, scale: int = 0, autopilot=None) -> tuple[Game, bytes]:
+    config = GameConfig(width=30, height=14, bird_x=5, seed=42, fixed_point_scale=scale)
+    game = Game(
+        world=World(width=30, height=14, bird=make_bird(config)),
+        spawner=make_spawner(GameMode.MEDIUM),
+        mode=GameMode.MEDIUM,
+        config=config,
+        renderer=NullRenderer(),
+        keys=ScriptedKeyReader(keys),
+        rng=random.Random(config.seed),
+        autopilot=autopilot,
+    )
+
+    out = io.BytesIO()
+    recorder = ReplayRecorder(game, out, snapshot_every=snapshot_every)
+    for _ in range(frames):
+        game.step_once(game.keys.read_key())
+    recorder.close()
+
+    return game, out.getvalue()
+
+
+def flap_script() -> dict:
+    rng = random.Random(1)
+    keys = {f: " " for f in range(400) if rng.random() < 0.25}
+    keys.update({f: "r" for f in range(0, 400, 40)})
+    keys.update({f + 1: " " for f in range(0, 400, 40)})
+    keys[0] = "2"
+    return keys
+
+
+def test_replay_reproduces_recorded_game():
+    game, data = record_game(300, flap_script(), snapshot_every=32)
+
+    replay = Replay.parse(data)
+    player = ReplayPlayer(replay)
+    player.play_to_end()
+
+    assert replay.mode == GameMode.MEDIUM
+    assert player.game.tick == game.tick
+    assert player.game.world.bird.y == game.world.bird.y
+    assert player.game.world.pipes == game.world.pipes
+
+
+def test_fixed_point_replay_round_trips():
+    game, data = record_game(300, flap_script(), snapshot_every=32, scale=100)
+
+    replay = Replay.parse(data)
+    player = ReplayPlayer(replay)
+    player.seek(150)
+    player.play_to_end()
+
+    assert replay.config.fixed_point_scale == 100
+    assert isinstance(player.game.world.bird, FixedBird)
+    assert player.game.world.bird == game.world.bird
+
+
+def test_replay_seek_matches_linear_playback():
+    _, data = record_game(300, flap_script(), snapshot_every=32)
+    replay = Replay.parse(data)
+
+    linear = ReplayPlayer(replay)
+    for _ in range(150):
+        linear.step()
+
+    seeking = ReplayPlayer(replay)
+    seeking.seek(280)
+    seeking.seek(150)
+
+    assert seeking.frame == 150
+    assert seeking.game.tick == linear.game.tick
+    assert seeking.game.world.bird.y == linear.game.world.bird.y
+    assert seeking.game.world.pipes == linear.game.world.pipes
+    assert type(seeking.game.state) is type(linear.game.state)
+
+
+def test_replay_detects_divergence():
+    _, data = record_game(120, flap_script(), snapshot_every=1000)
+    replay = Replay.parse(data)
+    replay.final_tick += 1
+
+    with pytest.raises(ValueError):
+        ReplayPlayer(replay).play_to_end()
+
+
+def test_replay_rejects_other_versions():
+    _, data = record_game(10, flap_script(), snapshot_every=1000)
+    Replay.parse(data)
+
+    with pytest.raises(ValueError, match="version"):
+        Replay.parse(data[:4] + bytes([data[4] + 1]) + data[5:])
+
+
+def test_autopilot_replay_records_flaps_and_ignores_overridden_space():
+    keys = {f: " " for f in range(400)}
+    keys[0] = "2"
+    game, data = record_game(300, keys, snapshot_every=1000, autopilot=gap_policy)
+    assert game.autopilot is gap_policy
+
+    replay = Replay.parse(data)
+    player = ReplayPlayer(replay)
+    player.play_to_end()
+
+    assert player.game.tick == game.tick
+    assert player.game.world.bird.y == game.world.bird.y
+    assert player.game.world.score == game.world.score
@@ -0,0 +1,113 @@
+import multiprocessing
+
+import pytest
+
+from flappy_cli.config import GameMode
+from flappy_cli.evaluate import evaluate, gap_policy
+from flappy_cli.results import HEADER, RECORD, GameRecord, ResultsStore, ResultsWriter
+
+
+def _record(seed, score, *, mode=GameMode.EASY, timestamp=0.0):
+    return GameRecord(seed=seed, mode=mode, score=score, ticks=score * 10, duration=0.5, timestamp=timestamp)
+
+
+def _append_many(path, start, count):
+    writer = ResultsWriter(path, batch_size=7)
+    for i in range(start, start + count):
+        writer.append(_record(i, i % 50))
+    writer.close()
+
+
+def test_records_round_trip_through_the_mapped_file(tmp_path):
+    path = str(tmp_path / "results.flrs")
+    writer = ResultsWriter(path, batch_size=2)
+    writer.append(_record(7, 3))
+    writer.append(_record(None, 5, mode=GameMode.HARD, timestamp=12.5))
+    writer.append(_record(9, 1))
+
+    store = ResultsStore(path)
+    assert len(store) == 2
+
+    writer.close()
+    assert store.refresh() == 3
+
+    assert store[0] == _record(7, 3)
+    assert store[1] == _record(None, 5, mode=GameMode.HARD, timestamp=12.5)
+    assert store[-1].seed == 9
+    with pytest.raises(IndexError):
+        store[3]
+
+
+def test_top_k_and_percentiles_match_a_plain_sort(tmp_path):
+    path = str(tmp_path / "results.flrs")
+    writer = ResultsWriter(path)
+    modes = list(GameMode)
+    records = [_record(i, (i * 37) % 101, mode=modes[i % 3], timestamp=float(i)) for i in range(500)]
+    for r in records:
+        writer.append(r)
+    writer.close()
+
+    store = ResultsStore(path)
+    expected = sorted(records, key=lambda r: (-r.score, r.timestamp))
+    assert store.top_k(10) == expected[:10]
+    assert store.top_k(1000) == expected
+
+    hard = [r for r in expected if r.mode == GameMode.HARD]
+    assert store.top_k(5, mode=GameMode.HARD) == hard[:5]
+
+    scores = sorted(r.score for r in records)
+    for q in (0, 50, 90, 100):
+        assert store.percentile(q) == scores[int(q / 100 * (len(scores) - 1))]
+
+
+def test_concurrent_writers_never_interleave_records(tmp_path):
+    path = str(tmp_path / "results.flrs")
+    ctx = multiprocessing.get_context("spawn")
+    procs = [ctx.Process(target=_append_many, args=(path, n * 1000, 300)) for n in range(4)]
+    for p in procs:
+        p.start()
+    for p in procs:
+        p.join()
+
+    store = ResultsStore(path)
+    assert len(store) == 1200
+    assert (tmp_path / "results.flrs").stat().st_size == HEADER.size + 1200 * RECORD.size
+    assert sorted(store[i].seed for i in range(len(store))) == sorted(
+        n * 1000 + i for n in range(4) for i in range(300)
+    )
+
+
+def test_evaluate_appends_every_game(tmp_path):
+    path = str(tmp_path / "results.flrs")
+    summary = evaluate(gap_policy, range(20), workers=1, max_ticks=300, results_path=path)
+
+    store = ResultsStore(path)
+    assert len(store) == 20
+    assert sorted(store[i].seed for i in range(20)) == list(range(20))
+    assert store.top_k(1)[0].score == summary.max_score
+    assert store.percentile(50) == summary.percentile(50)
+
+
+def test_refresh_unmaps_the_previous_mapping(tmp_path):
+    path = str(tmp_path / "results.flrs")
+    writer = ResultsWriter(path, batch_size=1)
+
+    with ResultsStore(path) as store:
+        maps = []
+        for i in range(20):
+            writer.append(_record(i, i))
+            assert store.refresh() == i + 1
+            maps.append(store._map)
+
+        assert all(m.closed for m in maps[:-1])
+        assert store.top_k(1)[0].seed == 19
+
+        # a view the caller still holds outlives the next remap
+        held = store.rows()
+        writer.append(_record(20, 20))
+        assert store.refresh() == 21
+        assert list(held["seed"]) == list(range(20))
+        last = store._map
+
+    assert last.closed and len(store) == 0
+    writer.close()
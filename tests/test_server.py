@@ -0,0 +1,119 @@
+import asyncio
+
+from flappy_cli.config import GameConfig
+from flappy_cli.model import Bird, World
+from flappy_cli.server import SessionHub, StreamRenderer, TelnetFilter, serve
+
+
+class FakeTransport:
+    def __init__(self) -> None:
+        self.buffered = 0
+
+    def is_closing(self) -> bool:
+        return False
+
+    def get_write_buffer_size(self) -> int:
+        return self.buffered
+
+
+class FakeWriter:
+    def __init__(self) -> None:
+        self.transport = FakeTransport()
+        self.chunks = []
+
+    def write(self, data: bytes) -> None:
+        self.chunks.append(data)
+
+
+def test_telnet_filter_removes_option_negotiation():
+    assert TelnetFilter().feed(b"\xff\xfd\x01 q") == b" q"
+    assert TelnetFilter().feed(b"abc") == b"abc"
+
+
+def test_telnet_filter_keeps_escaped_iac():
+    assert TelnetFilter().feed(b"a\xff\xffb") == b"a\xffb"
+
+
+def test_telnet_filter_removes_two_byte_commands():
+    assert TelnetFilter().feed(b"\xff\xf1 \xff\xf9q") == b" q"
+
+
+def test_telnet_filter_removes_subnegotiation():
+    data = b"\xff\xfa\x18\x00xterm\xff\xff\xff\xf0 q"
+    assert TelnetFilter().feed(data) == b" q"
+
+
+def test_telnet_filter_carries_state_across_reads():
+    telnet = TelnetFilter()
+    assert telnet.feed(b" \xff") == b" "
+    assert telnet.feed(b"\xfa\x1f\x00P") == b""
+    assert telnet.feed(b"\x00\x1e\xff") == b""
+    assert telnet.feed(b"\xf0q\xff\xfb") == b"q"
+    assert telnet.feed(b"\x01b") == b"b"
+
+
+def test_renderer_drops_frames_under_backpressure_and_resyncs():
+    writer = FakeWriter()
+    renderer = StreamRenderer(writer, high_water=100, size=(40, 20))
+    world = World(width=20, height=10, bird=Bird(x=4, y=5.0))
+
+    renderer.render(world, message="a")
+    renderer.render(world, message="a")
+    assert len(writer.chunks) == 1
+
+    world.bird.y = 3.0
+    renderer.render(world, message="a")
+    assert renderer.frames_sent == 3
+    assert len(writer.chunks[1]) < len(writer.chunks[0])
+
+    writer.transport.buffered = 1000
+    renderer.render(world, message="a")
+    assert renderer.frames_dropped == 1
+    assert len(writer.chunks) == 2
+    assert renderer.inner.last_cells is None
+
+    writer.transport.buffered = 0
+    renderer.render(world, message="a")
+    assert len(writer.chunks[2]) > len(writer.chunks[1])
+
+
+def test_hub_serves_concurrent_sessions_on_one_clock():
+    async def client(port: int) -> bytes:
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        writer.write(b" ")
+        await writer.drain()
+
+        received = b""
+        while len(received) < 2000:
+            received += await reader.read(4096)
+
+        writer.write(b"q")
+        await writer.drain()
+        received += await reader.read()
+        writer.close()
+        return received
+
+    async def scenario() -> tuple[list, SessionHub]:
+        config = GameConfig(seed=3, sim_rate=200, render_rate=100)
+        server, hub = await serve("127.0.0.1", 0, config=config)
+        port = server.sockets[0].getsockname()[1]
+        runner = asyncio.create_task(hub.run())
+
+        try:
+            results = await asyncio.wait_for(asyncio.gather(*(client(port) for _ in range(20))), 10.0)
+            while hub.sessions:
+                await asyncio.sleep(0.01)
+        finally:
+            hub.running = False
+            await runner
+            server.close()
+            await server.wait_closed()
+
+        return results, hub
+
+    results, hub = asyncio.run(scenario())
+
+    assert len(results) == 20
+    assert all(len(r) >= 2000 for r in results)
+    assert hub.ticks > 0
+    assert hub.sessions == []
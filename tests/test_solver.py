@@ -0,0 +1,98 @@
+import pytest
+
+from flappy_cli.config import GameConfig, GameMode
+from flappy_cli.evaluate import play_headless
+from flappy_cli.levels import compile_course
+from flappy_cli.model import FixedBird, Pipe, World, collides, move_pipes_left, remove_offscreen_pipes
+from flappy_cli.solver import analyze_batch, analyze_course, analyze_seed, audit, witness
+from flappy_cli.strategy import FixedIntervalSpawner
+
+
+TIGHT = FixedIntervalSpawner(interval_ticks=10, gap_h=3)
+
+
+def _brute_force(course, config, horizon):
+    scale = config.fixed_point_scale
+    world = World(width=config.width, height=config.height, bird=FixedBird(x=config.bird_x, qy=0, scale=scale))
+    spawns = {entry.tick: entry for entry in course}
+    states = {((config.height // 2) * scale, 0)}
+
+    for tick in range(horizon):
+        entry = spawns.get(tick)
+        if entry is not None:
+            world.pipes.append(Pipe(x=world.width - 1, gap_y=entry.gap_y, gap_h=entry.gap_h))
+        move_pipes_left(world)
+        remove_offscreen_pipes(world)
+
+        survivors = set()
+        for qy, qvy in states:
+            for flap in ((True,) if tick == 0 else (True, False)):
+                bird = FixedBird(x=config.bird_x, qy=qy, qvy=qvy, scale=scale)
+                if flap:
+                    bird.flap(config.flap_velocity)
+                bird.apply_gravity(config.gravity)
+                bird.step()
+
+                world.bird = bird
+                if not collides(world):
+                    survivors.add((bird.qy, bird.qvy))
+
+        if not survivors:
+            return tick
+        states = survivors
+
+    return None
+
+
+def test_verdicts_match_exhaustive_search():
+    config = GameConfig(fixed_point_scale=100)
+
+    outcomes = set()
+    for seed in range(6):
+        course = compile_course(seed, mode=GameMode.HARD, config=config, horizon=200, spawner=TIGHT)
+        verdict = analyze_course(course, config=config, horizon=200)
+
+        assert verdict.dead_tick == _brute_force(course, config, 200)
+        outcomes.add(verdict.survivable)
+
+    assert outcomes == {True, False}
+
+
+@pytest.mark.parametrize("scale", [0, 100])
+def test_witness_survives_a_real_game(scale):
+    config = GameConfig(fixed_point_scale=scale)
+
+    for seed in range(3):
+        course = compile_course(seed, mode=GameMode.HARD, config=config, horizon=600)
+        flaps = witness(course, config=config, horizon=600)
+        assert flaps is not None and flaps[0]
+
+        moves = iter(flaps[1:])
+        result = play_headless(lambda world: next(moves), seed=seed, mode=GameMode.HARD, config=config, max_ticks=600)
+        assert result.ticks == 600
+
+
+def test_impossible_course_has_no_witness():
+    verdict = analyze_seed(0, mode=GameMode.HARD, horizon=200, spawner=TIGHT)
+    assert not verdict.survivable
+    assert verdict.dead_tick is not None and verdict.pipe is not None
+
+    course = compile_course(0, mode=GameMode.HARD, horizon=200, spawner=TIGHT)
+    assert witness(course, horizon=200) is None
+
+
+def test_batch_matches_single_course_analysis():
+    seeds = range(20)
+    courses = [compile_course(seed, mode=GameMode.HARD, horizon=200, spawner=TIGHT) for seed in seeds]
+
+    batch = analyze_batch(courses, horizon=200, seeds=seeds)
+    assert batch == [analyze_course(c, horizon=200, seed=s) for s, c in zip(seeds, courses)]
+    assert any(v.survivable for v in batch) and not all(v.survivable for v in batch)
+    assert analyze_batch([], horizon=200) == []
+
+
+def test_audit_keeps_seed_order():
+    verdicts = list(audit(range(10, 30), mode=GameMode.HARD, horizon=200, spawner=TIGHT, workers=1, chunk_size=8))
+
+    assert [v.seed for v in verdicts] == list(range(10, 30))
+    assert verdicts == [analyze_seed(s, mode=GameMode.HARD, horizon=200, spawner=TIGHT) for s in range(10, 30)]
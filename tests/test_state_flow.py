@@ -1,11 +1,13 @@
 import random
 
+from dataclasses import dataclass
+
 from flappy_cli.config import GameConfig, GameMode, make_spawner
 from flappy_cli.game.core import Game
 from flappy_cli.game.states import StartState, PlayingState, GameOverState
 from flappy_cli.io.input import NullKeyReader
 from flappy_cli.io.render import NullRenderer
-from flappy_cli.model import Bird, World
+from flappy_cli.model import Bird, Pipe, World
 
 
 def make_test_game() -> Game:
@@ -44,3 +46,85 @@ def test_playing_to_gameover_on_collision_out_of_bounds():
     game.step_once(None)
 
     assert isinstance(game.state, GameOverState)
+
+
+def test_pipe_collision_rolls_back_to_pre_move_world():
+    game = make_test_game()
+    game.set_state(PlayingState())
+    game.tick = 5
+    game.spawner.next_spawn_tick = 100
+
+    game.world.pipes.append(Pipe(x=6, gap_y=0, gap_h=2))
+    game.step_once(None)
+
+    assert isinstance(game.state, GameOverState)
+    assert game.world.bird.y == 5.0
+    assert game.world.pipes == [Pipe(x=6, gap_y=0, gap_h=2)]
+
+
+@dataclass
+class FakeClock:
+    now: float = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, delay: float) -> None:
+        self.now += delay
+
+
+@dataclass
+class CountingState:
+    stop_after: int
+    stall_on_update: int = -1
+    stall: float = 0.0
+    clock: FakeClock = None
+    updates: int = 0
+    renders: int = 0
+
+    def handle_input(self, game, key):
+        return
+
+    def update(self, game):
+        self.updates += 1
+        if self.updates == self.stall_on_update:
+            self.clock.now += self.stall
+        if self.updates >= self.stop_after:
+            game.is_running = False
+
+    def render(self, game):
+        self.renders += 1
+
+
+def make_timed_game(**config) -> tuple[Game, FakeClock]:
+    game = make_test_game()
+    clock = FakeClock()
+    game.config = GameConfig(width=20, height=10, bird_x=5, **config)
+    game.clock = clock
+    game.sleep = clock.sleep
+    return game, clock
+
+
+def test_fixed_timestep_decouples_sim_and_render_rates():
+    game, clock = make_timed_game(sim_rate=60, render_rate=20)
+    state = CountingState(stop_after=120)
+    game.set_state(state)
+
+    game.run()
+
+    assert state.updates == 120
+    assert abs(clock.now - 2.0) < 0.05
+    assert 38 <= state.renders <= 41
+
+
+def test_fixed_timestep_catches_up_after_stall_and_skips_render():
+    game, clock = make_timed_game(fps=20, max_catch_up=5)
+    state = CountingState(stop_after=40, stall_on_update=10, stall=0.2)
+    state.clock = clock
+    game.set_state(state)
+
+    game.run()
+
+    assert state.updates == 40
+    assert game.frames_skipped >= 1
+    assert clock.now <= 39 / 20 + 1e-9
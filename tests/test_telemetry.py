@@ -0,0 +1,94 @@
+import io
+import json
+import random
+
+import pytest
+
+from flappy_cli.config import GameConfig, GameMode, make_spawner
+from flappy_cli.game.core import Game
+from flappy_cli.game.telemetry import PHASE_RENDER, PHASE_SLEEP, PHASE_UPDATE, FrameProfiler
+from flappy_cli.io.broadcast import BroadcastRenderer
+from flappy_cli.io.input import NullKeyReader
+from flappy_cli.io.render import AsciiRenderer
+from flappy_cli.io.threaded import ThreadedRenderer
+from flappy_cli.model import Bird, World
+
+
+class StepClock:
+    def __init__(self, step: float) -> None:
+        self.now = 0.0
+        self.step = step
+
+    def __call__(self) -> float:
+        self.now += self.step
+        return self.now
+
+
+def make_game(renderer) -> Game:
+    return Game(
+        world=World(width=20, height=10, bird=Bird(x=5, y=5.0)),
+        spawner=make_spawner(GameMode.EASY),
+        mode=GameMode.EASY,
+        config=GameConfig(width=20, height=10, bird_x=5),
+        renderer=renderer,
+        keys=NullKeyReader(),
+        rng=random.Random(1),
+    )
+
+
+def test_profiler_records_phases_bytes_and_hud():
+    out = io.StringIO()
+    renderer = AsciiRenderer(clear_once=False, diff=True, stream=out)
+    game = make_game(renderer)
+
+    profiler = FrameProfiler(clock=StepClock(0.001))
+    profiler.attach(game, hud=True)
+
+    for key in [" ", None, None]:
+        game.step_once(key)
+
+    assert profiler.phases[PHASE_UPDATE].count == 3
+    assert profiler.phases[PHASE_RENDER].count == 3
+    assert profiler.frames == 3
+    assert sum(profiler.histogram) == 2
+    assert profiler.bytes_written == len(out.getvalue().encode("utf-8"))
+    assert "late 0" in out.getvalue()
+
+
+@pytest.mark.parametrize("wrap", [
+    lambda inner: BroadcastRenderer(local=inner),
+    lambda inner: ThreadedRenderer(inner=inner),
+    lambda inner: ThreadedRenderer(inner=BroadcastRenderer(local=inner)),
+])
+def test_profiler_counts_bytes_below_renderer_wrappers(wrap):
+    out = io.StringIO()
+    renderer = wrap(AsciiRenderer(clear_once=False, diff=True, stream=out, console=False, size=(80, 30)))
+    game = make_game(renderer)
+
+    profiler = FrameProfiler(clock=StepClock(0.001))
+    profiler.attach(game)
+
+    for key in [" ", None, None]:
+        game.step_once(key)
+    if isinstance(renderer, ThreadedRenderer):
+        renderer.close()
+
+    assert out.getvalue()
+    assert profiler.bytes_written == len(out.getvalue().encode("utf-8"))
+
+
+def test_profiler_counts_oversleep_and_exports_json_lines():
+    export = io.StringIO()
+    profiler = FrameProfiler(clock=StepClock(0.4), export=export, export_every=1.0)
+
+    profiler.slept(0.010, 0.011)
+    profiler.slept(0.010, 0.030)
+    for _ in range(5):
+        profiler.frame_presented()
+
+    assert profiler.oversleeps == 1
+    assert profiler.phases[PHASE_SLEEP].count == 2
+
+    lines = export.getvalue().splitlines()
+    assert len(lines) >= 1
+    assert json.loads(lines[0])["frames"] >= 3
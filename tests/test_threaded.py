@@ -0,0 +1,78 @@
+import threading
+import time
+
+from dataclasses import dataclass, field
+
+import pytest
+
+from flappy_cli.io.threaded import ThreadedRenderer
+from flappy_cli.model import Bird, Pipe, World
+
+
+@dataclass
+class SlowRenderer:
+    delay: float = 0.0
+    gate: threading.Event = field(default_factory=threading.Event)
+    frames: list = field(default_factory=list)
+    hud_source: object = None
+
+    def render(self, world, *, message=""):
+        self.gate.wait()
+        time.sleep(self.delay)
+        hud = self.hud_source() if self.hud_source is not None else []
+        self.frames.append((world.bird.y, world.score, [p.x for p in world.pipes], message, hud))
+
+
+def make_world(i: int) -> World:
+    world = World(width=45, height=20, bird=Bird(x=6, y=float(i % 20)), score=i)
+    world.pipes.append(Pipe(x=30 - i % 10, gap_y=5, gap_h=6))
+    return world
+
+
+def test_slow_sink_coalesces_stale_frames_without_blocking_the_caller():
+    inner = SlowRenderer(delay=0.01)
+    renderer = ThreadedRenderer(inner=inner)
+
+    started = time.perf_counter()
+    for i in range(200):
+        renderer.render(make_world(i), message=f"frame {i}")
+    elapsed = time.perf_counter() - started
+    inner.gate.set()
+    renderer.close()
+
+    assert elapsed < 0.5
+    assert renderer.published == 200
+    assert renderer.rendered + renderer.dropped == 200
+    assert renderer.dropped > 150
+    assert inner.frames[-1] == (19.0, 199, [21], "frame 199", [])
+
+
+def test_frames_are_snapshots_and_carry_their_hud():
+    inner = SlowRenderer()
+    renderer = ThreadedRenderer(inner=inner)
+    lines = ["fps 20"]
+    renderer.hud_source = lambda: list(lines)
+
+    world = make_world(3)
+    renderer.render(world, message="a")
+    world.score = 99
+    world.bird.y = 1.0
+    lines[0] = "fps 5"
+
+    inner.gate.set()
+    assert renderer.flush(timeout=5)
+    assert inner.frames == [(3.0, 3, [27], "a", ["fps 20"])]
+    assert renderer.dropped == 0
+    renderer.close()
+
+
+def test_render_errors_surface_on_the_game_thread():
+    class Broken:
+        def render(self, world, *, message=""):
+            raise RuntimeError("terminal went away")
+
+    renderer = ThreadedRenderer(inner=Broken())
+    renderer.render(make_world(0))
+    with pytest.raises(RuntimeError):
+        renderer.flush(timeout=5)
+    renderer.close()
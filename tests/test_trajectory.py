@@ -0,0 +1,106 @@
+import io
+
+import pytest
+
+from flappy_cli.config import GameConfig
+from flappy_cli.io.render import AsciiRenderer
+from flappy_cli.model import Bird, FixedBird, World
+from flappy_cli.trajectory import arc_table, bird_state, table_for
+
+
+def _step(bird, config, k):
+    cells = []
+    for _ in range(k):
+        bird.apply_gravity(config.gravity)
+        bird.step()
+        cells.append(bird.cell_y)
+    return cells
+
+
+def _birds(config):
+    for qy in (-150, -40, 0, 35, 1000, 1999, 2400):
+        for phase in (None, 0, 1, 6, 7, 20):
+            bird = FixedBird(x=config.bird_x, qy=qy, scale=config.fixed_point_scale)
+            if phase is not None:
+                bird.flap(config.flap_velocity)
+                _step(bird, config, phase)
+            yield bird
+
+
+def test_tables_are_cached_per_physics():
+    assert arc_table(0.25, -1.6) is table_for(GameConfig())
+    assert arc_table(0.25, -1.6, 100) is not arc_table(0.25, -1.6)
+    assert arc_table(0.25, -1.6, 100).velocities[:3] == (-160, -135, -110)
+
+    with pytest.raises(ValueError):
+        arc_table(0.0, -1.6)
+
+
+def test_cells_match_stepping_the_bird():
+    config = GameConfig(fixed_point_scale=100)
+    table = table_for(config)
+
+    for bird in _birds(config):
+        y, vy = bird_state(bird)
+        expected = _step(FixedBird(x=bird.x, qy=y, qvy=vy, scale=bird.scale), config, 300)
+        assert table.path(y, vy, 300) == expected
+        assert [table.cell_at(y, vy, k) for k in (1, 17, 299)] == [expected[0], expected[16], expected[298]]
+
+
+def test_float_offsets_follow_the_float_bird():
+    config = GameConfig()
+    table = table_for(config)
+
+    bird = Bird(x=config.bird_x, y=10.0)
+    bird.flap(config.flap_velocity)
+    _step(bird, config, 3)
+    y, vy = bird_state(bird)
+
+    _step(bird, config, 40)
+    assert table.y_at(y, vy, 40) == pytest.approx(bird.y, abs=1e-9)
+
+
+@pytest.mark.parametrize("low, high", [(0, 20), (5, 12), (9, 11), (0, 1), (15, 20)])
+def test_exit_tick_matches_a_linear_scan(low, high):
+    config = GameConfig(fixed_point_scale=100)
+    table = table_for(config)
+
+    for bird in _birds(config):
+        y, vy = bird_state(bird)
+        cells = table.path(y, vy, 500)
+        expected = next(k for k, c in enumerate(cells, start=1) if not low <= c < high)
+
+        assert table.exit_tick(y, vy, low, high) == expected
+        assert table.exit_tick(y, vy, low, high, limit=expected - 1) is None
+
+
+def test_flap_path_starts_with_a_flap():
+    config = GameConfig(fixed_point_scale=100)
+    table = table_for(config)
+
+    bird = FixedBird(x=config.bird_x, qy=1000, qvy=300, scale=100)
+    bird.flap(config.flap_velocity)
+    assert table.flap_path(1000, 30) == _step(bird, config, 30)
+
+
+def test_renderer_draws_the_predicted_path():
+    config = GameConfig(fixed_point_scale=100)
+    table = table_for(config)
+    bird = FixedBird.from_float(x=config.bird_x, y=5.0, vy=-1.1, scale=100)
+    world = World(width=config.width, height=config.height, bird=bird)
+
+    renderer = AsciiRenderer(use_colors=False, stream=io.StringIO(), size=(80, 40), trajectory=table)
+    cells = renderer.frame_cells(world)
+    top = next(i for i, row in enumerate(cells) if row[0] == "▄")
+    grid = [row[1:-1] for row in cells[top + 1:top + 1 + world.height]]
+
+    drawn = {(x, y) for y, row in enumerate(grid) for x, ch in enumerate(row) if ch == "·"}
+    path = table.path(*bird_state(bird), world.width - 1 - bird.x)
+    expected = set()
+    for k, y in enumerate(path, start=1):
+        if not 0 <= y < world.height:
+            break
+        expected.add((bird.x + k, y))
+
+    assert drawn == expected and expected
+    assert grid[bird.cell_y][bird.x] == "●"